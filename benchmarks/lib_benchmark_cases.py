@@ -0,0 +1,439 @@
+"""
+Library Features:
+
+Name:          lib_benchmark_cases
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+#######################################################################################
+# Library
+import logging
+import os
+import json
+import zlib
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from copy import deepcopy
+
+from lib_benchmark_info_args import logger_name, time_format_algorithm
+from lib_benchmark_data import define_grid, compute_field, compute_terrain, zip_file, \
+    write_file_tiff, write_file_nc, write_file_source, georef_mat_default
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+#######################################################################################
+
+# -------------------------------------------------------------------------------------
+# Default settings
+case_file_data = 'case_data.json'
+case_file_settings = 'case_settings.json'
+case_file_report = 'case_profiling.json'
+
+tool_info = {
+    'source2nc': {
+        'folder': 's3m_source2nc_converter',
+        'script': 's3m_tool_preprocessing_source2nc_converter.py',
+        'settings': 's3m_configuration_preprocessing_sourcenc2nc_converter_example.json'},
+    'merger': {
+        'folder': 's3m_merger',
+        'script': 's3m_postprocessing_merger.py',
+        'settings': 's3m_postprocessing_merger.json'},
+    'output2nc': {
+        'folder': 'output2nc_converter',
+        'script': 's3m_postprocessing_output2nc_converter.py',
+        'settings': 's3m_postprocessing_output2nc_converter.json'}
+}
+
+source_format_ext = {'binary': '.bin', 'asc': '.asc', 'tiff': '.tif', 'netcdf': '.nc', 'mat': '.mat'}
+source_var_name = 'AirTemperature'
+domain_name_default = 'benchmark'
+geo_x_ll_default = 8.0
+geo_y_ll_default = 45.0
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define a reproducible seed for a case (and an optional step)
+def define_seed(seed_base, case_name, seed_step=0):
+    return int(seed_base + zlib.crc32(case_name.encode('utf-8')) + seed_step) % (2 ** 32)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read the settings of a tool (used as template of the case settings)
+def read_tool_settings(tools_folder, tool_name):
+    file_name = os.path.join(tools_folder, tool_info[tool_name]['folder'], tool_info[tool_name]['settings'])
+    with open(file_name, 'r') as file_handle:
+        tool_settings = json.load(file_handle)
+    return tool_settings
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to write the settings of a case
+def write_case_settings(file_name, case_settings):
+    os.makedirs(os.path.dirname(file_name), exist_ok=True)
+    with open(file_name, 'w') as file_handle:
+        json.dump(case_settings, file_handle, indent=2)
+    return file_name
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to check if the data of a case are available (generated with the same parameters)
+def check_case_data(case_folder, case_params):
+    file_name = os.path.join(case_folder, case_file_data)
+    if os.path.exists(file_name):
+        with open(file_name, 'r') as file_handle:
+            return json.load(file_handle) == case_params
+    return False
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to save the parameters of the generated data of a case
+def save_case_data(case_folder, case_params):
+    with open(os.path.join(case_folder, case_file_data), 'w') as file_handle:
+        json.dump(case_params, file_handle, indent=2)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the benchmark cases (tool, grid size, source format and domain count)
+def define_cases(benchmark_settings, work_folder, tools_folder):
+
+    grid_sizes = benchmark_settings['grid_sizes']
+    domain_counts = benchmark_settings.get('domain_counts', [1])
+    time_steps = benchmark_settings['time_steps']
+    time_run = benchmark_settings['time_run']
+    seed_base = benchmark_settings.get('seed', 0)
+
+    case_list = []
+    for tool_name in benchmark_settings['tools']:
+
+        tool_settings = benchmark_settings.get(tool_name, {})
+        tool_script = os.path.join(tools_folder, tool_info[tool_name]['folder'], tool_info[tool_name]['script'])
+
+        for grid_size in grid_sizes:
+            if tool_name == 'source2nc':
+                for file_format in tool_settings['formats']:
+                    case_name = 'source2nc_' + file_format + '_n' + str(grid_size)
+                    case_params = {'tool': tool_name, 'format': file_format, 'grid_size': grid_size,
+                                   'time_steps': time_steps, 'time_run': time_run,
+                                   'res_dst': tool_settings['res_dst'], 'res_src': tool_settings['res_src'],
+                                   'seed': define_seed(seed_base, case_name)}
+                    case_list.append(organize_case(case_name, case_params, work_folder, tool_script))
+
+            elif tool_name == 'merger':
+                for domain_count in domain_counts:
+                    case_name = 'merger_n' + str(grid_size) + '_d' + str(domain_count)
+                    case_params = {'tool': tool_name, 'grid_size': grid_size, 'domain_count': domain_count,
+                                   'time_steps': min(time_steps, 24), 'time_run': time_run,
+                                   'res': tool_settings['res'], 'layers': tool_settings['layers'],
+                                   'seed': define_seed(seed_base, case_name)}
+                    case_list.append(organize_case(case_name, case_params, work_folder, tool_script))
+
+            elif tool_name == 'output2nc':
+                case_name = 'output2nc_n' + str(grid_size)
+                case_params = {'tool': tool_name, 'grid_size': grid_size,
+                               'time_month': tool_settings['month'], 'res': tool_settings['res'],
+                               'seed': define_seed(seed_base, case_name)}
+                case_list.append(organize_case(case_name, case_params, work_folder, tool_script))
+
+            else:
+                log_stream.error(' ===> Tool "' + tool_name + '" is not supported by the benchmark')
+                raise NotImplementedError('Case not implemented yet')
+
+    return case_list
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to organize the common information of a case
+def organize_case(case_name, case_params, work_folder, tool_script):
+
+    case_folder = os.path.join(work_folder, case_params['tool'], case_name)
+    return {'case_name': case_name, 'case_params': case_params, 'case_folder': case_folder,
+            'tool_script': tool_script,
+            'settings_file': os.path.join(case_folder, case_file_settings),
+            'report_file': os.path.join(case_folder, 'profiling', case_file_report),
+            'outcome_folder': os.path.join(case_folder, 'outcome')}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to prepare a case (synthetic data, if needed, and tool settings)
+def prepare_case(case_obj, tools_folder, flag_generate_data=True):
+
+    case_name, case_params, case_folder = case_obj['case_name'], case_obj['case_params'], case_obj['case_folder']
+    tool_name = case_params['tool']
+
+    flag_data = check_case_data(case_folder, case_params)
+    if flag_generate_data and (not flag_data):
+        log_stream.info(' ----> Generate data of case "' + case_name + '" ... ')
+        if os.path.exists(case_folder):
+            shutil.rmtree(case_folder)
+        os.makedirs(case_folder, exist_ok=True)
+    elif not flag_data:
+        log_stream.error(' ===> Data of case "' + case_name + '" are not available and generation is not active')
+        raise IOError('Data of the case not found')
+    else:
+        log_stream.info(' ----> Data of case "' + case_name + '" previously generated')
+
+    tool_settings = read_tool_settings(tools_folder, tool_name)
+    if tool_name == 'source2nc':
+        case_settings, case_args = organize_case_source2nc(
+            case_obj, tool_settings, flag_generate_data=flag_generate_data and (not flag_data))
+    elif tool_name == 'merger':
+        case_settings, case_args = organize_case_merger(
+            case_obj, tool_settings, flag_generate_data=flag_generate_data and (not flag_data))
+    elif tool_name == 'output2nc':
+        case_settings, case_args = organize_case_output2nc(
+            case_obj, tool_settings, flag_generate_data=flag_generate_data and (not flag_data))
+    else:
+        log_stream.error(' ===> Tool "' + tool_name + '" is not supported by the benchmark')
+        raise NotImplementedError('Case not implemented yet')
+
+    if flag_generate_data and (not flag_data):
+        save_case_data(case_folder, case_params)
+        log_stream.info(' ----> Generate data of case "' + case_name + '" ... DONE')
+
+    write_case_settings(case_obj['settings_file'], case_settings)
+    case_obj['tool_args'] = ['-settings_file', case_obj['settings_file']] + case_args
+
+    return case_obj
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the profiling settings of a case (stage timers and counters saved by the tool)
+def define_case_profiling(case_obj):
+    return {'active': True, 'report_file': case_obj['report_file'], 'capture': None, 'capture_file': None}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to organize a source2nc case (static grids, hourly forcing and converter settings)
+def organize_case_source2nc(case_obj, tool_settings, flag_generate_data=True):
+
+    case_params, case_folder = case_obj['case_params'], case_obj['case_folder']
+    grid_size, file_format = case_params['grid_size'], case_params['format']
+    res_dst, res_src = case_params['res_dst'], case_params['res_src']
+
+    file_type, file_compression = file_format, False
+    if file_format.endswith('_gz'):
+        file_type, file_compression = file_format[:-3], True
+
+    # Grid(s): destination, source (with margin) and binary source (one more row and column, to be
+    # distinguished by size from the static source terrain in the geographical reference search)
+    geo_margin = 4 * res_dst
+    grid_dst = define_grid(geo_x_ll_default, geo_y_ll_default, res_dst, grid_size, grid_size)
+    src_size = int(np.ceil((grid_size * res_dst + 2 * geo_margin) / res_src))
+    grid_src = define_grid(geo_x_ll_default - geo_margin, geo_y_ll_default - geo_margin, res_src, src_size, src_size)
+    if file_type == 'binary':
+        grid_src = define_grid(geo_x_ll_default - geo_margin, geo_y_ll_default - geo_margin, res_src,
+                               src_size + 1, src_size + 1)
+
+    folder_static = os.path.join(case_folder, 'static')
+    folder_source = os.path.join(case_folder, 'source')
+    file_path_terrain_src = os.path.join(folder_static, 'source', 'Terrain_Source.tif')
+    file_path_terrain_dst = os.path.join(folder_static, 'destination', 'Terrain_Data.nc')
+
+    time_range = pd.date_range(end=pd.Timestamp(case_params['time_run']).floor('H'),
+                               periods=case_params['time_steps'], freq='H')
+    file_ext = source_format_ext[file_type] + ('.gz' if file_compression else '')
+
+    if flag_generate_data:
+        grid_terrain = define_grid(geo_x_ll_default - geo_margin, geo_y_ll_default - geo_margin,
+                                   res_src, src_size, src_size)
+        write_file_tiff(file_path_terrain_src, compute_terrain(grid_terrain, case_params['seed']), grid_terrain)
+        write_file_nc(file_path_terrain_dst, {'Terrain': compute_terrain(grid_dst, case_params['seed'])}, grid_dst,
+                      coord_name_geo_x='Longitude', coord_name_geo_y='Latitude')
+        zip_file(file_path_terrain_dst)
+
+        for time_idx, time_step in enumerate(time_range):
+            file_path_src = os.path.join(folder_source, time_step.strftime('%Y/%m/%d/'),
+                                         file_format + '_' + time_step.strftime('%Y%m%d%H%M') + file_ext)
+            var_values = compute_field(grid_src, define_seed(case_params['seed'], 'source', time_idx + 1),
+                                       field_min=-10.0, field_max=25.0)
+            write_file_source(file_path_src, file_format, source_var_name, var_values, grid_src, file_time=time_step)
+
+    # Settings
+    case_settings = deepcopy(tool_settings)
+
+    case_settings['algorithm']['ancillary'].update({
+        'domain_name': domain_name_default, 'tmp_folder': os.path.join(case_folder, 'tmp'), 'cache_folder': None})
+    case_settings['algorithm']['flags'].update({
+        'cleaning_dynamic_ancillary': True, 'cleaning_dynamic_data': True, 'cleaning_dynamic_tmp': True,
+        'prefetch_dynamic_source': False, 'resume_dynamic_ancillary': False})
+
+    case_settings['data']['static']['source'] = {
+        'Terrain': {'folder_name': os.path.dirname(file_path_terrain_src),
+                    'file_name': os.path.basename(file_path_terrain_src)},
+        'Grid_2': {'xll': grid_src['xll'], 'yll': grid_src['yll'], 'res': res_src,
+                   'nrows': grid_src['nrows'], 'ncols': grid_src['ncols'], 'nodata_value': -9999}}
+    case_settings['data']['static']['destination']['Terrain'].update({
+        'folder_name': os.path.dirname(file_path_terrain_dst), 'file_name': os.path.basename(file_path_terrain_dst),
+        'file_compression': True, 'file_type': 'netcdf', 'file_coords': {'x': 'Longitude', 'y': 'Latitude'}})
+
+    var_settings = {
+        'var_compute': True, 'var_name': source_var_name, 'var_scale_factor': 1, 'var_shift': None,
+        'folder_name': os.path.join(folder_source, '{source_folder_datetime_generic}'),
+        'file_name': file_format + '_{source_file_datetime_generic}' + file_ext,
+        'file_compression': file_compression, 'file_geo_reference': None, 'file_type': file_type,
+        'file_coords': None, 'file_frequency': 'H', 'compute_quality': False, 'decimal_digits': 3}
+    if file_type == 'binary':
+        var_settings['file_geo_reference'] = 'Grid_2'
+    elif file_type == 'netcdf':
+        var_settings['file_geo_reference'] = 'Terrain'
+        var_settings['file_coords'] = {'x': 'longitude', 'y': 'latitude', 'time': 'time'}
+    elif file_type == 'mat':
+        var_settings['ancillary_georef_mat'] = deepcopy(georef_mat_default)
+    case_settings['data']['dynamic']['source'] = {source_var_name: var_settings}
+
+    case_settings['data']['dynamic']['ancillary'].update({
+        'folder_name': os.path.join(case_folder, 'ancillary'),
+        'file_name': 'MeteoData_{ancillary_file_datetime_generic}.workspace'})
+    case_settings['data']['dynamic']['destination'].update({
+        'folder_name': os.path.join(case_obj['outcome_folder'], '{destination_folder_datetime_generic}'),
+        'file_name': 'MeteoData_{destination_file_datetime_generic}.nc',
+        'file_geo_reference': 'Terrain', 'file_compression': True})
+
+    case_settings['profiling'] = define_case_profiling(case_obj)
+    case_settings['log'].update({'folder_name': os.path.join(case_folder, 'log'),
+                                 'file_name': 's3m_source2nc_converter.txt'})
+    case_settings['time'].update({'time_run': None, 'time_start': None, 'time_end': None,
+                                  'time_period': case_params['time_steps'],
+                                  'time_frequency': 'H', 'time_rounding': 'H', 'time_reverse': False})
+
+    case_args = ['-time', time_range[-1].strftime(time_format_algorithm), '-domain', domain_name_default]
+
+    return case_settings, case_args
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to organize a merger case (domain grids, hourly outputs of each domain and merger settings)
+def organize_case_merger(case_obj, tool_settings, flag_generate_data=True):
+
+    case_params, case_folder = case_obj['case_params'], case_obj['case_folder']
+    grid_size, domain_count, res = case_params['grid_size'], case_params['domain_count'], case_params['res']
+    layers = case_params['layers']
+
+    domain_list = ['Domain' + str(domain_idx + 1).zfill(2) for domain_idx in range(domain_count)]
+    grid_out = define_grid(geo_x_ll_default, geo_y_ll_default, res, grid_size, grid_size * domain_count)
+    file_path_grid_out = os.path.join(case_folder, 'static', 'Output_Grid.tif')
+
+    # Daily summary is computed on the hourly step(s) from the beginning of the day to the time run
+    time_run = pd.Timestamp(case_params['time_run']).floor('D') + pd.Timedelta(hours=case_params['time_steps'] - 1)
+    time_range = pd.date_range(start=time_run.floor('D'), end=time_run, freq='H')
+
+    if flag_generate_data:
+        write_file_tiff(file_path_grid_out, compute_terrain(grid_out, case_params['seed']), grid_out)
+
+        for domain_idx, domain_name in enumerate(domain_list):
+            grid_domain = define_grid(geo_x_ll_default + domain_idx * grid_size * res, geo_y_ll_default,
+                                      res, grid_size, grid_size)
+            domain_seed = define_seed(case_params['seed'], domain_name)
+
+            file_path_grid = os.path.join(case_folder, 'domains', domain_name, 'Terrain_Data.nc')
+            write_file_nc(file_path_grid, {'Terrain': compute_terrain(grid_domain, domain_seed)}, grid_domain,
+                          coord_name_geo_x='Longitude', coord_name_geo_y='Latitude', flag_south_first=True)
+            zip_file(file_path_grid)
+
+            for time_idx, time_step in enumerate(time_range):
+                file_vars = {}
+                for layer_idx, layer_name in enumerate(layers):
+                    file_vars[layer_name] = compute_field(
+                        grid_domain, define_seed(domain_seed, layer_name, time_idx + 1),
+                        field_min=0.0, field_max=500.0)
+                file_path_out = os.path.join(case_folder, 'output', domain_name, time_step.strftime('%Y/%m/%d/'),
+                                             'S3M_' + time_step.strftime('%Y%m%d%H%M') + '.nc')
+                write_file_nc(file_path_out, file_vars, grid_domain, file_time=time_step,
+                              coord_name_geo_x='Longitude', coord_name_geo_y='Latitude', flag_south_first=True)
+                zip_file(file_path_out)
+
+    # Settings
+    case_settings = deepcopy(tool_settings)
+    case_settings['algorithm']['flags']['compress_output'] = False
+
+    case_settings['data']['input'].update({
+        'folder': os.path.join(case_folder, 'output', '{domain}', '{source_gridded_sub_path_time}'),
+        'filename': 'S3M_{source_gridded_datetime}.nc.gz', 'gz': True,
+        'domains': domain_list,
+        'grid_path': os.path.join(case_folder, 'domains', '{domain}', 'Terrain_Data.nc.gz'),
+        'grid_lat': 'Latitude', 'grid_lon': 'Longitude', 'grid_dem': 'Terrain',
+        'layers': layers,
+        'daily_summary': [layer_idx == 0 for layer_idx in range(layers.__len__())],
+        'summary_type': ['avg' if layer_idx == 0 else None for layer_idx in range(layers.__len__())],
+        'freq_summary': 'H', 'mask_layer': layers[0], 'mask_threshold': 5,
+        'scale_factor_output': [1 for layer_name in layers]})
+    case_settings['data']['outcome'].update({
+        'output_grid': file_path_grid_out,
+        'folder': os.path.join(case_obj['outcome_folder'], '{outcome_sub_path_time}'),
+        'filename': 'S3MBenchmark_{layer}_{outcome_datetime}.tif'})
+
+    case_settings['data']['profiling'] = define_case_profiling(case_obj)
+    case_settings['data']['log'].update({'folder': os.path.join(case_folder, 'log'),
+                                         'filename': 's3m_postprocessing_merger.txt'})
+    case_settings['time'].update({'time_run': None, 'time_start': None, 'time_end': None,
+                                  'time_period': 1, 'time_frequency': 'D', 'time_rounding': 'H',
+                                  'time_reverse': False})
+
+    case_args = ['-time', time_run.strftime(time_format_algorithm)]
+
+    return case_settings, case_args
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to organize an output2nc case (daily geotiff maps of a month and output2nc settings)
+def organize_case_output2nc(case_obj, tool_settings, flag_generate_data=True):
+
+    case_params, case_folder = case_obj['case_params'], case_obj['case_folder']
+    grid_size, res = case_params['grid_size'], case_params['res']
+    var_name = tool_settings['data']['input']['variable_name']
+
+    grid_obj = define_grid(geo_x_ll_default, geo_y_ll_default, res, grid_size, grid_size)
+    file_path_grid = os.path.join(case_folder, 'static', 'Grid.tif')
+
+    time_month = pd.Period(case_params['time_month'], freq='M')
+    time_range = pd.date_range(start=time_month.start_time, end=time_month.end_time.floor('D'), freq='D')
+
+    if flag_generate_data:
+        write_file_tiff(file_path_grid, compute_terrain(grid_obj, case_params['seed']), grid_obj)
+
+        for time_idx, time_step in enumerate(time_range):
+            file_path_map = os.path.join(case_folder, 'geotiff', time_step.strftime('%Y/%m/%d/'),
+                                         var_name + '_' + time_step.strftime('%Y%m%d') + '110000.tif')
+            write_file_tiff(file_path_map,
+                            compute_field(grid_obj, define_seed(case_params['seed'], var_name, time_idx + 1),
+                                          field_min=0.0, field_max=500.0), grid_obj)
+
+    # Settings
+    case_settings = deepcopy(tool_settings)
+    case_settings['data']['input'].update({
+        'input_grid': file_path_grid,
+        'folder': os.path.join(case_folder, 'geotiff', '{source_gridded_sub_path_time}'),
+        'filename': '{variable_name}_{source_gridded_datetime_daily}110000.tif',
+        'file_compression': False, 'file_type': 'tif'})
+    case_settings['data']['outcome'].update({
+        'output_grid': file_path_grid, 'folder': case_obj['outcome_folder'],
+        'filename': '{variable_name}_{outcome_datetime_monthly}.nc'})
+
+    case_settings['data']['profiling'] = define_case_profiling(case_obj)
+    case_settings['data']['log'].update({'folder': os.path.join(case_folder, 'log'),
+                                         'filename': 's3m_postprocessing_output2nc_converter.txt'})
+    case_settings['time'].update({'time_run': None, 'time_start': None, 'time_end': None,
+                                  'time_period': 1, 'time_frequency': 'M', 'time_rounding': 'D',
+                                  'time_reverse': False})
+
+    case_args = ['-time', time_range[-1].strftime(time_format_algorithm)]
+
+    return case_settings, case_args
+# -------------------------------------------------------------------------------------
@@ -0,0 +1,225 @@
+"""
+Library Features:
+
+Name:          lib_benchmark_data
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+#######################################################################################
+# Library
+import logging
+import os
+import gzip
+import shutil
+
+import numpy as np
+import xarray as xr
+import rasterio
+import scipy.io
+
+from rasterio.transform import from_origin
+
+from lib_benchmark_info_args import logger_name, proj_epsg, no_data_default
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+#######################################################################################
+
+# -------------------------------------------------------------------------------------
+# Default settings
+georef_mat_default = {'res_x': 'fLonStep', 'res_y': 'fLatStep', 'grid_lat': 'a2dTemp_LAT', 'grid_lon': 'a2dTemp_LON'}
+zip_extension = '.gz'
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define a regular grid (cell centers; latitude from north to south)
+def define_grid(geo_x_ll, geo_y_ll, geo_res, geo_rows, geo_cols, decimal_round=7):
+
+    geo_x = np.round(geo_x_ll + geo_res / 2 + np.arange(geo_cols) * geo_res, decimal_round)
+    geo_y = np.round(np.flip(geo_y_ll + geo_res / 2 + np.arange(geo_rows) * geo_res), decimal_round)
+    geo_transform = from_origin(geo_x_ll, geo_y_ll + geo_rows * geo_res, geo_res, geo_res)
+
+    return {'xll': round(geo_x_ll, decimal_round), 'yll': round(geo_y_ll, decimal_round),
+            'res': geo_res, 'nrows': int(geo_rows), 'ncols': int(geo_cols),
+            'geo_x': geo_x, 'geo_y': geo_y, 'transform': geo_transform}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to compute a synthetic field (smooth pattern and noise; reproducible by seed)
+def compute_field(grid, field_seed, field_min=0.0, field_max=1.0):
+
+    field_random = np.random.default_rng(field_seed)
+    geo_x_2d, geo_y_2d = np.meshgrid(grid['geo_x'], grid['geo_y'])
+
+    phase_x, phase_y = field_random.uniform(0, 2 * np.pi, size=2)
+    field_values = np.sin(geo_x_2d * 40.0 + phase_x) * np.cos(geo_y_2d * 40.0 + phase_y)
+    field_values = field_values + 0.25 * field_random.standard_normal(size=field_values.shape)
+
+    field_values = (field_values - field_values.min()) / max(float(np.ptp(field_values)), 1e-6)
+    field_values = field_min + field_values * (field_max - field_min)
+
+    return field_values.astype(np.float32)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to compute a synthetic terrain (elliptic domain; no data outside)
+def compute_terrain(grid, field_seed, terrain_min=200.0, terrain_max=3500.0, no_data=no_data_default):
+
+    terrain_values = compute_field(grid, field_seed, field_min=terrain_min, field_max=terrain_max)
+
+    rows_idx, cols_idx = np.meshgrid(
+        np.linspace(-1, 1, grid['nrows']), np.linspace(-1, 1, grid['ncols']), indexing='ij')
+    terrain_mask = (rows_idx ** 2 + cols_idx ** 2) <= 0.95
+    terrain_values[~terrain_mask] = no_data
+
+    return terrain_values
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to create the folder of a file (if needed)
+def make_folder_file(file_name):
+    folder_name = os.path.dirname(file_name)
+    if folder_name != '':
+        os.makedirs(folder_name, exist_ok=True)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to zip a file (the original file is removed)
+def zip_file(file_name):
+
+    file_name_zip = file_name + zip_extension
+    with open(file_name, 'rb') as file_handle_in, gzip.open(file_name_zip, 'wb') as file_handle_out:
+        shutil.copyfileobj(file_handle_in, file_handle_out)
+    os.remove(file_name)
+
+    return file_name_zip
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to write a tiff file
+def write_file_tiff(file_name, file_values, grid, no_data=no_data_default):
+
+    make_folder_file(file_name)
+    with rasterio.open(file_name, 'w', driver='GTiff', height=grid['nrows'], width=grid['ncols'], count=1,
+                       dtype='float32', crs=proj_epsg, transform=grid['transform'], nodata=no_data) as file_handle:
+        file_handle.write(np.asarray(file_values, dtype=np.float32), 1)
+
+    return file_name
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to write an ascii grid file
+def write_file_ascii(file_name, file_values, grid, no_data=no_data_default, decimal_digits=3):
+
+    make_folder_file(file_name)
+    file_header = 'ncols ' + str(grid['ncols']) + '\n' + 'nrows ' + str(grid['nrows']) + '\n' + \
+                  'xllcorner ' + str(grid['xll']) + '\n' + 'yllcorner ' + str(grid['yll']) + '\n' + \
+                  'cellsize ' + str(grid['res']) + '\n' + 'NODATA_value ' + str(no_data)
+    np.savetxt(file_name, file_values, fmt='%.' + str(decimal_digits) + 'f', header=file_header, comments='')
+
+    return file_name
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to write a binary file (1d native integer array in fortran order, as read by struct format "i")
+def write_file_binary(file_name, file_values, var_scale_factor=1):
+
+    make_folder_file(file_name)
+    file_data = np.round(np.asarray(file_values) * var_scale_factor).astype(np.intc).flatten(order='F')
+    file_data.tofile(file_name)
+
+    return file_name
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to write a netcdf file with 2d variable(s) and 2d coordinates
+def write_file_nc(file_name, file_vars, grid, file_time=None,
+                  coord_name_geo_x='longitude', coord_name_geo_y='latitude', coord_name_time='time',
+                  dim_name_geo_x='west_east', dim_name_geo_y='south_north', flag_south_first=False):
+
+    make_folder_file(file_name)
+
+    geo_x_2d, geo_y_2d = np.meshgrid(grid['geo_x'], grid['geo_y'])
+    if flag_south_first:
+        geo_y_2d = np.flipud(geo_y_2d)
+
+    dset_coords = {coord_name_geo_x: ([dim_name_geo_y, dim_name_geo_x], geo_x_2d),
+                   coord_name_geo_y: ([dim_name_geo_y, dim_name_geo_x], geo_y_2d)}
+    if file_time is not None:
+        dset_coords[coord_name_time] = ([coord_name_time], [file_time])
+
+    dset_vars = {}
+    for var_name, var_values in file_vars.items():
+        if flag_south_first:
+            var_values = np.flipud(var_values)
+        dset_vars[var_name] = ([dim_name_geo_y, dim_name_geo_x], np.asarray(var_values, dtype=np.float32))
+
+    dset_obj = xr.Dataset(dset_vars, coords=dset_coords)
+    dset_obj.to_netcdf(file_name, format='NETCDF4', engine='netcdf4')
+
+    return file_name
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to write a mat file (variable and georeference fields)
+def write_file_mat(file_name, var_name, var_values, grid, georef_names=None):
+
+    if georef_names is None:
+        georef_names = georef_mat_default
+
+    make_folder_file(file_name)
+
+    geo_x_2d, geo_y_2d = np.meshgrid(grid['geo_x'], grid['geo_y'])
+    file_mat = {var_name: np.asarray(var_values, dtype=np.float32),
+                georef_names['res_x']: grid['res'], georef_names['res_y']: grid['res'],
+                georef_names['grid_lon']: geo_x_2d, georef_names['grid_lat']: geo_y_2d}
+    scipy.io.savemat(file_name, file_mat)
+
+    return file_name
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to write a source file in the selected format (format "<type>_gz" is zipped)
+def write_file_source(file_name, file_format, var_name, var_values, grid, file_time=None):
+
+    file_type = file_format
+    file_compression = False
+    if file_format.endswith('_gz'):
+        file_type = file_format[:-3]
+        file_compression = True
+
+    if file_compression and file_name.endswith(zip_extension):
+        file_name = file_name[:-len(zip_extension)]
+
+    if file_type == 'binary':
+        write_file_binary(file_name, var_values)
+    elif file_type == 'asc':
+        write_file_ascii(file_name, var_values, grid)
+    elif file_type == 'tiff':
+        write_file_tiff(file_name, var_values, grid)
+    elif file_type == 'netcdf':
+        write_file_nc(file_name, {var_name: var_values}, grid, file_time=file_time)
+    elif file_type == 'mat':
+        write_file_mat(file_name, var_name, var_values, grid)
+    else:
+        log_stream.error(' ===> File format "' + file_format + '" is not supported by the benchmark')
+        raise NotImplementedError('Case not implemented yet')
+
+    if file_compression:
+        file_name = zip_file(file_name)
+
+    return file_name
+# -------------------------------------------------------------------------------------
@@ -0,0 +1,31 @@
+"""
+Library Features:
+
+Name:          lib_benchmark_info_args
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+#######################################################################################
+# Library
+import pandas as pd
+#######################################################################################
+
+# -------------------------------------------------------------------------------------
+# Time information
+time_format_algorithm = '%Y-%m-%d %H:%M'
+time_format_results = '%Y%m%d%H%M'
+time_machine = pd.Timestamp.now
+
+# Logging information
+logger_name = 's3m_benchmark_logger'
+logger_file = 's3m_benchmark.txt'
+logger_format = '%(asctime)s %(name)-12s %(levelname)-8s %(message)-80s %(filename)s:[%(lineno)-6s - %(funcName)-20s()] '
+
+# Definition of projection
+proj_epsg = 'EPSG:4326'
+
+# Definition of no data value
+no_data_default = -9999.0
+# -------------------------------------------------------------------------------------
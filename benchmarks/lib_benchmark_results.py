@@ -0,0 +1,139 @@
+"""
+Library Features:
+
+Name:          lib_benchmark_results
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+#######################################################################################
+# Library
+import logging
+import os
+import sys
+import json
+import platform
+import subprocess
+
+from lib_benchmark_info_args import logger_name, time_machine
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+#######################################################################################
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the environment of the benchmark (machine, python and repository version)
+def define_results_env(repo_folder):
+
+    repo_commit = None
+    try:
+        repo_commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=repo_folder, capture_output=True,
+                                     text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        log_stream.warning(' ===> Repository commit is not available')
+
+    return {'time_run': time_machine().strftime('%Y-%m-%d %H:%M:%S'),
+            'machine': platform.machine(), 'system': platform.system(), 'node': platform.node(),
+            'cpu_count': os.cpu_count(), 'python': sys.version.split()[0], 'repo_commit': repo_commit}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to save the results of the benchmark (json)
+def save_results(file_name, results_obj):
+
+    folder_name = os.path.dirname(file_name)
+    if folder_name != '':
+        os.makedirs(folder_name, exist_ok=True)
+
+    file_name_tmp = file_name + '.tmp'
+    with open(file_name_tmp, 'w') as file_handle:
+        json.dump(results_obj, file_handle, indent=2)
+    os.replace(file_name_tmp, file_name)
+
+    return file_name
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read the results of a benchmark (json)
+def read_results(file_name):
+
+    if not os.path.exists(file_name):
+        log_stream.error(' ===> Results file "' + file_name + '" is not available')
+        raise IOError('File not found')
+
+    with open(file_name, 'r') as file_handle:
+        return json.load(file_handle)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to compare the results with a baseline (ratio of the median wall time of each case)
+def compare_results(results_obj, baseline_obj, tolerance=0.1, tolerance_time_min=0.5):
+
+    cases_baseline = {case_obj['case_name']: case_obj for case_obj in baseline_obj['cases']}
+
+    comparison_list = []
+    for case_obj in results_obj['cases']:
+
+        case_name = case_obj['case_name']
+        comparison_obj = {'case_name': case_name, 'time_wall': case_obj['time_wall'],
+                          'time_wall_baseline': None, 'ratio': None, 'status': 'new'}
+
+        if case_name in list(cases_baseline.keys()):
+            case_baseline = cases_baseline[case_name]
+            comparison_obj['time_wall_baseline'] = case_baseline['time_wall']
+
+            if (case_obj['status'] != 'ok') or (case_baseline['status'] != 'ok'):
+                comparison_obj['status'] = 'failed'
+            else:
+                time_diff = case_obj['time_wall'] - case_baseline['time_wall']
+                comparison_obj['ratio'] = round(case_obj['time_wall'] / max(case_baseline['time_wall'], 1e-6), 3)
+
+                # Small absolute difference(s) are not significant (process start and imports)
+                if abs(time_diff) < tolerance_time_min:
+                    comparison_obj['status'] = 'stable'
+                elif comparison_obj['ratio'] > 1 + tolerance:
+                    comparison_obj['status'] = 'regression'
+                elif comparison_obj['ratio'] < 1 - tolerance:
+                    comparison_obj['status'] = 'improvement'
+                else:
+                    comparison_obj['status'] = 'stable'
+
+                # Stage(s) comparison (ratio of the stage time)
+                stages_baseline = case_baseline.get('stages', {})
+                comparison_obj['stages'] = {}
+                for stage_name, stage_info in case_obj.get('stages', {}).items():
+                    if stage_name in list(stages_baseline.keys()):
+                        comparison_obj['stages'][stage_name] = round(
+                            stage_info['time'] / max(stages_baseline[stage_name]['time'], 1e-6), 3)
+
+        comparison_list.append(comparison_obj)
+
+    cases_results = [case_obj['case_name'] for case_obj in results_obj['cases']]
+    for case_name in cases_baseline.keys():
+        if case_name not in cases_results:
+            comparison_list.append({'case_name': case_name, 'time_wall': None,
+                                    'time_wall_baseline': cases_baseline[case_name]['time_wall'],
+                                    'ratio': None, 'status': 'missing'})
+
+    return comparison_list
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to log the comparison with the baseline
+def log_comparison(comparison_list):
+
+    log_stream.info(' ----> Comparison with baseline (case :: time [s] :: baseline [s] :: ratio :: status)')
+    for comparison_obj in comparison_list:
+        time_wall, time_wall_baseline = comparison_obj['time_wall'], comparison_obj['time_wall_baseline']
+        log_stream.info(' -----> ' + comparison_obj['case_name'] + ' :: ' +
+                        (str(round(time_wall, 3)) if time_wall is not None else '-') + ' :: ' +
+                        (str(round(time_wall_baseline, 3)) if time_wall_baseline is not None else '-') + ' :: ' +
+                        (str(comparison_obj['ratio']) if comparison_obj['ratio'] is not None else '-') + ' :: ' +
+                        comparison_obj['status'].upper())
+# -------------------------------------------------------------------------------------
@@ -0,0 +1,168 @@
+"""
+Library Features:
+
+Name:          lib_benchmark_run
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+#######################################################################################
+# Library
+import logging
+import os
+import sys
+import json
+import time
+import shutil
+import threading
+import subprocess
+
+import numpy as np
+
+from lib_benchmark_info_args import logger_name
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+#######################################################################################
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the environment of a tool process (shared s3m_tools library in the python path)
+def define_process_env(tools_folder):
+    process_env = dict(os.environ)
+    process_path = [os.path.join(tools_folder, 's3m_tools')]
+    if process_env.get('PYTHONPATH'):
+        process_path.append(process_env['PYTHONPATH'])
+    process_env['PYTHONPATH'] = os.pathsep.join(process_path)
+    return process_env
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to run a tool process (wall time, cpu time and peak memory of the child process)
+def run_process(process_cmd, process_cwd, process_log, process_timeout=None, process_env=None):
+
+    os.makedirs(os.path.dirname(process_log), exist_ok=True)
+    with open(process_log, 'w') as process_handle_log:
+
+        time_start = time.perf_counter()
+        process_handle = subprocess.Popen(process_cmd, cwd=process_cwd, env=process_env,
+                                          stdout=process_handle_log, stderr=subprocess.STDOUT)
+
+        # Process is killed if the timeout is exceeded (wait4 is used to get the resource usage of the child)
+        process_timer, process_expired = None, threading.Event()
+        if process_timeout is not None:
+            def kill_process():
+                process_expired.set()
+                process_handle.kill()
+            process_timer = threading.Timer(process_timeout, kill_process)
+            process_timer.start()
+
+        _, process_status, process_usage = os.wait4(process_handle.pid, 0)
+        time_elapsed = time.perf_counter() - time_start
+
+        if process_timer is not None:
+            process_timer.cancel()
+        process_handle.returncode = os.waitstatus_to_exitcode(process_status)
+
+    # Peak memory is in kilobytes on linux and in bytes on macos
+    process_rss = process_usage.ru_maxrss
+    if sys.platform == 'darwin':
+        process_rss = int(process_rss / 1024)
+
+    return {'return_code': process_handle.returncode, 'expired': process_expired.is_set(),
+            'time_wall': time_elapsed, 'time_user': process_usage.ru_utime, 'time_sys': process_usage.ru_stime,
+            'memory_max_kb': process_rss}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read the profiling report of a tool run (stage timers and counters)
+def read_report(file_name):
+    if (file_name is not None) and os.path.exists(file_name):
+        with open(file_name, 'r') as file_handle:
+            return json.load(file_handle)
+    return None
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to run a case (repeated runs; statistics on the wall time)
+def run_case(case_obj, case_repeat=1, case_timeout=None, python_exec=None):
+
+    if python_exec is None:
+        python_exec = sys.executable
+
+    case_name = case_obj['case_name']
+    process_cmd = [python_exec, case_obj['tool_script']] + case_obj['tool_args']
+    process_cwd = os.path.dirname(case_obj['tool_script'])
+    process_env = define_process_env(os.path.dirname(process_cwd))
+
+    log_stream.info(' ----> Run case "' + case_name + '" ... ')
+
+    run_list = []
+    for run_idx in range(max(int(case_repeat), 1)):
+
+        # Outcome and profiling report of the previous run are removed (each run starts from the same state)
+        if os.path.exists(case_obj['outcome_folder']):
+            shutil.rmtree(case_obj['outcome_folder'])
+        os.makedirs(case_obj['outcome_folder'], exist_ok=True)
+        if os.path.exists(case_obj['report_file']):
+            os.remove(case_obj['report_file'])
+
+        process_log = os.path.join(case_obj['case_folder'], 'log', 'run_' + str(run_idx + 1).zfill(2) + '.txt')
+        run_obj = run_process(process_cmd, process_cwd, process_log, process_timeout=case_timeout,
+                              process_env=process_env)
+        run_obj['report'] = read_report(case_obj['report_file'])
+        run_obj['log_file'] = process_log
+
+        if run_obj['expired']:
+            log_stream.warning(' ===> Run ' + str(run_idx + 1) + ' of case "' + case_name +
+                               '" exceeded the timeout of ' + str(case_timeout) + ' seconds')
+        elif run_obj['return_code'] != 0:
+            log_stream.warning(' ===> Run ' + str(run_idx + 1) + ' of case "' + case_name +
+                               '" failed with code ' + str(run_obj['return_code']) +
+                               '. Check the log file "' + process_log + '"')
+        else:
+            log_stream.info(' -----> Run ' + str(run_idx + 1) + ' :: ' +
+                            str(round(run_obj['time_wall'], 3)) + ' seconds')
+        run_list.append(run_obj)
+
+        if run_obj['return_code'] != 0:
+            break
+
+    case_result = summarize_case(case_obj, run_list)
+
+    log_stream.info(' ----> Run case "' + case_name + '" ... ' + case_result['status'].upper())
+
+    return case_result
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to summarize the runs of a case (median run is used for stage timers and counters)
+def summarize_case(case_obj, run_list):
+
+    case_status = 'ok'
+    if any([run_obj['return_code'] != 0 for run_obj in run_list]):
+        case_status = 'failed'
+
+    time_wall = [run_obj['time_wall'] for run_obj in run_list]
+    run_median = run_list[int(np.argsort(time_wall)[(time_wall.__len__() - 1) // 2])]
+
+    case_stages, case_counters = {}, {}
+    if run_median['report'] is not None:
+        case_stages = run_median['report'].get('timers', {})
+        case_counters = run_median['report'].get('counters', {})
+
+    return {'case_name': case_obj['case_name'], 'case_params': case_obj['case_params'],
+            'status': case_status, 'runs': run_list.__len__(),
+            'time_wall': float(np.median(time_wall)), 'time_wall_min': float(np.min(time_wall)),
+            'time_wall_max': float(np.max(time_wall)),
+            'time_user': float(np.median([run_obj['time_user'] for run_obj in run_list])),
+            'time_sys': float(np.median([run_obj['time_sys'] for run_obj in run_list])),
+            'memory_max_kb': int(max([run_obj['memory_max_kb'] for run_obj in run_list])),
+            'stages': case_stages, 'counters': case_counters,
+            'log_file': run_median['log_file']}
+# -------------------------------------------------------------------------------------
@@ -0,0 +1,186 @@
+"""
+S3M Tools - Benchmark suite
+__date__ = '20261019'
+__version__ = '1.0.0'
+__author__ =
+        'Francesco Avanzi (francesco.avanzi@cimafoundation.org',
+        Fabio Delogu (fabio.delogu@cimafoundation.org)
+__library__ = 's3m'
+General command line:
+### python s3m_benchmark.py -settings_file s3m_benchmark.json [-baseline_file results_baseline.json]
+Version(s):
+20261019 (1.0.0) --> First release.
+"""
+# -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+# Complete library
+import logging
+import os
+import sys
+import json
+
+from argparse import ArgumentParser
+from time import time
+
+from lib_benchmark_info_args import logger_name, logger_format, time_machine, time_format_results
+from lib_benchmark_cases import define_cases, prepare_case
+from lib_benchmark_run import run_case
+from lib_benchmark_results import define_results_env, save_results, read_results, compare_results, log_comparison
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+# -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+# Algorithm information
+alg_project = 'S3M'
+alg_name = 'S3M Tools - Benchmark suite '
+alg_version = '1.0.0'
+alg_release = '2026-10-19'
+alg_type = 'Benchmark'
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Script Main
+def main():
+
+    # -------------------------------------------------------------------------------------
+    # Get algorithm settings
+    file_settings, file_baseline, file_results = get_args()
+
+    # Set algorithm settings (relative path(s) are defined with respect to the settings file)
+    with open(file_settings, 'r') as file_handle:
+        data_settings = json.load(file_handle)
+    folder_settings = os.path.dirname(os.path.abspath(file_settings))
+    path_settings = {path_key: (os.path.normpath(os.path.join(folder_settings, path_value))
+                                if isinstance(path_value, str) and (not os.path.isabs(path_value)) else path_value)
+                     for path_key, path_value in data_settings['path'].items()}
+
+    if file_baseline is None:
+        file_baseline = path_settings.get('baseline_file', None)
+    if file_results is None:
+        file_results = path_settings['results_file'].replace(
+            '{benchmark_datetime}', time_machine().strftime(time_format_results))
+
+    # Set algorithm logging
+    os.makedirs(path_settings['log_folder'], exist_ok=True)
+    set_logging(logger_file=os.path.join(path_settings['log_folder'], data_settings['log']['file_name']))
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Info algorithm
+    log_stream.info(' ============================================================================ ')
+    log_stream.info('[' + alg_project + ' ' + alg_type + ' - ' + alg_name + ' (Version ' + alg_version +
+                    ' - Release ' + alg_release + ')]')
+    log_stream.info(' ==> START ... ')
+    log_stream.info(' ')
+
+    # Time algorithm information
+    start_time = time()
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Define and run the benchmark case(s)
+    benchmark_settings = data_settings['benchmark']
+    benchmark_flags = data_settings['algorithm']['flags']
+
+    case_list = define_cases(benchmark_settings, path_settings['work_folder'], path_settings['tools_folder'])
+
+    results_cases = []
+    for case_obj in case_list:
+        case_obj = prepare_case(case_obj, path_settings['tools_folder'],
+                                flag_generate_data=benchmark_flags.get('generate_data', True))
+        case_result = run_case(case_obj, case_repeat=benchmark_settings.get('repeat', 1),
+                               case_timeout=benchmark_settings.get('timeout', None))
+        results_cases.append(case_result)
+
+    results_obj = {'benchmark': {'settings': benchmark_settings,
+                                 'environment': define_results_env(os.path.dirname(path_settings['tools_folder']))},
+                   'cases': results_cases}
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Compare the result(s) with the baseline (if defined)
+    exit_code = 0
+    if any([case_result['status'] != 'ok' for case_result in results_cases]):
+        log_stream.warning(' ===> Some benchmark cases failed')
+        exit_code = 1
+
+    if file_baseline is not None:
+        baseline_obj = read_results(file_baseline)
+        comparison_list = compare_results(
+            results_obj, baseline_obj,
+            tolerance=benchmark_settings.get('tolerance', 0.1),
+            tolerance_time_min=benchmark_settings.get('tolerance_time_min', 0.5))
+        log_comparison(comparison_list)
+
+        results_obj['baseline'] = {'file_name': file_baseline, 'comparison': comparison_list}
+
+        if any([comparison_obj['status'] == 'regression' for comparison_obj in comparison_list]):
+            log_stream.warning(' ===> Some benchmark cases are slower than the baseline')
+            if benchmark_flags.get('fail_on_regression', False):
+                exit_code = 1
+
+    save_results(file_results, results_obj)
+    log_stream.info(' ----> Results saved in "' + file_results + '"')
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Info algorithm
+    time_elapsed = round(time() - start_time, 1)
+
+    log_stream.info(' ')
+    log_stream.info(' ==> ' + alg_name + ' (Version: ' + alg_version + ' Release_Date: ' + alg_release + ')')
+    log_stream.info(' ==> TIME ELAPSED: ' + str(time_elapsed) + ' seconds')
+    log_stream.info(' ==> ... END')
+    log_stream.info(' ==> Bye, Bye')
+    log_stream.info(' ============================================================================ ')
+    sys.exit(exit_code)
+    # -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get script argument(s)
+def get_args():
+
+    parser_handle = ArgumentParser()
+    parser_handle.add_argument('-settings_file', action="store", dest="alg_settings")
+    parser_handle.add_argument('-baseline_file', action="store", dest="alg_baseline")
+    parser_handle.add_argument('-results_file', action="store", dest="alg_results")
+    parser_values = parser_handle.parse_args()
+
+    if parser_values.alg_settings:
+        alg_settings = parser_values.alg_settings
+    else:
+        alg_settings = 's3m_benchmark.json'
+
+    return alg_settings, parser_values.alg_baseline, parser_values.alg_results
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to set logging information
+def set_logging(logger_file='log.txt', logger_msg_format=None):
+
+    if logger_msg_format is None:
+        logger_msg_format = logger_format
+
+    logger_handle = logging.getLogger(logger_name)
+    logger_handle.setLevel(logging.INFO)
+    logger_handle.propagate = False
+
+    logger_formatter = logging.Formatter(logger_msg_format)
+    for logger_handler in [logging.FileHandler(logger_file, 'w'), logging.StreamHandler()]:
+        logger_handler.setLevel(logging.INFO)
+        logger_handler.setFormatter(logger_formatter)
+        logger_handle.addHandler(logger_handler)
+# -------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------
+# Call script from external library
+if __name__ == "__main__":
+    main()
+# ----------------------------------------------------------------------------
@@ -0,0 +1,211 @@
+"""
+S3M Tools - Benchmark suite - Startup import time
+__date__ = '20261019'
+__version__ = '1.0.0'
+__author__ =
+        'Francesco Avanzi (francesco.avanzi@cimafoundation.org',
+        Fabio Delogu (fabio.delogu@cimafoundation.org)
+__library__ = 's3m'
+General command line:
+### python s3m_benchmark_importtime.py [-tools_folder ../tools] [-time_max 2.0] [-results_file importtime.json]
+Version(s):
+20261019 (1.0.0) --> First release.
+"""
+# -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+# Complete library
+import logging
+import os
+import sys
+import json
+import subprocess
+
+from argparse import ArgumentParser
+
+from lib_benchmark_info_args import logger_name, logger_format
+from lib_benchmark_cases import tool_info
+from lib_benchmark_run import define_process_env
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+
+# Heavy package(s) that must be imported on first use (not at the startup of the tools)
+package_forbidden = ['matplotlib', 'osgeo', 'gdal', 'rasterio', 'netCDF4', 'scipy', 'pyinstrument', 'zarr']
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Script Main
+def main():
+
+    # -------------------------------------------------------------------------------------
+    # Get algorithm settings
+    tools_folder, tools_list, time_max, file_results = get_args()
+    set_logging()
+
+    log_stream.info(' ---> Check startup import time of the tools ... ')
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Iterate over tool(s)
+    exit_code, results_obj = 0, {}
+    for tool_name in tools_list:
+
+        tool_folder = os.path.join(tools_folder, tool_info[tool_name]['folder'])
+        tool_module = os.path.splitext(tool_info[tool_name]['script'])[0]
+
+        log_stream.info(' ----> Tool "' + tool_name + '" ... ')
+        tool_result = check_import_time(tool_module, tool_folder)
+
+        if tool_result['return_code'] != 0:
+            log_stream.error(' ===> Import of "' + tool_module + '" failed: ' + tool_result['error'])
+            tool_result['status'] = 'failed'
+        elif tool_result['package_forbidden']:
+            log_stream.error(' ===> Heavy package(s) imported at startup: ' +
+                             ', '.join(tool_result['package_forbidden']))
+            tool_result['status'] = 'failed'
+        elif (time_max is not None) and (tool_result['time_import'] > time_max):
+            log_stream.error(' ===> Import time ' + '{:.3f}'.format(tool_result['time_import']) +
+                             ' [s] exceeds the limit ' + str(time_max) + ' [s]')
+            tool_result['status'] = 'failed'
+        else:
+            tool_result['status'] = 'ok'
+
+        if tool_result['status'] == 'ok':
+            log_stream.info(' ----> Tool "' + tool_name + '" ... DONE [import time ' +
+                            '{:.3f}'.format(tool_result['time_import']) + ' s]')
+        else:
+            log_stream.info(' ----> Tool "' + tool_name + '" ... FAILED')
+            exit_code = 1
+
+        results_obj[tool_name] = tool_result
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Save result(s) (if defined)
+    if file_results is not None:
+        folder_results = os.path.dirname(file_results)
+        if folder_results:
+            os.makedirs(folder_results, exist_ok=True)
+        with open(file_results, 'w') as file_handle:
+            json.dump({'time_max': time_max, 'tools': results_obj}, file_handle, indent=2)
+        log_stream.info(' ----> Results saved in "' + file_results + '"')
+
+    log_stream.info(' ---> Check startup import time of the tools ... DONE')
+    sys.exit(exit_code)
+    # -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to check the import time of a tool module (python -X importtime in a clean process)
+def check_import_time(tool_module, tool_folder, python_exec=None):
+
+    if python_exec is None:
+        python_exec = sys.executable
+
+    process_obj = subprocess.run([python_exec, '-X', 'importtime', '-c', 'import ' + tool_module],
+                                 cwd=tool_folder, env=define_process_env(os.path.dirname(tool_folder)),
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                 universal_newlines=True)
+
+    import_list, error_lines = parse_import_time(process_obj.stderr)
+
+    # Cumulative time of the tool module (interpreter startup excluded) [us --> s]
+    time_import = sum([import_obj['time_cumulative'] for import_obj in import_list
+                       if (import_obj['level'] == 0) and (import_obj['package'] == tool_module)]) / 1e6
+
+    package_imported = set([import_obj['package'].split('.')[0] for import_obj in import_list])
+    package_found = [package_name for package_name in package_forbidden if package_name in package_imported]
+
+    import_top = sorted([import_obj for import_obj in import_list if import_obj['level'] <= 1],
+                        key=lambda import_obj: import_obj['time_cumulative'], reverse=True)[:10]
+
+    return {'module': tool_module, 'return_code': process_obj.returncode, 'time_import': time_import,
+            'package_forbidden': package_found,
+            'import_top': [{'package': import_obj['package'], 'time': import_obj['time_cumulative'] / 1e6}
+                           for import_obj in import_top],
+            'error': error_lines[-1] if error_lines else ''}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to parse the -X importtime output (lines "import time: self [us] | cumulative | imported package")
+def parse_import_time(process_stderr):
+
+    import_list, error_lines = [], []
+    for process_line in process_stderr.splitlines():
+        if not process_line.startswith('import time:'):
+            if process_line.strip():
+                error_lines.append(process_line.strip())
+            continue
+
+        line_parts = process_line[len('import time:'):].split('|')
+        if len(line_parts) != 3:
+            continue
+        try:
+            time_self, time_cumulative = int(line_parts[0]), int(line_parts[1])
+        except ValueError:
+            # Header line
+            continue
+
+        # Nested import(s) are indented by two spaces for each level
+        package_raw = line_parts[2].rstrip()
+        package_name = package_raw.lstrip()
+        package_level = int((len(package_raw) - len(package_name) - 1) / 2)
+
+        import_list.append({'package': package_name, 'level': package_level,
+                            'time_self': time_self, 'time_cumulative': time_cumulative})
+
+    return import_list, error_lines
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get script argument(s)
+def get_args():
+
+    parser_handle = ArgumentParser()
+    parser_handle.add_argument('-tools_folder', action="store", dest="alg_tools_folder")
+    parser_handle.add_argument('-tools', action="store", dest="alg_tools", nargs='+')
+    parser_handle.add_argument('-time_max', action="store", dest="alg_time_max", type=float)
+    parser_handle.add_argument('-results_file', action="store", dest="alg_results")
+    parser_values = parser_handle.parse_args()
+
+    if parser_values.alg_tools_folder:
+        alg_tools_folder = os.path.abspath(parser_values.alg_tools_folder)
+    else:
+        alg_tools_folder = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tools'))
+
+    if parser_values.alg_tools:
+        alg_tools = parser_values.alg_tools
+    else:
+        alg_tools = list(tool_info.keys())
+
+    return alg_tools_folder, alg_tools, parser_values.alg_time_max, parser_values.alg_results
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to set logging information
+def set_logging(logger_msg_format=None):
+
+    if logger_msg_format is None:
+        logger_msg_format = logger_format
+
+    logger_handle = logging.getLogger(logger_name)
+    logger_handle.setLevel(logging.INFO)
+    logger_handle.propagate = False
+
+    logger_handler = logging.StreamHandler()
+    logger_handler.setLevel(logging.INFO)
+    logger_handler.setFormatter(logging.Formatter(logger_msg_format))
+    logger_handle.addHandler(logger_handler)
+# -------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------
+# Call script from external library
+if __name__ == "__main__":
+    main()
+# ----------------------------------------------------------------------------
@@ -1,7 +1,7 @@
 """
 S3M Postprocessing tools - output 2 netcdf file
-__date__ = '20220811'
-__version__ = '1.1.0'
+__date__ = '20261019'
+__version__ = '1.2.0'
 __author__ =
         'Francesco Avanzi (francesco.avanzi@cimafoundation.org'
         'Andrea Libertino (andrea.libertino@cimafoundation.org',
@@ -10,6 +10,8 @@ __library__ = 's3m'
 General command line:
 ### python s3m_postprocessing_output2nc_converter.py -settings_file s3m_postprocessing_output2nc_converter_example.json -time "YYYY-MM-DD HH:MM"
 Version(s):
+20261019 (1.2.0) --> Added batch mode (one month for each worker process); grids, remap indices and output layout
+computed once
 20220811 (1.1.0) --> Modified routine to export to netCDF for compatibility with QGIS and the NetCDF Climate and Forecast (CF)
 Metadata Conventions
 20220705 (1.0.0) --> First release.
@@ -22,17 +24,11 @@ import logging
 from os.path import join
 from argparse import ArgumentParser
 import pandas as pd
-import xarray as xr
 import numpy as np
 import sys
 import os
-import matplotlib.pylab as plt
 from time import time, strftime, gmtime
-import matplotlib as mpl
-from netCDF4 import Dataset,date2num
-if os.environ.get('DISPLAY','') == '':
-    print('no display found. Using non-interactive Agg backend')
-    mpl.use('Agg')
+from concurrent.futures import ProcessPoolExecutor
 from shutil import copyfile
 
 from lib_postprocessing_output2nc_converter_data_io_json import read_file_json
@@ -40,16 +36,35 @@ from lib_postprocessing_output2nc_converter_utils_time import set_time
 from lib_postprocessing_output2nc_converter_info_args import time_format_algorithm
 from lib_postprocessing_output2nc_converter_geo import read_file_raster
 from lib_postprocessing_output2nc_converter_io_generic import fill_tags2string, unzip_filename
+from s3m_tools import set_logging
+from lib_postprocessing_output2nc_converter_profiling import start_profiling, stop_profiling, Profiler
+
+# Debug (uncomment to plot; matplotlib is loaded only if a debug plot is used)
+# from lib_postprocessing_output2nc_converter_debug import plt
 # -------------------------------------------------------------------------------------
 
 # -------------------------------------------------------------------------------------
 # Algorithm information
 alg_project = 'S3M'
 alg_name = 'S3M Postprocessing tools - Output 2 NetCDF converter '
-alg_version = '1.1.0'
-alg_release = '2022-08-11'
+alg_version = '1.2.0'
+alg_release = '2026-10-19'
 alg_type = 'DataDynamic'
 time_format = '%Y-%m-%d %H:%M'
+
+# Global attribute(s) written in the output file(s)
+global_attributes_list = [
+    'institution', 'source', 'reference', 'featureType', 'Conventions', 'keywords', 'summary', 'title',
+    'acknowledgment', 'comment', 'creator_name', 'creator_url', 'creator_email',
+    'geospatial_lat_min', 'geospatial_lat_max', 'geospatial_lon_min', 'geospatial_lon_max',
+    'history', 'license', 'naming_authority', 'project', 'publisher_name', 'publisher_url', 'publisher_email']
+# Crs attribute(s) written in the output file(s)
+crs_attributes_list = [
+    'inverse_flattening', 'longitude_of_prime_meridian', 'grid_mapping_name', 'semi_major_axis', 'code',
+    'false_easting', 'false_northing']
+
+# Settings and output layout shared by the month(s) (set once in each process)
+month_shared = {}
 # -------------------------------------------------------------------------------------
 # Script Main
 def main():
@@ -78,6 +93,10 @@ def main():
     # Time algorithm information
     start_time = time()
 
+    # Profiling of the run (timers, counters and optional capture)
+    profiling_settings = data_settings['data'].get('profiling', None)
+    profiler = start_profiling(profiling_settings)
+
     # Organize time run
     time_run, time_range, time_chunks = set_time(
         time_run_args=time_arg,
@@ -90,218 +109,47 @@ def main():
         time_rounding=data_settings['time']['time_rounding'],
         time_reverse=data_settings['time']['time_reverse']
     )
-    # -------------------------------------------------------------------------------------
 
+    if data_settings['time']['time_frequency'] != 'M':
+        raise IOError('Time frequency not supported. Please use monthly time frequency')
     # -------------------------------------------------------------------------------------
-    #Load input grid
-    logging.info(' --> Load input domain data ... ')
-    da_domain_in, wide_domain_in, high_domain_in, proj_domain_in, transform_domain_in, \
-    bounding_box_domain_in, no_data_domain_in, crs_domain_in =\
-        read_file_raster(data_settings['data']['input']['input_grid'])
-    logging.info(' --> Load input domain data ... DONE')
-    lat_in = da_domain_in[da_domain_in.dims[0]].data
-    lon_in = da_domain_in[da_domain_in.dims[1]].data
 
     # -------------------------------------------------------------------------------------
-    #Load output grid
-    logging.info(' --> Load output domain data ... ')
-    da_domain_out, wide_domain_out, high_domain_out, proj_domain_out, transform_domain_out, \
-    bounding_box_domain_out, no_data_domain_out, crs_domain_out = \
-        read_file_raster(data_settings['data']['outcome']['output_grid'])
-    logging.info(' --> Load output domain data ... DONE')
-    lat_out = da_domain_out[da_domain_out.dims[0]].data
-    lon_out = da_domain_out[da_domain_out.dims[1]].data
-    lons_out, lats_out  = np.meshgrid(lon_out, lat_out)
-
+    # Load input grid, output grid and remap indices (computed once and shared by the months)
+    with profiler.timer('output_layout'):
+        output_layout = define_output_layout(data_settings)
     # -------------------------------------------------------------------------------------
-    # Iterate over time steps
-    not_available_run = 0
-    for time_step in time_range:
-
-        if data_settings['time']['time_frequency'] == 'M':
-
-            logging.info(' --> Preparing output nc file for month ... ' + str(time_step.month))
-            #get beginning of the month
-            time_step_start = time_step.replace(day=1)
-            time_step_end = time_step
-            logging.info(' --> Month start ... ' + time_step_start.strftime("%Y-%m-%d"))
-            logging.info(' --> Month end ... ' + time_step_end.strftime("%Y-%m-%d"))
-
-            #generate DateTimeIndex of all sub-timesteps
-            time_period_this_month = \
-                pd.date_range(start=time_step_start, end=time_step_end, freq='D')
-            logging.info(' --> Number of days ... ' + str(time_period_this_month.size))
-
-            #create target ndarray
-            size_domain_in = (lat_in.__len__(), lon_in.__len__())
-            data_this_month = np.empty((time_period_this_month.__len__(), size_domain_in[0], size_domain_in[1]))
-            data_this_month[:] = np.nan
-
-            #now load maps
-            for time_i, time_file in enumerate(time_period_this_month):
-
-                #create path to map
-                path_file = os.path.join(data_settings['data']['input']['folder'],
-                                         data_settings['data']['input']['filename'])
-                tag_filled = {'source_gridded_sub_path_time': time_file,
-                          'source_gridded_datetime_daily': time_file,
-                              'variable_name': data_settings['data']['input']['variable_name']}
-                path_file = fill_tags2string(path_file, data_settings['algorithm']['template'], tag_filled)
-                logging.info(' --> Extracting map ... ' + path_file)
-
-                if os.path.exists(path_file):
 
-                    logging.info(' --> Map found!')
-                    # copy to tmp
-                    var_file_path, var_file_name = os.path.split(path_file)
-                    var_file_name_tmp = 'tmp_' + var_file_name
-                    path_file_tmp = os.path.join(var_file_path, var_file_name_tmp)
-                    copyfile(path_file, path_file_tmp)
-                    path_file = path_file_tmp
-                    logging.info(' --> Temporary copy created ... ' + path_file)
-
-                    # unzip if needed
-                    if data_settings['data']['input']['file_compression']:
-                        path_file_unzipped = os.path.splitext(path_file)[0]
-                        if os.path.exists(path_file):
-                            unzip_filename(path_file, path_file_unzipped)
-                            path_file = path_file_unzipped
-                            logging.info(" --> Unzipped " + path_file)
-                        else:
-                            logging.warning(' --> WARNING! output ' + path_file + ' not found!')
-
-                    # load
-                    if data_settings['data']['input']['file_type'] == 'tif':
-
-                        da_this_day, wide_this_day, high_this_day, proj_this_day, transform_this_day, \
-                        bounding_box_this_day, no_data_this_day, crs_this_day = \
-                            read_file_raster(path_file)
-                        lat_this_day = da_this_day[da_this_day.dims[0]].data
-                        lon_this_day = da_this_day[da_this_day.dims[1]].data
-                        logging.info(' --> Map loaded!')
-
-                        # plt.figure()
-                        # plt.imshow(da_this_day.values)
-                        # plt.show()
-                        # plt.close()
-
-                    else:
-                        raise IOError('Input file format currently not supported')
-
-                    # reindex ndarray using output grid
-                    da_this_day = xr.DataArray(da_this_day,
-                                               dims=['lat', 'lon'],
-                                               coords={'lat': lat_this_day, 'lon': lon_this_day})
-                    da_this_day_reindexed = da_this_day.reindex({'lat': lat_out, 'lon': lon_out},
-                                                                method='nearest')
-
-                    # include in target ndarray
-                    data_this_month[time_i, :, :] = np.flipud(da_this_day_reindexed)
-                    #this flipud is needed for compatibility w/ QGIS
-
-                    # we remove tmp file
-                    os.remove(path_file_tmp)  # which is also path_file
+    # -------------------------------------------------------------------------------------
+    # Iterate over time steps (one month for each worker process in batch mode)
+    batch_settings = data_settings.get('batch', {})
+    process_max = 1
+    if batch_settings.get('active', False):
+        process_max = min(int(batch_settings.get('process_max', None) or os.cpu_count() or 1), time_range.size)
 
-                else:
-                    logging.warning(' --> WARNING! output ' + path_file + ' not found!')
-                    not_available_run = not_available_run + 1
-
-
-            #create nc file
-            path_file_out = os.path.join(data_settings['data']['outcome']['folder'],
-                                         data_settings['data']['outcome']['filename'])
-            tag_filled = {'source_gridded_sub_path_time': time_step,
-                          'outcome_datetime_monthly': time_step,
-                          'variable_name': data_settings['data']['input']['variable_name']}
-            path_file_out = fill_tags2string(path_file_out, data_settings['algorithm']['template'], tag_filled)
-            ds = Dataset(path_file_out, 'w', format='NETCDF4')
-
-            #define dimensions
-            Dim_Lat = ds.createDimension('Latitude', lat_out.__len__())
-            Dim_Lon = ds.createDimension('Longitude', lon_out.__len__())
-            Dim_time = ds.createDimension('time', time_period_this_month.__len__())
-            Dim_crs = ds.createDimension('crs', 1)
-
-            # create crs variable
-            crs = ds.createVariable("crs", "c", ("crs",))
-            crs.spatial_ref = proj_domain_out
-            crs.inverse_flattening = data_settings['crs']['inverse_flattening']
-            crs.longitude_of_prime_meridian = data_settings['crs']['longitude_of_prime_meridian']
-            crs.grid_mapping_name = data_settings['crs']['grid_mapping_name']
-            crs.semi_major_axis = data_settings['crs']['semi_major_axis']
-            crs.code = data_settings['crs']['code']
-            crs.false_easting = data_settings['crs']['false_easting']
-            crs.false_northing = data_settings['crs']['false_northing']
-
-            #create lat lon variables
-            Longitude = ds.createVariable("Longitude", "d", ("Longitude",), zlib=True)
-            Longitude[:] = lon_out
-            Longitude.long_name = 'Easting'
-            Longitude.standard_name = 'Easting'
-            Longitude.units = 'degrees'
-            Longitude.scale_factor = 1
-
-            Latitude = ds.createVariable("Latitude", "d", ("Latitude",), zlib=True)
-            Latitude[:] = np.flipud(lat_out) # this flipud is needed for compatibility w/ QGIS
-            Latitude.long_name = 'Northing'
-            Latitude.standard_name = 'Northing'
-            Latitude.units = 'degrees'
-            Latitude.scale_factor = 1
-
-            #create time variable
-            Time = ds.createVariable("Time", "d", ("time",))
-            Time.units = "days since " + time_period_this_month[0].strftime("%Y-%m-%d %H:%M:%S")
-            Time.calendar = "proleptic_gregorian"
-            time_period_this_month_pydatetime = time_period_this_month.to_pydatetime()
-            Time[:] = date2num(time_period_this_month_pydatetime, Time.units)
-
-            #write global attributes
-            ds.institution = data_settings['global_attributes']['institution']
-            ds.source = data_settings['global_attributes']['source']
-            ds.reference = data_settings['global_attributes']['reference']
-            ds.featureType = data_settings['global_attributes']['featureType']
-            ds.Conventions = data_settings['global_attributes']['Conventions']
-            ds.keywords = data_settings['global_attributes']['keywords']
-            ds.summary = data_settings['global_attributes']['summary']
-            ds.title = data_settings['global_attributes']['title']
-            ds.acknowledgment = data_settings['global_attributes']['acknowledgment']
-            ds.comment = data_settings['global_attributes']['comment']
-            ds.creator_name = data_settings['global_attributes']['creator_name']
-            ds.creator_url = data_settings['global_attributes']['creator_url']
-            ds.creator_email = data_settings['global_attributes']['creator_email']
-            ds.geospatial_lat_min = data_settings['global_attributes']['geospatial_lat_min']
-            ds.geospatial_lat_max = data_settings['global_attributes']['geospatial_lat_max']
-            ds.geospatial_lon_min = data_settings['global_attributes']['geospatial_lon_min']
-            ds.geospatial_lon_max = data_settings['global_attributes']['geospatial_lon_max']
-            ds.history = data_settings['global_attributes']['history']
-            ds.license = data_settings['global_attributes']['license']
-            ds.naming_authority = data_settings['global_attributes']['naming_authority']
-            ds.project = data_settings['global_attributes']['project']
-            ds.publisher_name = data_settings['global_attributes']['publisher_name']
-            ds.publisher_url = data_settings['global_attributes']['publisher_url']
-            ds.publisher_email = data_settings['global_attributes']['publisher_email']
-
-            #save matrix with data now
-            Data = ds.createVariable(data_settings['data']['input']['variable_name'], "d", ("time", "Latitude", "Longitude",), \
-                                     zlib=True, fill_value=data_settings['data']['input']['fill_value'])
-            Data[:] = data_this_month
-            Data.grid_mapping = 'crs'
-            Data.coordinates = 'latitude longitude'
-            Data.long_name = data_settings['data']['input']['variable_long_name']
-            Data.standard_name = data_settings['data']['input']['variable_standard_name']
-            Data.units = data_settings['data']['input']['variable_unit']
-            Data.scale_factor = data_settings['data']['input']['variable_scale_factor']
-
-            ds.close()
-            print()
+    not_available_run = 0
+    if process_max > 1:
+        logging.info(' --> Convert ' + str(time_range.size) + ' month(s) with ' + str(process_max) +
+                     ' process(es) ... ')
+        with ProcessPoolExecutor(max_workers=process_max, initializer=set_month_shared,
+                                 initargs=(data_settings, output_layout)) as month_executor:
+            month_results = list(month_executor.map(convert_month, list(time_range)))
+        logging.info(' --> Convert ' + str(time_range.size) + ' month(s) with ' + str(process_max) +
+                     ' process(es) ... DONE')
+    else:
+        set_month_shared(data_settings, output_layout)
+        month_results = [convert_month(time_step) for time_step in time_range]
 
-        else:
-            raise IOError('Time frequency not supported. Please use monthly time frequency')
+    for month_result in month_results:
+        not_available_run = not_available_run + month_result['not_available']
+        profiler.merge(month_result['timers'], month_result['counters'])
 
 #   # -------------------------------------------------------------------------------------
     #Info algorithm
     time_elapsed = round(time() - start_time, 1)
 
+    stop_profiling(profiling_settings)
+
     if not_available_run > 0:
         logging.info(' ')
         logging.info(' ==> ' + alg_name + ' (Version: ' + alg_version + ' Release_Date: ' + alg_release + ')')
@@ -322,6 +170,246 @@ def main():
         sys.exit(0)
         # -------------------------------------------------------------------------------------
 
+# -------------------------------------------------------------------------------------
+# Method to compute the nearest indices of a 1d source coordinate for a 1d destination coordinate
+# (same selection of xarray reindex with method='nearest'; the coordinate can be in any order)
+def compute_remap_index(coord_src, coord_dst):
+
+    coord_src, coord_dst = np.asarray(coord_src), np.asarray(coord_dst)
+    if coord_src.size == 1:
+        return np.zeros(coord_dst.size, dtype=int)
+
+    coord_order = np.argsort(coord_src, kind='stable')
+    coord_sorted = coord_src[coord_order]
+
+    coord_idx = np.clip(np.searchsorted(coord_sorted, coord_dst), 1, coord_sorted.size - 1)
+    coord_left, coord_right = coord_sorted[coord_idx - 1], coord_sorted[coord_idx]
+    coord_idx = coord_idx - ((coord_dst - coord_left) < (coord_right - coord_dst)).astype(int)
+
+    return coord_order[coord_idx]
+
+# -------------------------------------------------------------------------------------
+# Method to get the remap indices of a source grid (cached by grid; the input grid is computed once)
+def get_remap_index(lat_src, lon_src, output_layout):
+
+    remap_key = (lat_src.size, lon_src.size, float(lat_src[0]), float(lat_src[-1]),
+                 float(lon_src[0]), float(lon_src[-1]))
+    remap_cache = output_layout['remap_cache']
+    if remap_key not in remap_cache:
+        remap_cache[remap_key] = (compute_remap_index(lat_src, output_layout['lat_out']),
+                                  compute_remap_index(lon_src, output_layout['lon_out']))
+    return remap_cache[remap_key]
+
+# -------------------------------------------------------------------------------------
+# Method to define the output layout (grids, coordinates, attributes and remap indices of the input grid)
+def define_output_layout(data_settings):
+
+    #Load input grid
+    logging.info(' --> Load input domain data ... ')
+    da_domain_in, wide_domain_in, high_domain_in, proj_domain_in, transform_domain_in, \
+    bounding_box_domain_in, no_data_domain_in, crs_domain_in =\
+        read_file_raster(data_settings['data']['input']['input_grid'])
+    logging.info(' --> Load input domain data ... DONE')
+    lat_in = da_domain_in[da_domain_in.dims[0]].data
+    lon_in = da_domain_in[da_domain_in.dims[1]].data
+
+    #Load output grid
+    logging.info(' --> Load output domain data ... ')
+    da_domain_out, wide_domain_out, high_domain_out, proj_domain_out, transform_domain_out, \
+    bounding_box_domain_out, no_data_domain_out, crs_domain_out = \
+        read_file_raster(data_settings['data']['outcome']['output_grid'])
+    logging.info(' --> Load output domain data ... DONE')
+    lat_out = da_domain_out[da_domain_out.dims[0]].data
+    lon_out = da_domain_out[da_domain_out.dims[1]].data
+
+    output_layout = {
+        'lat_in': lat_in, 'lon_in': lon_in,
+        'lat_out': lat_out, 'lon_out': lon_out,
+        # this flipud is needed for compatibility w/ QGIS
+        'lat_out_file': np.flipud(lat_out),
+        'crs_attributes': dict(
+            [('spatial_ref', proj_domain_out)] +
+            [(attr_name, data_settings['crs'][attr_name]) for attr_name in crs_attributes_list]),
+        'global_attributes': dict(
+            [(attr_name, data_settings['global_attributes'][attr_name]) for attr_name in global_attributes_list]),
+        'remap_cache': {}}
+
+    # remap indices of the input grid (maps on the same grid are remapped by indexing)
+    get_remap_index(lat_in, lon_in, output_layout)
+
+    return output_layout
+
+# -------------------------------------------------------------------------------------
+# Method to set the settings and output layout shared by the month(s) of the process
+def set_month_shared(data_settings, output_layout):
+    month_shared['data_settings'] = data_settings
+    month_shared['output_layout'] = output_layout
+
+# -------------------------------------------------------------------------------------
+# Method to convert the maps of a month in a netcdf file
+def convert_month(time_step):
+
+    data_settings = month_shared['data_settings']
+    output_layout = month_shared['output_layout']
+    lat_out, lon_out = output_layout['lat_out'], output_layout['lon_out']
+
+    # profiler of the month (timers and counters merged by the main process)
+    profiler = Profiler('month')
+    not_available_run = 0
+
+    logging.info(' --> Preparing output nc file for month ... ' + str(time_step.month))
+    #get beginning of the month
+    time_step_start = time_step.replace(day=1)
+    time_step_end = time_step
+    logging.info(' --> Month start ... ' + time_step_start.strftime("%Y-%m-%d"))
+    logging.info(' --> Month end ... ' + time_step_end.strftime("%Y-%m-%d"))
+
+    #generate DateTimeIndex of all sub-timesteps
+    time_period_this_month = \
+        pd.date_range(start=time_step_start, end=time_step_end, freq='D')
+    logging.info(' --> Number of days ... ' + str(time_period_this_month.size))
+
+    #create target ndarray (on the output grid)
+    data_this_month = np.empty((time_period_this_month.__len__(), lat_out.__len__(), lon_out.__len__()))
+    data_this_month[:] = np.nan
+
+    #now load maps
+    for time_i, time_file in enumerate(time_period_this_month):
+
+        #create path to map
+        path_file = os.path.join(data_settings['data']['input']['folder'],
+                                 data_settings['data']['input']['filename'])
+        tag_filled = {'source_gridded_sub_path_time': time_file,
+                      'source_gridded_datetime_daily': time_file,
+                      'variable_name': data_settings['data']['input']['variable_name']}
+        path_file = fill_tags2string(path_file, data_settings['algorithm']['template'], tag_filled)
+        logging.info(' --> Extracting map ... ' + path_file)
+
+        if os.path.exists(path_file):
+
+            logging.info(' --> Map found!')
+            # copy to tmp
+            var_file_path, var_file_name = os.path.split(path_file)
+            var_file_name_tmp = 'tmp_' + var_file_name
+            path_file_tmp = os.path.join(var_file_path, var_file_name_tmp)
+            with profiler.timer('source_copy'):
+                copyfile(path_file, path_file_tmp)
+            profiler.count_file('source_copy', path_file_tmp)
+            path_file = path_file_tmp
+            logging.info(' --> Temporary copy created ... ' + path_file)
+
+            # unzip if needed
+            if data_settings['data']['input']['file_compression']:
+                path_file_unzipped = os.path.splitext(path_file)[0]
+                if os.path.exists(path_file):
+                    with profiler.timer('source_unzip'):
+                        unzip_filename(path_file, path_file_unzipped)
+                    path_file = path_file_unzipped
+                    logging.info(" --> Unzipped " + path_file)
+                else:
+                    logging.warning(' --> WARNING! output ' + path_file + ' not found!')
+
+            # load
+            if data_settings['data']['input']['file_type'] == 'tif':
+
+                profiler.count_file('source_read', path_file)
+                with profiler.timer('source_read'):
+                    da_this_day, wide_this_day, high_this_day, proj_this_day, transform_this_day, \
+                    bounding_box_this_day, no_data_this_day, crs_this_day = \
+                        read_file_raster(path_file)
+                lat_this_day = da_this_day[da_this_day.dims[0]].data
+                lon_this_day = da_this_day[da_this_day.dims[1]].data
+                logging.info(' --> Map loaded!')
+
+                # plt.figure()
+                # plt.imshow(da_this_day.values)
+                # plt.show()
+                # plt.close()
+
+            else:
+                raise IOError('Input file format currently not supported')
+
+            # reindex ndarray using output grid (nearest indices computed once for each source grid)
+            with profiler.timer('remap'):
+                idx_lat, idx_lon = get_remap_index(lat_this_day, lon_this_day, output_layout)
+                da_this_day_reindexed = np.asarray(da_this_day.values)[np.ix_(idx_lat, idx_lon)]
+
+            # include in target ndarray
+            data_this_month[time_i, :, :] = np.flipud(da_this_day_reindexed)
+            #this flipud is needed for compatibility w/ QGIS
+
+            # we remove tmp file
+            os.remove(path_file_tmp)  # which is also path_file
+
+        else:
+            logging.warning(' --> WARNING! output ' + path_file + ' not found!')
+            not_available_run = not_available_run + 1
+
+    #create nc file
+    path_file_out = os.path.join(data_settings['data']['outcome']['folder'],
+                                 data_settings['data']['outcome']['filename'])
+    tag_filled = {'source_gridded_sub_path_time': time_step,
+                  'outcome_datetime_monthly': time_step,
+                  'variable_name': data_settings['data']['input']['variable_name']}
+    path_file_out = fill_tags2string(path_file_out, data_settings['algorithm']['template'], tag_filled)
+
+    time_write_start = time()
+    write_month_file(path_file_out, data_this_month, time_period_this_month, data_settings, output_layout)
+    profiler.add_time('destination_write', time() - time_write_start)
+    profiler.count_file('destination_write', path_file_out)
+
+    return {'time_step': time_step, 'not_available': not_available_run,
+            'timers': profiler.timers, 'counters': profiler.counters}
+
+# -------------------------------------------------------------------------------------
+# Method to write the netcdf file of a month (coordinates and attributes of the output layout)
+def write_month_file(path_file_out, data_this_month, time_period_this_month, data_settings, output_layout):
+
+    from netCDF4 import Dataset, date2num  # imported on first use (startup of the tool)
+    ds = Dataset(path_file_out, 'w', format='NETCDF4')
+
+    #define dimensions
+    Dim_Lat = ds.createDimension('Latitude', output_layout['lat_out'].__len__())
+    Dim_Lon = ds.createDimension('Longitude', output_layout['lon_out'].__len__())
+    Dim_time = ds.createDimension('time', time_period_this_month.__len__())
+    Dim_crs = ds.createDimension('crs', 1)
+
+    # create crs variable
+    crs = ds.createVariable("crs", "c", ("crs",))
+    crs.setncatts(output_layout['crs_attributes'])
+
+    #create lat lon variables
+    Longitude = ds.createVariable("Longitude", "d", ("Longitude",), zlib=True)
+    Longitude[:] = output_layout['lon_out']
+    Longitude.setncatts({'long_name': 'Easting', 'standard_name': 'Easting', 'units': 'degrees', 'scale_factor': 1})
+
+    Latitude = ds.createVariable("Latitude", "d", ("Latitude",), zlib=True)
+    Latitude[:] = output_layout['lat_out_file'] # this flipud is needed for compatibility w/ QGIS
+    Latitude.setncatts({'long_name': 'Northing', 'standard_name': 'Northing', 'units': 'degrees', 'scale_factor': 1})
+
+    #create time variable
+    Time = ds.createVariable("Time", "d", ("time",))
+    Time.units = "days since " + time_period_this_month[0].strftime("%Y-%m-%d %H:%M:%S")
+    Time.calendar = "proleptic_gregorian"
+    time_period_this_month_pydatetime = time_period_this_month.to_pydatetime()
+    Time[:] = date2num(time_period_this_month_pydatetime, Time.units)
+
+    #write global attributes
+    ds.setncatts(output_layout['global_attributes'])
+
+    #save matrix with data now
+    Data = ds.createVariable(data_settings['data']['input']['variable_name'], "d", ("time", "Latitude", "Longitude",), \
+                             zlib=True, fill_value=data_settings['data']['input']['fill_value'])
+    Data[:] = data_this_month
+    Data.grid_mapping = 'crs'
+    Data.coordinates = 'latitude longitude'
+    Data.long_name = data_settings['data']['input']['variable_long_name']
+    Data.standard_name = data_settings['data']['input']['variable_standard_name']
+    Data.units = data_settings['data']['input']['variable_unit']
+    Data.scale_factor = data_settings['data']['input']['variable_scale_factor']
+
+    ds.close()
+
 # -------------------------------------------------------------------------------------
 # Method to get script argument(s)
 def get_args():
@@ -347,40 +435,6 @@ def get_args():
 
 # -------------------------------------------------------------------------------------
 
-# -------------------------------------------------------------------------------------
-# Method to set logging information
-def set_logging(logger_file='log.txt', logger_format=None):
-    if logger_format is None:
-        logger_format = '%(asctime)s %(name)-12s %(levelname)-8s ' \
-                        '%(filename)s:[%(lineno)-6s - %(funcName)20s()] %(message)s'
-
-    # Remove old logging file
-    if os.path.exists(logger_file):
-        os.remove(logger_file)
-
-    # Set level of root debugger
-    logging.root.setLevel(logging.INFO)
-
-    # Open logging basic configuration
-    logging.basicConfig(level=logging.INFO, format=logger_format, filename=logger_file, filemode='w')
-
-    # Set logger handle
-    logger_handle_1 = logging.FileHandler(logger_file, 'w')
-    logger_handle_2 = logging.StreamHandler()
-    # Set logger level
-    logger_handle_1.setLevel(logging.INFO)
-    logger_handle_2.setLevel(logging.INFO)
-    # Set logger formatter
-    logger_formatter = logging.Formatter(logger_format)
-    logger_handle_1.setFormatter(logger_formatter)
-    logger_handle_2.setFormatter(logger_formatter)
-    # Add handle to logging
-    logging.getLogger('').addHandler(logger_handle_1)
-    logging.getLogger('').addHandler(logger_handle_2)
-
-
-# -------------------------------------------------------------------------------------
-
 # ----------------------------------------------------------------------------
 # Call script from external library
 if __name__ == "__main__":
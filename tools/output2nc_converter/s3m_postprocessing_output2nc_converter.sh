@@ -9,6 +9,7 @@ script_date='2022/07/05'
 virtualenv_folder='/home/fp_virtualenv_python3/'
 virtualenv_name='fp_virtualenv_python3_hyde_libraries'
 script_folder='/home/s3m_output2nc_converter/'
+s3m_tools_folder='/home/s3m_tools/' # shared library (not needed if installed with pip)
 
 # Execution example:
 # python3 s3m_postprocessing_output2nc_converter.py -settings_file s3m_postprocessing_output2nc_converter.json -time "2020-11-02 12:00"
@@ -30,7 +31,7 @@ export PATH=$virtualenv_folder/bin:$PATH
 source activate $virtualenv_name
 
 # Add path to pythonpath
-export PYTHONPATH="${PYTHONPATH}:$script_folder"
+export PYTHONPATH="${PYTHONPATH}:$script_folder:$s3m_tools_folder"
 #-----------------------------------------------------------------------------------------
 
 # ----------------------------------------------------------------------------------------
@@ -0,0 +1,4 @@
+# -------------------------------------------------------------------------------------
+# Libraries
+from s3m_tools import Profiler, get_profiler, start_profiling, stop_profiling  # noqa: F401 (shared library)
+# -------------------------------------------------------------------------------------
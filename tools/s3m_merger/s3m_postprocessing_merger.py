@@ -18,7 +18,6 @@ Version(s):
 # -------------------------------------------------------------------------------------
 # Complete library
 import logging
-import gzip
 from os.path import join
 from argparse import ArgumentParser
 import pandas as pd
@@ -26,21 +25,19 @@ import xarray as xr
 import numpy as np
 import sys
 import os
-import matplotlib.pylab as plt
 from time import time, strftime, gmtime
-import netCDF4
-import matplotlib as mpl
-if os.environ.get('DISPLAY','') == '':
-    print('no display found. Using non-interactive Agg backend')
-    mpl.use('Agg')
-import rasterio as rio
 from shutil import copyfile
 
 from lib_postprocessing_merger_data_io_json import read_file_json
 from lib_postprocessing_merger_utils_time import set_time
 from lib_postprocessing_merger_info_args import logger_name, time_format_algorithm
 from lib_postprocessing_merger_geo import read_file_raster
-from lib_postprocessing_merger_io_generic import fill_tags2string, unzip_filename
+from lib_postprocessing_merger_io_generic import fill_tags2string, fill_tags2string_range, unzip_filename
+from s3m_tools import set_logging, FileIndex
+from lib_postprocessing_merger_profiling import start_profiling, stop_profiling
+
+# Debug (uncomment to plot; matplotlib is loaded only if a debug plot is used)
+# from lib_postprocessing_merger_debug import plt
 # -------------------------------------------------------------------------------------
 
 # -------------------------------------------------------------------------------------
@@ -57,6 +54,9 @@ time_format = '%Y-%m-%d %H:%M'
 # Script Main
 def main():
 
+    # rasterio is imported when the tool runs (not at the import of the module)
+    import rasterio as rio
+
     # -------------------------------------------------------------------------------------
     # Get algorithm settings
     [file_script, file_settings, time_arg] = get_args()
@@ -81,6 +81,10 @@ def main():
     # Time algorithm information
     start_time = time()
 
+    # Profiling of the run (timers, counters and optional capture)
+    profiling_settings = data_settings['data'].get('profiling', None)
+    profiler = start_profiling(profiling_settings)
+
     # Organize time run
     time_run, time_range, time_chunks = set_time(
         time_run_args=time_arg,
@@ -100,11 +104,19 @@ def main():
     logging.info(' --> Load output domain data ... ')
     da_domain, wide_domain, high_domain, proj_domain, transform_domain, \
     bounding_box_domain, no_data_domain, crs_domain = read_file_raster(data_settings['data']['outcome']['output_grid'])
+    profiler.count_file('domain_grid_read', data_settings['data']['outcome']['output_grid'])
     logging.info(' --> Load output domain data ... DONE')
     lat_out = da_domain[da_domain.dims[0]].data
     lon_out = da_domain[da_domain.dims[1]].data
 
     # -------------------------------------------------------------------------------------
+    # File index of each domain (output file(s) resolved by the file index of the runner, if defined; read once)
+    file_index_domain = {}
+    if data_settings['data']['input'].get('index_file', None) is not None:
+        for domain in data_settings['data']['input']['domains']:
+            file_index_domain[domain] = FileIndex(fill_tags2string(
+                data_settings['data']['input']['index_file'], data_settings['algorithm']['template'], {'domain': domain}))
+
     # Iterate over time steps
     for time_step in time_range:
 
@@ -148,14 +160,17 @@ def main():
                 path_domain = fill_tags2string(path_domain, data_settings['algorithm']['template'], tag_filled)
                 if path_domain.endswith('.gz'):
                     path_domain_nc = os.path.splitext(path_domain)[0]
-                    unzip_filename(path_domain, path_domain_nc)
+                    with profiler.timer('source_unzip'):
+                        unzip_filename(path_domain, path_domain_nc)
                     logging.info(' --> Unzipped file ' + path_domain)
                 else:
                     path_domain_nc = path_domain
-                domain_grid = xr.open_dataset(path_domain_nc)
-                lat_in = np.flipud(domain_grid[data_settings['data']['input']['grid_lat']].values[:,0])
-                lon_in = (domain_grid[data_settings['data']['input']['grid_lon']].values[0,:])
-                dem_in = np.flipud(domain_grid[data_settings['data']['input']['grid_dem']].values)
+                profiler.count_file('domain_grid_read', path_domain_nc)
+                with profiler.timer('domain_grid_read'):
+                    domain_grid = xr.open_dataset(path_domain_nc)
+                    lat_in = np.flipud(domain_grid[data_settings['data']['input']['grid_lat']].values[:,0])
+                    lon_in = (domain_grid[data_settings['data']['input']['grid_lon']].values[0,:])
+                    dem_in = np.flipud(domain_grid[data_settings['data']['input']['grid_dem']].values)
                 dem_in[dem_in<0]= np.nan
                 logging.info(' --> Loaded domain data from ' + path_domain_nc)
 
@@ -175,14 +190,18 @@ def main():
                     os.remove(path_domain_nc)
                     logging.info(' --> Removed file ' + path_domain_nc)
 
-                #load layers
+                #load layers (file names of the summary period are filled at once)
+                path_file_list = fill_tags2string_range(
+                    os.path.join(data_settings['data']['input']['folder'], data_settings['data']['input']['filename']),
+                    data_settings['algorithm']['template'], time_step_summary,
+                    {'layer': str(layer), 'domain': domain})
+
+                # output file(s) of the domain resolved by the file index of the runner (if defined)
+                file_index = file_index_domain.get(domain, None)
                 for time_i, time_file in enumerate(time_step_summary):
-                    path_file = os.path.join(data_settings['data']['input']['folder'],data_settings['data']['input']['filename'])
-                    tag_filled = {'layer': str(layer),
-                                  'domain': domain,
-                                  'source_gridded_sub_path_time': time_file,
-                                  'source_gridded_datetime': time_file}
-                    path_file = fill_tags2string(path_file, data_settings['algorithm']['template'], tag_filled)
+                    path_file = path_file_list[time_i]
+                    if file_index is not None:
+                        path_file = file_index.lookup('output', time_file) or path_file
                     logging.info(" --> Loading " + layer + " from " + path_file + " for domain " + domain + "time: " + time_file.strftime("%Y-%m-%d %H:%M"))
 
                     #we copy to tmp
@@ -190,13 +209,16 @@ def main():
                     var_file_name_tmp = 'tmp_' + var_file_name
                     path_file_tmp = os.path.join(var_file_path, var_file_name_tmp)
                     if os.path.exists(path_file):
-                        copyfile(path_file, path_file_tmp)
+                        with profiler.timer('source_copy'):
+                            copyfile(path_file, path_file_tmp)
+                        profiler.count_file('source_copy', path_file_tmp)
                     path_file = path_file_tmp
 
                     if path_file.endswith('.gz'):
                         path_file_nc = os.path.splitext(path_file)[0]
                         if os.path.exists(path_file):
-                            unzip_filename(path_file, path_file_nc)
+                            with profiler.timer('source_unzip'):
+                                unzip_filename(path_file, path_file_nc)
                             logging.info(" --> Unzipped " + path_file)
                         else:
                             logging.warning(' --> WARNING! output GZ for domain ' + domain + \
@@ -206,8 +228,10 @@ def main():
                         path_file_nc = path_file
 
                     if os.path.exists(path_file_nc):
-                        data = xr.open_dataset(path_file_nc)
-                        data_this_layer_and_time = np.flipud(data[layer].values)
+                        profiler.count_file('source_read', path_file_nc)
+                        with profiler.timer('source_read'):
+                            data = xr.open_dataset(path_file_nc)
+                            data_this_layer_and_time = np.flipud(data[layer].values)
                         data_this_layer_and_time[np.isnan(dem_in)]=np.nan
                         logging.info(
                             " --> Loaded " + layer + " from " + path_file + " for domain " + domain + "time: " + time_file.strftime(
@@ -270,12 +294,13 @@ def main():
                                          data_this_layer * data_settings['data']['input']['scale_factor_output'][layer_i])
 
                 #We reindex this domain layer using the output grid
-                data_this_layer_in = \
-                    xr.DataArray(data_this_layer,
-                                 dims=['lat', 'lon'],
-                                 coords={'lat': lat_in, 'lon': lon_in})
-                data_this_layer_out = data_this_layer_in.reindex({'lat': lat_out, 'lon': lon_out}, method='nearest')
-                layer_out = np.where(np.isnan(data_this_layer_out.values), layer_out, data_this_layer_out)
+                with profiler.timer('remap'):
+                    data_this_layer_in = \
+                        xr.DataArray(data_this_layer,
+                                     dims=['lat', 'lon'],
+                                     coords={'lat': lat_in, 'lon': lon_in})
+                    data_this_layer_out = data_this_layer_in.reindex({'lat': lat_out, 'lon': lon_out}, method='nearest')
+                    layer_out = np.where(np.isnan(data_this_layer_out.values), layer_out, data_this_layer_out)
                 logging.info(
                     " --> Remapped " + layer + " for domain " + domain + " on target grid")
 
@@ -305,18 +330,23 @@ def main():
             #save output
             logging.info(" --> Write output for layer:" + layer + ' and time ' + time_step.strftime("%Y-%m-%d %H:%M"))
             layer_out = layer_out.astype(np.float32)
-            with rio.open(output_dir, 'w', height=len(lat_out), width=len(lon_out), count=1, dtype='float32',
-                               crs='EPSG:4326', transform=transform_domain, driver='GTiff', nodata=-9999) as out:
-                out.write(layer_out, 1)
-                logging.info(
-                    " --> Saved " + layer + "to " + output_dir)
-                if data_settings['algorithm']['flags']['compress_output']:
-                     os.system('gzip -f ' + output_dir)
+            with profiler.timer('destination_write'):
+                with rio.open(output_dir, 'w', height=len(lat_out), width=len(lon_out), count=1, dtype='float32',
+                                   crs='EPSG:4326', transform=transform_domain, driver='GTiff', nodata=-9999) as out:
+                    out.write(layer_out, 1)
+                    logging.info(
+                        " --> Saved " + layer + "to " + output_dir)
+            profiler.count_file('destination_write', output_dir)
+            if data_settings['algorithm']['flags']['compress_output']:
+                with profiler.timer('destination_zip'):
+                    os.system('gzip -f ' + output_dir)
 
 #   # -------------------------------------------------------------------------------------
     #Info algorithm
     time_elapsed = round(time() - start_time, 1)
 
+    stop_profiling(profiling_settings)
+
     if not_available_run > 0:
         logging.info(' ')
         logging.info(' ==> ' + alg_name + ' (Version: ' + alg_version + ' Release_Date: ' + alg_release + ')')
@@ -362,40 +392,6 @@ def get_args():
 
 # -------------------------------------------------------------------------------------
 
-# -------------------------------------------------------------------------------------
-# Method to set logging information
-def set_logging(logger_file='log.txt', logger_format=None):
-    if logger_format is None:
-        logger_format = '%(asctime)s %(name)-12s %(levelname)-8s ' \
-                        '%(filename)s:[%(lineno)-6s - %(funcName)20s()] %(message)s'
-
-    # Remove old logging file
-    if os.path.exists(logger_file):
-        os.remove(logger_file)
-
-    # Set level of root debugger
-    logging.root.setLevel(logging.INFO)
-
-    # Open logging basic configuration
-    logging.basicConfig(level=logging.INFO, format=logger_format, filename=logger_file, filemode='w')
-
-    # Set logger handle
-    logger_handle_1 = logging.FileHandler(logger_file, 'w')
-    logger_handle_2 = logging.StreamHandler()
-    # Set logger level
-    logger_handle_1.setLevel(logging.INFO)
-    logger_handle_2.setLevel(logging.INFO)
-    # Set logger formatter
-    logger_formatter = logging.Formatter(logger_format)
-    logger_handle_1.setFormatter(logger_formatter)
-    logger_handle_2.setFormatter(logger_formatter)
-    # Add handle to logging
-    logging.getLogger('').addHandler(logger_handle_1)
-    logging.getLogger('').addHandler(logger_handle_2)
-
-
-# -------------------------------------------------------------------------------------
-
 # ----------------------------------------------------------------------------
 # Call script from external library
 if __name__ == "__main__":
@@ -9,6 +9,7 @@ script_date='2021/10/29'
 virtualenv_folder=''
 virtualenv_name=''
 script_folder=''
+s3m_tools_folder='' # shared library (not needed if installed with pip)
 
 # Execution example:
 # python3 s3m_postprocessing_merger.py -settings_file s3m_postprocessing_merger.json -time "2020-11-02 12:00"
@@ -30,7 +31,7 @@ export PATH=$virtualenv_folder/bin:$PATH
 source activate $virtualenv_name
 
 # Add path to pythonpath
-export PYTHONPATH="${PYTHONPATH}:$script_folder"
+export PYTHONPATH="${PYTHONPATH}:$script_folder:$s3m_tools_folder"
 #-----------------------------------------------------------------------------------------
 
 # ----------------------------------------------------------------------------------------
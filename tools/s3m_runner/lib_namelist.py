@@ -10,34 +10,169 @@ Version:       '3.0.0'
 #######################################################################################
 # Library
 import logging
-import numpy as np
+import re
 
 from lib_default_args import logger_name
 
 from lib_utils_list import convert_list_2_string
-from lib_utils_fortran import define_var_format
 from lib_utils_system import fill_tags2string
 
 import os
 import pandas as pd
 
+from pandas.tseries.frequencies import to_offset
+
 # Logging
 log_stream = logging.getLogger(logger_name)
 
+# Namelist line(s): group start (&name), group end (/ or &end) and variable (name or name(index) = value)
+namelist_group_start = re.compile(r'^\s*&(\w+)')
+namelist_group_end = re.compile(r'^\s*(/|&end)\s*$', re.IGNORECASE)
+namelist_variable = re.compile(r'^(\s*)([A-Za-z]\w*(?:\s*\([^)]*\))?)\s*=')
+
 # Debug
 # import matplotlib.pylab as plt
 #######################################################################################
 
+
+# --------------------------------------------------------------------------------
+# Class to edit a namelist (lines indexed by group and variable name once; edits are made by line)
+class Namelist:
+
+    # --------------------------------------------------------------------------------
+    # Initialize class
+    def __init__(self, lines, index=None):
+        self.lines = list(lines)
+        # index: variable name (lower case) --> list of (group name, first line, last line)
+        self.index = index if index is not None else self.build_index(self.lines)
+    # --------------------------------------------------------------------------------
+
+    # --------------------------------------------------------------------------------
+    # Method to index the variable line(s) (values continued on the next lines are included)
+    @staticmethod
+    def build_index(lines):
+
+        index, group_name, variable_last = {}, None, None
+        for line_idx, line in enumerate(lines):
+            line_code = split_namelist_comment(line)[0].strip()
+
+            if namelist_group_start.match(line):
+                group_name, variable_last = namelist_group_start.match(line).group(1), None
+            elif namelist_group_end.match(line_code):
+                group_name, variable_last = None, None
+            elif namelist_variable.match(line):
+                variable_key = re.sub(r'\s+', '', namelist_variable.match(line).group(2)).lower()
+                variable_last = [group_name, line_idx, line_idx]
+                index.setdefault(variable_key, []).append(variable_last)
+            elif line_code and (variable_last is not None):
+                variable_last[2] = line_idx
+
+            # Group end written after the last value (x = 1 /)
+            if (variable_last is not None) and check_namelist_group_end(line_code):
+                group_name, variable_last = None, None
+
+        return {key: [tuple(entry) for entry in entries] for key, entries in index.items()}
+    # --------------------------------------------------------------------------------
+
+    # --------------------------------------------------------------------------------
+    # Method to copy the namelist (the index is shared; edits do not move the lines)
+    def copy(self):
+        return Namelist(self.lines, index=self.index)
+    # --------------------------------------------------------------------------------
+
+    # --------------------------------------------------------------------------------
+    # Method to check a variable
+    def __contains__(self, variable_name):
+        return variable_name.lower() in self.index
+    # --------------------------------------------------------------------------------
+
+    # --------------------------------------------------------------------------------
+    # Method to find the line(s) of a variable (group needed if the variable is defined in more groups; the group
+    # of the settings is used only to select between more groups)
+    def find(self, variable_name, group_name=None):
+
+        entries = self.index.get(variable_name.lower(), [])
+        if (group_name is not None) and (len(entries) > 1):
+            entries = [entry for entry in entries if (entry[0] or '').lower() == group_name.lower()] or entries
+
+        if not entries:
+            log_stream.error(' ===> ' + variable_name + ' not found in namelist!')
+            raise IOError('Check filename_namelist')
+        if len(entries) > 1:
+            log_stream.error(' ===> ' + variable_name + ' defined in more namelist groups ' +
+                             str([entry[0] for entry in entries]) + '. Group must be defined')
+            raise IOError('Check filename_namelist')
+
+        return entries[0]
+    # --------------------------------------------------------------------------------
+
+    # --------------------------------------------------------------------------------
+    # Method to set a variable (indentation and comment of the line are kept)
+    def set(self, variable_name, variable_value, group_name=None):
+
+        _, line_start, line_end = self.find(variable_name, group_name)
+        line, line_last = self.lines[line_start], self.lines[line_end]
+        line_indent, line_name = namelist_variable.match(line).group(1, 2)
+        line_comment = split_namelist_comment(line_end_strip(line))[1]
+
+        new_line = line_indent + line_end_strip(write_namelist_line(line_name, variable_value))
+        # Group end written after the last value is kept
+        if check_namelist_group_end(split_namelist_comment(line_end_strip(line_last))[0].strip()):
+            new_line = new_line + ' /'
+        if line_comment:
+            new_line = new_line + ' ' + line_comment
+        self.lines[line_start] = new_line + line_last[len(line_end_strip(line_last)):]
+
+        # Continuation line(s) of the previous value are emptied (line positions are kept)
+        for line_idx in range(line_start + 1, line_end + 1):
+            self.lines[line_idx] = ''
+    # --------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------
+
+
+# --------------------------------------------------------------------------------
+# Method to strip the line end
+def line_end_strip(line):
+    return line.rstrip('\r\n')
+# --------------------------------------------------------------------------------
+
+
+# --------------------------------------------------------------------------------
+# Method to check the group end written after a value (code of the line without comment; quoted values end
+# with the quote)
+def check_namelist_group_end(line_code):
+    return line_code.endswith('/')
+# --------------------------------------------------------------------------------
+
+
+# --------------------------------------------------------------------------------
+# Method to split a namelist line in code and comment (! outside of quotes)
+def split_namelist_comment(line):
+
+    quote_char = None
+    for char_idx, char in enumerate(line):
+        if quote_char is not None:
+            if char == quote_char:
+                quote_char = None
+        elif char in ('"', "'"):
+            quote_char = char
+        elif char == '!':
+            return line[:char_idx].rstrip(), line[char_idx:].rstrip('\r\n')
+    return line, ''
+# --------------------------------------------------------------------------------
+
+
 # --------------------------------------------------------------------------------
 # Method to read namelist
 def read_namelist_file(filename_namelist):
 
     if os.path.exists(filename_namelist):
-        f = open(filename_namelist, "r")
-        namelist_default = f.readlines()
+        with open(filename_namelist, "r") as f:
+            namelist_default = Namelist(f.readlines())
     else:
         log_stream.error(' ===> Default namelist not found!')
-        raise NotImplemented('Check filepath for filename_namelist')
+        raise IOError('Check filepath for filename_namelist')
 
     return namelist_default
 
@@ -49,18 +184,18 @@ def write_namelist_file(filename_namelist, namelist, template, ancillary_info):
     filename_namelist = fill_tags2string(filename_namelist, template, ancillary_info)
 
     folder, filename = os.path.split(filename_namelist)
-    if os.path.exists(folder) is False:
-        os.makedirs(folder)
+    if folder and (os.path.exists(folder) is False):
+        os.makedirs(folder, exist_ok=True)
 
-    f = open(filename_namelist, "w")
-    f.writelines(namelist)
+    if isinstance(namelist, Namelist):
+        namelist = namelist.lines
+    with open(filename_namelist, "w") as f:
+        f.writelines(namelist)
 
 # --------------------------------------------------------------------------------
-# Method to modify namelist based on dictionary
-def modify_namelist(namelist_default, data_settings_dict, template,
-                    ancillary_info, time_range, settings_time, time_reverse=True):
+# Method to define the simulation time range (rounded to the previous midnight if activated)
+def define_sim_range(time_range, settings_time, time_reverse=True):
 
-    #manage rounding to midnight
     if 'round_to_previous_midnight' in settings_time.keys():
         if settings_time['round_to_previous_midnight']:
 
@@ -70,62 +205,101 @@ def modify_namelist(namelist_default, data_settings_dict, template,
             if time_reverse:
                 time_range = time_range[::-1]
 
+    return time_range
+
+# --------------------------------------------------------------------------------
+# Method to define the time values of the namelist (simulation length, start and restart)
+def define_namelist_time(template, ancillary_info, time_range, settings_time, time_reverse=True):
+
+    #manage rounding to midnight
+    time_range = define_sim_range(time_range, settings_time, time_reverse=time_reverse)
+
+    time_values = {'iSimLength': time_range.size}
+
+    if "tag_sim_start_and_restart" in ancillary_info.keys():
+        tag_sim = ancillary_info["tag_sim_start_and_restart"]
+        time_start = time_range[-1] if time_reverse else time_range[0]
+
+        time_values['sTimeStart'] = fill_tags2string('{' + tag_sim + '}', template, {tag_sim: time_start})
+        time_values['sTimeRestart'] = fill_tags2string(
+            '{' + tag_sim + '}', template, {tag_sim: time_start - to_offset(settings_time['time_frequency'])})
+
+    return time_values
+
+# --------------------------------------------------------------------------------
+# Method to split the settings in fixed values and values filled by domain and time (group of the settings kept)
+def split_namelist_settings(data_settings_dict):
+
+    settings_fixed, settings_filled = [], []
     for group_tag, group_dict in data_settings_dict.items():
         for variable_name, variable_value in group_dict.items():
-
-            #replace ancillary_info tags if present
-            if isinstance(variable_value, str):
-                variable_value = fill_tags2string(variable_value, template, ancillary_info)
-
-            #handle simulation length
-            if (variable_name == "iSimLength") & (variable_value is None):
-                variable_value = time_range.size
-
-            #handle simulation start and end
-            if (variable_name == "sTimeStart") & (variable_value is None):
-                if "tag_sim_start_and_restart" in ancillary_info.keys():
-
-                    tag_to_replace = {}
-                    if time_reverse:
-                        tag_to_replace[ancillary_info["tag_sim_start_and_restart"]] = time_range[-1]
-                    else:
-                        tag_to_replace[ancillary_info["tag_sim_start_and_restart"]] = time_range[0]
-                    variable_value = '{' + ancillary_info["tag_sim_start_and_restart"] + '}'
-                    variable_value = fill_tags2string(variable_value, template, tag_to_replace)
-
-                else:
-                    log_stream.error(' ===> tag_sim_start_and_restart not found in ancillary_info!')
-                    raise NotImplemented('Check configuration file')
-
-            if (variable_name == "sTimeRestart") & (variable_value is None):
-                if "tag_sim_start_and_restart" in ancillary_info.keys():
-
-                    tag_to_replace = {}
-                    if time_reverse:
-                        tag_to_replace[ancillary_info["tag_sim_start_and_restart"]] = time_range[-1] - pd.Timedelta(
-                            hours=1)
-                    else:
-                        tag_to_replace[ancillary_info["tag_sim_start_and_restart"]] = time_range[0] - pd.Timedelta(
-                            hours=1)
-
-                    tag_to_replace[ancillary_info["tag_sim_start_and_restart"]] = time_range[-1] - pd.Timedelta(hours=1)
-                    variable_value = '{' + ancillary_info["tag_sim_start_and_restart"] + '}'
-                    variable_value = fill_tags2string(variable_value, template, tag_to_replace)
-
-                else:
-                    log_stream.error(' ===> tag_sim_start_and_restart not found in ancillary_info!')
-                    raise NotImplemented('Check configuration file')
-
-            #find line with variable_name
-            index = [idx for idx, s in enumerate(namelist_default) if variable_name in s][0]
-            if index >= 0:
-                new_line = write_namelist_line(variable_name, variable_value)
-                namelist_default[index] = new_line
+            if (variable_value is None) or (isinstance(variable_value, str) and ('{' in variable_value)):
+                settings_filled.append((group_tag, variable_name, variable_value))
             else:
-                log_stream.error(' ===> ' + variable_name + ' not found in namelist!')
-                raise NotImplemented('Check filename_namelist')
+                settings_fixed.append((group_tag, variable_name, variable_value))
 
-    return namelist_default
+    return settings_fixed, settings_filled
+
+# --------------------------------------------------------------------------------
+# Method to apply the settings filled by domain and time to a namelist
+def fill_namelist(namelist, settings_filled, template, ancillary_info, time_values):
+
+    for group_tag, variable_name, variable_value in settings_filled:
+
+        #replace ancillary_info tags if present
+        if isinstance(variable_value, str):
+            variable_value = fill_tags2string(variable_value, template, ancillary_info)
+
+        #handle simulation length, start and restart
+        if variable_value is None:
+            if variable_name in time_values:
+                variable_value = time_values[variable_name]
+            elif variable_name in ['sTimeStart', 'sTimeRestart']:
+                log_stream.error(' ===> tag_sim_start_and_restart not found in ancillary_info!')
+                raise NotImplementedError('Check configuration file')
+
+        namelist.set(variable_name, variable_value, group_tag)
+
+    return namelist
+
+# --------------------------------------------------------------------------------
+# Method to modify namelist based on dictionary
+def modify_namelist(namelist_default, data_settings_dict, template,
+                    ancillary_info, time_range, settings_time, time_reverse=True):
+
+    if not isinstance(namelist_default, Namelist):
+        namelist_default = Namelist(namelist_default)
+
+    settings_fixed, settings_filled = split_namelist_settings(data_settings_dict)
+    for group_tag, variable_name, variable_value in settings_fixed:
+        namelist_default.set(variable_name, variable_value, group_tag)
+
+    time_values = define_namelist_time(template, ancillary_info, time_range, settings_time, time_reverse=time_reverse)
+
+    return fill_namelist(namelist_default, settings_filled, template, ancillary_info, time_values)
+
+# --------------------------------------------------------------------------------
+# Method to generate the namelists of more domains and time windows from the same template
+# (fixed values are written once; the values with tags or times are filled for each namelist)
+def generate_namelist_list(namelist_default, data_settings_dict, template,
+                           ancillary_list, time_range_list, settings_time, time_reverse=True):
+
+    if not isinstance(namelist_default, Namelist):
+        namelist_default = Namelist(namelist_default)
+
+    settings_fixed, settings_filled = split_namelist_settings(data_settings_dict)
+    namelist_fixed = namelist_default.copy()
+    for group_tag, variable_name, variable_value in settings_fixed:
+        namelist_fixed.set(variable_name, variable_value, group_tag)
+
+    namelist_list = []
+    for ancillary_info, time_range in zip(ancillary_list, time_range_list):
+        time_values = define_namelist_time(template, ancillary_info, time_range, settings_time,
+                                           time_reverse=time_reverse)
+        namelist_list.append(
+            fill_namelist(namelist_fixed.copy(), settings_filled, template, ancillary_info, time_values))
+
+    return namelist_list
 
 # --------------------------------------------------------------------------------
 # Method to write line namelist
@@ -149,6 +323,3 @@ def write_namelist_line(variable_name, variable_value):
     return line
 
 # --------------------------------------------------------------------------------
-
-
-
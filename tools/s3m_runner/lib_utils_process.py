@@ -0,0 +1,237 @@
+"""
+Library Features:
+
+Name:          lib_utils_process
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+#######################################################################################
+# Library
+import logging
+import os
+import sys
+import json
+import time
+import signal
+import threading
+import subprocess
+
+from collections import deque
+
+from lib_info_args import logger_name
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+
+# Seconds between terminate and kill of an expired process
+process_kill_delay = 10
+# Lines of the process output kept for the error message(s)
+process_tail_lines = 20
+#######################################################################################
+
+
+# -------------------------------------------------------------------------------------
+# Method to stream a process pipe to the log file (a tail of the lines is kept in memory)
+def stream_process_pipe(process_pipe, log_handle, log_lock, output_tail, pipe_tag):
+
+    for pipe_line in iter(process_pipe.readline, b''):
+        pipe_line = pipe_line.decode('utf-8', errors='replace')
+        with log_lock:
+            log_handle.write(pipe_tag + pipe_line if pipe_tag else pipe_line)
+            log_handle.flush()
+        output_tail.append(pipe_line.rstrip('\n'))
+    process_pipe.close()
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to send a signal to a process and its children (process group of the session started by the process)
+def signal_process(process_handle, process_signal):
+    if hasattr(os, 'killpg'):
+        os.killpg(process_handle.pid, process_signal)
+    else:
+        os.kill(process_handle.pid, process_signal)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to stop an expired process (terminate and, if still alive, kill); signals are sent under the lock only
+# if the process is not done (the pid is not reaped, so it cannot be reused by another process)
+def stop_process(process_handle, process_expired, process_done, process_lock):
+
+    with process_lock:
+        if process_done.is_set():
+            return
+        process_expired.set()
+        try:
+            signal_process(process_handle, signal.SIGTERM)
+        except OSError:
+            return
+
+    # Process is killed if still alive after the delay
+    if not process_done.wait(process_kill_delay):
+        with process_lock:
+            if process_done.is_set():
+                return
+            try:
+                signal_process(process_handle, getattr(signal, 'SIGKILL', signal.SIGTERM))
+            except OSError:
+                pass
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to wait the exit of a process without reaping it (False if not supported)
+def wait_process_exit(process_handle):
+    if not hasattr(os, 'waitid'):
+        return False
+    while True:
+        try:
+            os.waitid(os.P_PID, process_handle.pid, os.WEXITED | os.WNOWAIT)
+            return True
+        except InterruptedError:
+            continue
+        except OSError:
+            return False
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to run a supervised process (output capture, timeout, wall time, cpu time and peak memory)
+def run_process(process_cmd, process_cwd=None, process_log=None, process_timeout=None, process_env=None):
+
+    process_obj = {'command': ' '.join(process_cmd), 'status': 'error', 'return_code': None, 'expired': False,
+                   'time_wall': None, 'time_user': None, 'time_sys': None, 'memory_max_kb': None,
+                   'output_tail': [], 'error': None}
+
+    if process_log is None:
+        process_log = os.devnull
+    else:
+        log_folder = os.path.dirname(process_log)
+        if log_folder:
+            os.makedirs(log_folder, exist_ok=True)
+
+    with open(process_log, 'w') as log_handle:
+
+        time_start = time.perf_counter()
+        try:
+            # Process runs in its own session (the timeout stops the process and its children)
+            process_handle = subprocess.Popen(process_cmd, cwd=process_cwd, env=process_env,
+                                              stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                              start_new_session=True)
+        except OSError as process_exc:
+            process_obj['error'] = str(process_exc)
+            log_stream.error(' ===> Process "' + process_obj['command'] + '" not started: ' + str(process_exc))
+            return process_obj
+
+        # Output is captured by two threads (stdout and stderr) in the same log file
+        log_lock, output_tail = threading.Lock(), deque(maxlen=process_tail_lines)
+        stream_threads = [
+            threading.Thread(target=stream_process_pipe,
+                             args=(process_handle.stdout, log_handle, log_lock, output_tail, ''), daemon=True),
+            threading.Thread(target=stream_process_pipe,
+                             args=(process_handle.stderr, log_handle, log_lock, output_tail, '[stderr] '),
+                             daemon=True)]
+        for stream_thread in stream_threads:
+            stream_thread.start()
+
+        # Process is stopped if the timeout is exceeded
+        process_timer, process_expired, process_done = None, threading.Event(), threading.Event()
+        process_lock = threading.Lock()
+        if process_timeout is not None:
+            process_timer = threading.Timer(process_timeout, stop_process,
+                                            args=(process_handle, process_expired, process_done, process_lock))
+            process_timer.daemon = True
+            process_timer.start()
+
+        # Process is marked as done (and the timer cancelled) before the reap; if the exit cannot be waited
+        # without the reap, the process is marked as done right after it
+        process_exit = wait_process_exit(process_handle)
+        if process_exit:
+            with process_lock:
+                process_done.set()
+            if process_timer is not None:
+                process_timer.cancel()
+
+        # Resource usage of the child process (wait4 on posix; wall time only elsewhere)
+        if hasattr(os, 'wait4'):
+            _, process_status, process_usage = os.wait4(process_handle.pid, 0)
+            process_handle.returncode = os.waitstatus_to_exitcode(process_status) \
+                if hasattr(os, 'waitstatus_to_exitcode') else (process_status >> 8)
+        else:
+            process_handle.wait()
+            process_usage = None
+        time_elapsed = time.perf_counter() - time_start
+
+        if not process_exit:
+            with process_lock:
+                process_done.set()
+            if process_timer is not None:
+                process_timer.cancel()
+        # Output of an expired process is not awaited beyond the kill delay (pipes held by child processes)
+        for stream_thread in stream_threads:
+            stream_thread.join(process_kill_delay if process_expired.is_set() else None)
+
+    process_obj['return_code'] = process_handle.returncode
+    process_obj['expired'] = process_expired.is_set()
+    process_obj['time_wall'] = round(time_elapsed, 3)
+    process_obj['output_tail'] = list(output_tail)
+
+    if process_usage is not None:
+        # Peak memory is in kilobytes on linux and in bytes on macos
+        memory_max = process_usage.ru_maxrss
+        if sys.platform == 'darwin':
+            memory_max = int(memory_max / 1024)
+        process_obj['time_user'] = round(process_usage.ru_utime, 3)
+        process_obj['time_sys'] = round(process_usage.ru_stime, 3)
+        process_obj['memory_max_kb'] = memory_max
+
+    if process_obj['expired']:
+        process_obj['status'] = 'timeout'
+        process_obj['error'] = 'Process stopped after the timeout of ' + str(process_timeout) + ' seconds'
+    elif process_obj['return_code'] != 0:
+        process_obj['status'] = 'failed'
+        process_obj['error'] = 'Process exited with return code ' + str(process_obj['return_code'])
+    else:
+        process_obj['status'] = 'ok'
+
+    return process_obj
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read the model statistics (measured cost of the previous runs by domain)
+def read_process_stats(file_name):
+    if (file_name is not None) and os.path.exists(file_name):
+        try:
+            with open(file_name, 'r') as file_handle:
+                return json.load(file_handle)
+        except ValueError:
+            log_stream.warning(' ===> Model statistics file "' + file_name + '" is not valid. Statistics are reset')
+    return {}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to save the model statistics (last successful run of each domain)
+def save_process_stats(file_name, process_stats, job_results):
+
+    for job_result in job_results:
+        if job_result['status'] == 'ok':
+            process_stats[job_result['domain_name']] = {
+                key: job_result[key] for key in ['time_wall', 'time_user', 'time_sys', 'memory_max_kb']}
+
+    file_folder = os.path.dirname(file_name)
+    if file_folder:
+        os.makedirs(file_folder, exist_ok=True)
+
+    # Statistics are written in a temporary file and moved (the file is never partial)
+    file_name_tmp = file_name + '.tmp'
+    with open(file_name_tmp, 'w') as file_handle:
+        json.dump(process_stats, file_handle, indent=2)
+    os.replace(file_name_tmp, file_name)
+
+    return process_stats
+# -------------------------------------------------------------------------------------
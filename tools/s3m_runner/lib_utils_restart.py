@@ -0,0 +1,130 @@
+"""
+Library Features:
+
+Name:          lib_utils_restart
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+#######################################################################################
+# Library
+import logging
+import os
+import pandas as pd
+
+from pandas.tseries.frequencies import to_offset
+
+from lib_info_args import logger_name, time_format_algorithm
+from lib_utils_staging import fill_model_path
+from s3m_tools import fill_tags2string, fill_tags2string_range, FileIndex, apply_retention
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+#######################################################################################
+
+
+# -------------------------------------------------------------------------------------
+# Method to search the latest restart time (None if no restart file is found in the search period)
+def search_restart_time(restart_path, restart_file, time_end, search_period, tags_format, tags_filling,
+                        time_frequency='H'):
+
+    # Time step(s) before the run time (latest first)
+    time_step_delta = to_offset(time_frequency)
+    time_steps = pd.date_range(end=time_end - time_step_delta, periods=int(search_period),
+                               freq=time_step_delta)[::-1]
+    file_name_list = fill_tags2string_range(restart_file, tags_format, time_steps, tags_filling)
+
+    for time_step, file_name_step in zip(time_steps, file_name_list):
+        if os.path.exists(os.path.join(fill_model_path(restart_path, time_step), file_name_step)):
+            return time_step
+    return None
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the catch-up time range (from the latest restart to the run time; None if not found)
+def define_catchup_range(time_range, catchup_settings, restart_path, tags_format, tags_filling,
+                         time_frequency='H', domain_name='', file_index=None):
+
+    time_end = time_range.max()
+
+    # Step of the simulation (index lookup and folder search cover the same search period)
+    time_step_delta = to_offset(time_frequency)
+    search_period = int(catchup_settings.get('search_period', 72))
+
+    # Latest restart is looked up in the file index (if available) or searched in the restart folder(s)
+    time_restart = None
+    if file_index is not None:
+        time_restart, _ = file_index.latest('restart', time_max=time_end - time_step_delta)
+        if (time_restart is not None) and (time_restart < time_end - time_step_delta * search_period):
+            time_restart = None
+    if time_restart is None:
+        time_restart = search_restart_time(
+            restart_path, catchup_settings['file_name'], time_end, search_period,
+            tags_format, tags_filling, time_frequency=time_frequency)
+
+    if time_restart is None:
+        log_stream.warning(' ===> Catch-up of domain "' + domain_name + '" not applied. Restart file not found in ' +
+                           'the previous ' + str(search_period) + ' steps')
+        return None
+
+    # Time range is reversed (as the time range of the run)
+    time_range_catchup = pd.date_range(start=time_restart + time_step_delta, end=time_end,
+                                       freq=time_step_delta)[::-1]
+
+    log_stream.info(' ----> Domain "' + domain_name + '" restart found at "' +
+                    time_restart.strftime(time_format_algorithm) + '" :: Simulation of ' +
+                    str(time_range_catchup.size) + ' steps')
+
+    return time_range_catchup
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the file index of a domain (None if the retention is not activated)
+def define_file_index(retention_settings, tags_format, domain_name):
+    if not retention_settings.get('active', False):
+        return None
+    return FileIndex(fill_tags2string(retention_settings['index_file'], tags_format, {'domain_name': domain_name}))
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to register the file(s) written by the model over the simulation (plain or compressed)
+def register_model_files(file_index, file_type, path_model, file_name, time_steps, tags_format, tags_filling):
+
+    file_name_list = fill_tags2string_range(file_name, tags_format, time_steps, tags_filling)
+    for time_step, file_name_step in zip(time_steps, file_name_list):
+        file_path = os.path.join(fill_model_path(path_model, time_step), file_name_step)
+        for file_path_step in [file_path, file_path + '.gz']:
+            if os.path.exists(file_path_step):
+                file_index.register(file_type, time_step, file_path_step)
+                break
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to update the file index of a domain and apply the retention (restart and output files)
+def update_domain_retention(retention_settings, path_info, time_range, time_now, tags_format, domain_name=''):
+
+    tags_filling = {'domain_name': domain_name}
+    file_index = define_file_index(retention_settings, tags_format, domain_name)
+
+    log_stream.info(' ----> Retention of domain "' + domain_name + '" ... ')
+    for file_type in ['restart', 'output']:
+        file_settings = retention_settings.get(file_type, None)
+        if file_settings is None:
+            continue
+
+        path_model = fill_tags2string(path_info[file_settings['path_tag']], tags_format, tags_filling)
+        register_model_files(file_index, file_type, path_model, file_settings['file_name'],
+                             time_range.sort_values(), tags_format, tags_filling)
+        apply_retention(file_index, file_type, time_now,
+                        retention_rules=file_settings.get('rules', None),
+                        compress_hours=file_settings.get('compress_hours', None),
+                        process_max=retention_settings.get('process_max', 4))
+
+    file_index.save()
+    log_stream.info(' ----> Retention of domain "' + domain_name + '" ... DONE')
+# -------------------------------------------------------------------------------------
@@ -0,0 +1,206 @@
+"""
+Library Features:
+
+Name:          lib_utils_scheduler
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+#######################################################################################
+# Library
+import logging
+import os
+import threading
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from lib_info_args import logger_name
+from lib_utils_process import run_process
+from lib_utils_staging import stage_model_job, clean_model_job
+from s3m_tools import wait_files_ready
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+#######################################################################################
+
+
+# -------------------------------------------------------------------------------------
+# Method to get the available memory [bytes] (None if not available)
+def get_memory_available():
+
+    if os.path.exists('/proc/meminfo'):
+        with open('/proc/meminfo', 'r') as file_handle:
+            for file_line in file_handle:
+                if file_line.startswith('MemAvailable:'):
+                    return int(file_line.split()[1]) * 1024
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return None
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get the available cores
+def get_cores_available():
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the memory per process [GB] from the measured peak memory of the domains (None if not measured)
+def define_process_memory(process_stats, domain_list, memory_margin=1.2):
+
+    memory_list = [process_stats[domain_name]['memory_max_kb'] for domain_name in domain_list
+                   if (domain_name in process_stats) and process_stats[domain_name].get('memory_max_kb')]
+    if not memory_list:
+        return None
+    return max(memory_list) * memory_margin / 1024 ** 2
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the process slots (bounded by cores, memory per process [GB] and maximum processes)
+def define_process_slots(process_max=None, process_memory=None):
+
+    process_slots = get_cores_available()
+
+    if process_memory is not None:
+        memory_available = get_memory_available()
+        if memory_available is not None:
+            memory_slots = int(memory_available // (process_memory * 1024 ** 3))
+            process_slots = min(process_slots, max(memory_slots, 1))
+        else:
+            log_stream.warning(' ===> Available memory not found. Process slots are defined by cores only')
+
+    if process_max is not None:
+        process_slots = min(process_slots, int(process_max))
+
+    return max(process_slots, 1)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to wait the input file(s) of a domain (ready if no file list is defined)
+def wait_model_job(job_obj):
+
+    readiness_settings = job_obj.get('readiness', None)
+    if (not readiness_settings) or (not job_obj.get('file_list', None)):
+        return {'ready': True, 'file_missing': [], 'time_wait': 0.0}
+
+    return wait_files_ready(
+        job_obj['file_list'], wait_timeout=readiness_settings.get('wait_timeout', 0),
+        wait_min=readiness_settings.get('wait_min', 10), wait_max=readiness_settings.get('wait_max', 300),
+        wait_stable=readiness_settings.get('wait_stable', None),
+        file_tag='input files of domain "' + job_obj['domain_name'] + '"')
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the result of a domain not run (missing input file(s))
+def define_model_job_missing(job_obj, job_status, file_missing, job_error):
+    return {'domain_name': job_obj['domain_name'], 'log_file': job_obj['log_file'], 'status': job_status,
+            'return_code': None, 'expired': False,
+            'time_wall': None, 'time_user': None, 'time_sys': None, 'memory_max_kb': None,
+            'output_tail': ['Missing "' + file_name + '"' for file_name in file_missing[:5]],
+            'error': job_error + ' [' + str(len(file_missing)) + ' missing]'}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the result of a domain failed by an exception (e.g. run folder or log file not writable)
+def define_model_job_failed(job_obj, job_exception):
+    return {'domain_name': job_obj['domain_name'], 'log_file': job_obj['log_file'], 'status': 'failed',
+            'return_code': None, 'expired': False,
+            'time_wall': None, 'time_user': None, 'time_sys': None, 'memory_max_kb': None,
+            'output_tail': [], 'error': type(job_exception).__name__ + ': ' + str(job_exception)}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to run the model process of a domain (supervised; stdout and stderr streamed to the domain log file)
+def run_model_job(job_obj, process_semaphore=None):
+
+    # Domain starts as soon as its own input file(s) are available and a process slot is free
+    wait_obj = wait_model_job(job_obj)
+    if not wait_obj['ready']:
+        return define_model_job_missing(
+            job_obj, 'not_ready', wait_obj['file_missing'],
+            'Input file(s) not available after ' + str(wait_obj['time_wait']) + ' seconds')
+
+    # Input file(s) are checked and staged in the local folder before taking a process slot
+    staging_obj = job_obj.get('staging', None)
+    if staging_obj is not None:
+        stage_obj = stage_model_job(staging_obj, domain_name=job_obj['domain_name'])
+        if not stage_obj['ready']:
+            return define_model_job_missing(
+                job_obj, 'not_staged', stage_obj['file_missing'], 'Input file(s) not available for staging')
+
+    os.makedirs(job_obj['path_run'], exist_ok=True)
+
+    if process_semaphore is None:
+        process_semaphore = threading.Semaphore(1)
+    try:
+        with process_semaphore:
+            process_obj = run_process([job_obj['path_exe'], job_obj['path_namelist']],
+                                      process_cwd=job_obj['path_run'], process_log=job_obj['log_file'],
+                                      process_timeout=job_obj.get('timeout', None))
+    finally:
+        if staging_obj is not None:
+            clean_model_job(staging_obj)
+
+    process_obj['domain_name'] = job_obj['domain_name']
+    process_obj['log_file'] = job_obj['log_file']
+
+    return process_obj
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to run the model processes of the domains in a bounded pool (results in the order of the jobs;
+# the domains wait their input file(s) independently and take a process slot when ready)
+def run_model_jobs(job_list, process_slots=1):
+
+    log_stream.info(' ----> Run ' + str(len(job_list)) + ' domain(s) with ' + str(process_slots) +
+                    ' process slot(s) ... ')
+
+    job_results = {}
+    process_semaphore = threading.Semaphore(process_slots)
+    with ThreadPoolExecutor(max_workers=max(len(job_list), 1)) as job_executor:
+        job_futures = {job_executor.submit(run_model_job, job_obj, process_semaphore): job_obj
+                       for job_obj in job_list}
+        for job_future in as_completed(job_futures):
+            job_obj = job_futures[job_future]
+
+            # An exception of a domain is recorded as a failed job (the other domains are not stopped)
+            try:
+                job_result = job_future.result()
+            except Exception as job_exception:
+                job_result = define_model_job_failed(job_obj, job_exception)
+            job_results[job_obj['domain_name']] = job_result
+
+            if job_result['status'] == 'ok':
+                log_stream.info(' -----> Domain "' + job_result['domain_name'] + '" ... DONE [wall ' +
+                                str(job_result['time_wall']) + ' s; cpu ' + str(job_result['time_user']) +
+                                ' s; peak memory ' + str(job_result['memory_max_kb']) + ' kB]')
+            else:
+                log_stream.error(' ===> Domain "' + job_result['domain_name'] + '" ... FAILED [' +
+                                 str(job_result['error']) + '; log "' + job_result['log_file'] + '"]')
+                for output_line in job_result['output_tail']:
+                    log_stream.error(' ===> ' + output_line)
+
+    job_results = [job_results[job_obj['domain_name']] for job_obj in job_list]
+    job_failed = [job_result['domain_name'] for job_result in job_results if job_result['status'] != 'ok']
+
+    if job_failed:
+        log_stream.info(' ----> Run ' + str(len(job_list)) + ' domain(s) with ' + str(process_slots) +
+                        ' process slot(s) ... FAILED [' + ', '.join(job_failed) + ']')
+    else:
+        log_stream.info(' ----> Run ' + str(len(job_list)) + ' domain(s) with ' + str(process_slots) +
+                        ' process slot(s) ... DONE')
+
+    return job_results
+# -------------------------------------------------------------------------------------
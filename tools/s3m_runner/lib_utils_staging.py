@@ -0,0 +1,152 @@
+"""
+Library Features:
+
+Name:          lib_utils_staging
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+#######################################################################################
+# Library
+import logging
+import os
+import shutil
+import time
+import pandas as pd
+
+from concurrent.futures import ThreadPoolExecutor
+
+from lib_info_args import logger_name, zip_extension
+from s3m_tools import fill_tags2string, fill_tags2string_range, unzip_filename
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+
+# Time tags of the model paths (replaced by the model at each time step)
+model_tags_time = {'$yyyy': '%Y', '$mm': '%m', '$dd': '%d', '$HH': '%H', '$MM': '%M'}
+#######################################################################################
+
+
+# -------------------------------------------------------------------------------------
+# Method to split a model path in the fixed root and the time structure (from the first time tag)
+def split_model_path(path_model):
+
+    tags_idx = [path_model.find(tag) for tag in model_tags_time if path_model.find(tag) >= 0]
+    if not tags_idx:
+        return path_model, ''
+    path_idx = path_model.rfind(os.sep, 0, min(tags_idx)) + 1
+    return path_model[:path_idx], path_model[path_idx:]
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to fill the time tags of a model path
+def fill_model_path(path_model, time_step):
+    for tag_model, tag_format in model_tags_time.items():
+        path_model = path_model.replace(tag_model, time_step.strftime(tag_format))
+    return path_model
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the staging of a model path (model path pointed to the staging folder and file(s) to stage)
+def define_staging(path_model, staging_folder, file_name, time_steps, tags_format, tags_filling,
+                   file_decompress=False):
+
+    _, path_time = split_model_path(path_model)
+    path_stage = os.path.join(staging_folder, path_time)
+
+    file_name_list = fill_tags2string_range(file_name, tags_format, time_steps, tags_filling)
+
+    file_list = []
+    for time_step, file_name_step in zip(time_steps, file_name_list):
+        file_path_src = os.path.join(fill_model_path(path_model, time_step), file_name_step)
+        file_path_dst = os.path.join(fill_model_path(path_stage, time_step), file_name_step)
+        if file_decompress and file_path_dst.endswith(zip_extension):
+            file_path_dst = file_path_dst[:-len(zip_extension)]
+        file_list.append((file_path_src, file_path_dst))
+
+    return path_stage, file_list
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the staging of the model paths of a domain (namelist paths are edited in place)
+def define_staging_job(staging_settings, staging_folder, path_info, time_range, dt_forcing,
+                       tags_format, tags_filling):
+
+    file_decompress = staging_settings.get('file_decompress', False)
+
+    # Time step(s) read by the model over the simulation length
+    time_steps = pd.date_range(start=time_range.min(), end=time_range.max(), freq=str(int(dt_forcing)) + 's')
+
+    file_list = []
+    for path_tag, file_name in staging_settings['path_info'].items():
+        path_model = fill_tags2string(path_info[path_tag], tags_format, tags_filling)
+        path_stage, file_list_tag = define_staging(
+            path_model, os.path.join(staging_folder, path_tag), file_name, time_steps, tags_format, tags_filling,
+            file_decompress=file_decompress)
+        path_info[path_tag] = path_stage
+        file_list.extend(file_list_tag)
+
+    return {'folder_name': staging_folder, 'file_list': file_list, 'file_decompress': file_decompress,
+            'process_max': staging_settings.get('process_max', 4),
+            'cleaning': staging_settings.get('cleaning', True)}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to stage a file (copied or decompressed in a temporary file and moved; the file is never partial)
+def stage_file(file_path_src, file_path_dst, file_decompress=False):
+
+    if os.path.exists(file_path_dst):
+        return os.path.getsize(file_path_dst)
+
+    folder_name_dst = os.path.dirname(file_path_dst)
+    if folder_name_dst:
+        os.makedirs(folder_name_dst, exist_ok=True)
+
+    file_path_tmp = file_path_dst + '.tmp'
+    if file_decompress and file_path_src.endswith(zip_extension):
+        unzip_filename(file_path_src, file_path_tmp)
+    else:
+        shutil.copyfile(file_path_src, file_path_tmp)
+    os.replace(file_path_tmp, file_path_dst)
+
+    return os.path.getsize(file_path_dst)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to stage the input file(s) of a domain (all file(s) are checked before staging)
+def stage_model_job(staging_obj, domain_name=''):
+
+    file_list = staging_obj['file_list']
+    file_missing = [file_path_src for file_path_src, _ in file_list if not os.path.exists(file_path_src)]
+    if file_missing:
+        log_stream.error(' ===> Stage input files of domain "' + domain_name + '" ... FAILED [' +
+                         str(len(file_missing)) + '/' + str(len(file_list)) + ' missing]')
+        return {'ready': False, 'file_missing': file_missing, 'time_stage': 0.0}
+
+    log_stream.info(' -----> Stage input files of domain "' + domain_name + '" [' + str(len(file_list)) +
+                    ' files] ... ')
+    time_start = time.time()
+    with ThreadPoolExecutor(max_workers=max(int(staging_obj['process_max']), 1)) as stage_executor:
+        file_size = list(stage_executor.map(
+            lambda file_path: stage_file(file_path[0], file_path[1], staging_obj['file_decompress']), file_list))
+    time_stage = round(time.time() - time_start, 1)
+
+    log_stream.info(' -----> Stage input files of domain "' + domain_name + '" ... DONE [' +
+                    str(round(sum(file_size) / 1024 ** 2, 1)) + ' MB; ' + str(time_stage) + ' seconds]')
+
+    return {'ready': True, 'file_missing': [], 'time_stage': time_stage}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to clean the staging folder of a domain
+def clean_model_job(staging_obj):
+    if staging_obj['cleaning'] and os.path.exists(staging_obj['folder_name']):
+        shutil.rmtree(staging_obj['folder_name'], ignore_errors=True)
+# -------------------------------------------------------------------------------------
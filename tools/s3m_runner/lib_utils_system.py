@@ -15,9 +15,9 @@ import shutil
 import numpy as np
 
 from datetime import datetime
-from copy import deepcopy
 
 from lib_info_args import logger_name
+from s3m_tools import fill_tags2string  # noqa: F401 (shared library)
 
 # Logging
 log_stream = logging.getLogger(logger_name)
@@ -124,50 +124,6 @@ def copy_file(file_path_src, file_path_dest):
 # -------------------------------------------------------------------------------------
 
 
-# -------------------------------------------------------------------------------------
-# Method to add time in a unfilled string (path or filename)
-def fill_tags2string(string_raw, tags_format=None, tags_filling=None):
-
-    apply_tags = False
-    if string_raw is not None:
-        for tag in list(tags_format.keys()):
-            if tag in string_raw:
-                apply_tags = True
-                break
-
-    if apply_tags:
-
-        tags_format_tmp = deepcopy(tags_format)
-        for tag_key, tag_value in tags_format.items():
-            tag_key_tmp = '{' + tag_key + '}'
-            if tag_value is not None:
-                if tag_key_tmp in string_raw:
-                    string_filled = string_raw.replace(tag_key_tmp, tag_value)
-                    string_raw = string_filled
-                else:
-                    tags_format_tmp.pop(tag_key, None)
-
-        for tag_format_name, tag_format_value in list(tags_format_tmp.items()):
-
-            if tag_format_name in list(tags_filling.keys()):
-                tag_filling_value = tags_filling[tag_format_name]
-                if tag_filling_value is not None:
-
-                    if isinstance(tag_filling_value, datetime):
-                        tag_filling_value = tag_filling_value.strftime(tag_format_value)
-
-                    if isinstance(tag_filling_value, (float, int)):
-                        tag_filling_value = tag_format_value.format(tag_filling_value)
-
-                    string_filled = string_filled.replace(tag_format_value, tag_filling_value)
-
-        string_filled = string_filled.replace('//', '/')
-        return string_filled
-    else:
-        return string_raw
-# -------------------------------------------------------------------------------------
-
-
 # -------------------------------------------------------------------------------------
 # Method to get dictionary values using a key
 def get_dict_values(d, key, value=[]):
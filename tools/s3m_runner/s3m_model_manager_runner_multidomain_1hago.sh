@@ -9,11 +9,13 @@ script_date='2021/06/07'
 virtualenv_folder='/home/s3m/fp_virtualenv_python3/'
 virtualenv_name='fp_virtualenv_python3_hyde_libraries'
 script_folder='/home/s3m/s3m_runner/'
+s3m_tools_folder='/home/s3m/s3m_tools/' # shared library (not needed if installed with pip)
 
 # Domain list
 domain_name_list=("Valle_Aosta" "Piemonte")
 
-# Most recent input file to look for in order to start
+# Most recent input file to look for in order to start (the runner waits the input files of each domain
+# if "readiness" is active in the settings)
 check_file_path_trunk='/home/s3m_domains/Sicilia/%Y/%m/%d/'
 check_file_name='MeteoData_%Y%m%d%H%M.nc.gz'
 searching_period_hour_obs=2
@@ -40,7 +42,7 @@ export PATH=$virtualenv_folder/bin:$PATH
 source activate $virtualenv_name
 
 # Add path to pythonpath
-export PYTHONPATH="${PYTHONPATH}:$script_folder"
+export PYTHONPATH="${PYTHONPATH}:$script_folder:$s3m_tools_folder"
 #-----------------------------------------------------------------------------------------
 
 #-----------------------------------------------------------------------------------------
@@ -103,29 +105,13 @@ echo " ===> EXECUTION ..."
 
 if  $file_name_obs_flag ; then
   #-----------------------------------------------------------------------------------------
-  # Iterate over domain list
-  for domain_name_name in ${domain_name_list[@]}; do
-    (
+  # Info start model run
+  echo " ====> DOMAIN NAME(S) "${domain_name_list[@]}" ... "
+  echo " =====> RUN S3m RUNNER [DOMAIN(S): ${domain_name_list[@]} :: TIME: $time_now] ... "
 
-    # ----------------------------------------------------------------------------------------
-    # Info domain name
-    echo " ====> DOMAIN NAME "$domain_name_name" ... "
-
-      #-----------------------------------------------------------------------------------------
-      # Info start model run
-      echo " =====> RUN S3m RUNNER [DOMAIN: $domain_name_name :: TIME: $time_now] ... "
-
-      # Run python script
-      python3 $script_file -settings_file $settings_algorithm -time "$time_now" -domain "$domain_name_name"
-      #-----------------------------------------------------------------------------------------
-
-    sleep 5
-
-      ) &
-  done
-
-  # Wait processe(s)
-  wait
+  # Run python script (domains run in parallel by the runner; exit code not zero if a domain fails)
+  python3 $script_file -settings_file $settings_algorithm -time "$time_now" -domain "${domain_name_list[@]}"
+  #-----------------------------------------------------------------------------------------
 
 else
   echo " =====> RUNNER NOT EXECUTED BECAUSE OF MISSING INPUT FILES!!"
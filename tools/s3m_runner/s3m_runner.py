@@ -10,8 +10,11 @@ __library__ = 's3m'
 
 General command line:
 python s3m_runner.py -settings_file "configuration.json" -time "2021-04-20 22:33" -domain "Lombardia"
+python s3m_runner.py -settings_file "configuration.json" -time "2021-04-20 22:33" -domain "Lombardia" "Piemonte"
 
 Version(s):
+20261019 (1.1.0) --> Added multi-domain mode (model processes run in a bounded pool) input readiness gate, input staging, catch-up mode
+                        and file retention
 20210614 (1.0.1)
 20210607 (1.0.0) --> First release
 """
@@ -21,16 +24,24 @@ Version(s):
 # Library
 import logging
 import os
+import sys
 import argparse
 import pandas as pd
 import time
 
+from copy import deepcopy
+
 from lib_utils_logging import set_logging_file
 from lib_utils_time import set_time
 from lib_data_io_json import read_file_settings
 from lib_info_args import logger_name, time_format_algorithm
-from lib_namelist import read_namelist_file, modify_namelist, write_namelist_file
-from lib_utils_system import copy_file, fill_tags2string
+from lib_namelist import read_namelist_file, modify_namelist, write_namelist_file, define_sim_range
+from lib_utils_system import fill_tags2string
+from lib_utils_scheduler import define_process_slots, define_process_memory, run_model_jobs
+from lib_utils_process import read_process_stats, save_process_stats
+from lib_utils_staging import define_staging_job
+from lib_utils_restart import define_catchup_range, define_file_index, update_domain_retention
+from s3m_tools import define_file_list
 
 # Logging
 log_stream = logging.getLogger(logger_name)
@@ -41,8 +52,11 @@ log_stream = logging.getLogger(logger_name)
 project_name = 'S3M'
 alg_name = 'TOOL S3M RUNNER'
 alg_type = 'Model'
-alg_version = '1.0.0'
-alg_release = '2021-06-07'
+alg_version = '1.1.0'
+alg_release = '2026-10-19'
+
+# Domain name used by the logging of the multi-domain mode
+domain_name_multi = 'multidomain'
 # -------------------------------------------------------------------------------------
 
 # -------------------------------------------------------------------------------------
@@ -51,15 +65,18 @@ def main():
 
     # -------------------------------------------------------------------------------------
     # Get algorithm settings
-    alg_settings, alg_time, alg_domain = get_args()
+    alg_settings, alg_time, alg_domain_list = get_args()
     alg_time_timestamp = pd.to_datetime(alg_time)
 
     # Set algorithm settings
     data_settings = read_file_settings(alg_settings)
 
-    # Replace domain info
-    if alg_domain is not None:
-        data_settings['algorithm']['ancillary']['domain_name'] = alg_domain
+    # Replace domain info (multi-domain mode if more domains are defined by argument or by "domain_list")
+    domain_list = define_domain_list(data_settings, alg_domain_list)
+    if domain_list.__len__() == 1:
+        data_settings['algorithm']['ancillary']['domain_name'] = domain_list[0]
+    else:
+        data_settings['algorithm']['ancillary']['domain_name'] = domain_name_multi
 
     # Set algorithm logging
     folder_tag = {'source_file_datetime_generic': alg_time_timestamp,
@@ -108,27 +125,47 @@ def main():
     # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
-    # Change lines in namelist
-    namelist_edited = modify_namelist(namelist_default, data_settings['S3M_Info'],
-                                               data_settings['algorithm']['template'],
-                                               data_settings['algorithm']['ancillary'],
-                                               time_range, data_settings['time'])
+    # Change lines in namelist and save edited namelist (for each domain)
+    job_list = [prepare_domain_job(data_settings, domain_name, namelist_default, time_range, alg_time_timestamp)
+                for domain_name in domain_list]
     # -------------------------------------------------------------------------------------
-    # Save edited namelist
-    path_namelist_dst = os.path.join(data_settings['data']['infofile']['destination']['folder_name'],
-                                         data_settings['data']['infofile']['destination']['file_name'])
-    path_namelist_dst = fill_tags2string(path_namelist_dst, data_settings['algorithm']['template'], folder_tag)
-    write_namelist_file(path_namelist_dst, namelist_edited, data_settings['algorithm']['template'],
-                                               data_settings['algorithm']['ancillary'])
 
     # -------------------------------------------------------------------------------------
-    # Run model
-    path_exe = os.path.join(data_settings['data']['exe']['source']['folder_name'],
-                            data_settings['data']['exe']['source']['file_name'])
-    path_run = data_settings['data']['folder_run']
-    path_run = fill_tags2string(path_run, data_settings['algorithm']['template'], folder_tag)
-    os.chdir(path_run)
-    os.system(path_exe + " " + path_namelist_dst)
+    # Run model (supervised processes; memory per process measured by the previous runs if not defined)
+    scheduler_settings = data_settings.get('scheduler', {})
+    stats_file = scheduler_settings.get('stats_file', None)
+    if stats_file is not None:
+        stats_file = fill_tags2string(stats_file, data_settings['algorithm']['template'], folder_tag)
+    process_stats = read_process_stats(stats_file)
+
+    process_memory = scheduler_settings.get('process_memory_gb', None)
+    if process_memory is None:
+        process_memory = define_process_memory(process_stats, domain_list)
+
+    process_slots = define_process_slots(
+        process_max=scheduler_settings.get('process_max', None), process_memory=process_memory)
+    process_slots = min(process_slots, job_list.__len__())
+
+    for job_obj in job_list:
+        job_obj['timeout'] = scheduler_settings.get('process_timeout', None)
+    job_results = run_model_jobs(job_list, process_slots=process_slots)
+
+    if stats_file is not None:
+        save_process_stats(stats_file, process_stats, job_results)
+
+    # Restart and output file(s) of the domains indexed and kept by the retention rules (if activated)
+    retention_settings = data_settings.get('retention', {})
+    if retention_settings.get('active', False):
+        for job_obj, job_result in zip(job_list, job_results):
+            if job_result['status'] == 'ok':
+                update_domain_retention(retention_settings, data_settings['S3M_Info']['path_info'],
+                                        job_obj['time_range'], alg_time_timestamp,
+                                        data_settings['algorithm']['template'], domain_name=job_obj['domain_name'])
+
+    exit_code = 0
+    if any([job_result['status'] != 'ok' for job_result in job_results]):
+        exit_code = 1
+    # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
     # Info algorithm
@@ -141,10 +178,104 @@ def main():
     logging.info(' ==> ... END')
     logging.info(' ==> Bye, Bye')
     logging.info(' ============================================================================ ')
+
+    if exit_code != 0:
+        sys.exit(exit_code)
     # -------------------------------------------------------------------------------------
 
 # -------------------------------------------------------------------------------------
 
+
+# -------------------------------------------------------------------------------------
+# Method to define the domain list (argument, "domain_list" or "domain_name" of the settings)
+def define_domain_list(data_settings, alg_domain_list=None):
+
+    if alg_domain_list:
+        domain_list = alg_domain_list
+    elif data_settings['algorithm']['ancillary'].get('domain_list', None):
+        domain_list = data_settings['algorithm']['ancillary']['domain_list']
+    else:
+        domain_list = [data_settings['algorithm']['ancillary']['domain_name']]
+
+    # Duplicated domain(s) are removed (a domain run twice would share the run folder)
+    return list(dict.fromkeys(domain_list))
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to prepare the model job of a domain (edited namelist, run folder and model log)
+def prepare_domain_job(data_settings, domain_name, namelist_default, time_range, time_reference):
+
+    data_template = data_settings['algorithm']['template']
+    data_ancillary = deepcopy(data_settings['algorithm']['ancillary'])
+    data_ancillary['domain_name'] = domain_name
+
+    folder_tag = {'source_file_datetime_generic': time_reference, 'domain_name': domain_name}
+
+    # Catch-up of the missed step(s): one simulation from the latest restart to the run time (if activated)
+    settings_time = data_settings['time']
+    catchup_settings = data_settings.get('catchup', {})
+    if catchup_settings.get('active', False):
+        restart_path = fill_tags2string(
+            data_settings['S3M_Info']['path_info'][catchup_settings.get('path_tag', 'sPathData_Restart_Gridded')],
+            data_template, {'domain_name': domain_name})
+        time_range_catchup = define_catchup_range(
+            time_range, catchup_settings, restart_path, data_template, {'domain_name': domain_name},
+            time_frequency=settings_time['time_frequency'], domain_name=domain_name,
+            file_index=define_file_index(data_settings.get('retention', {}), data_template, domain_name))
+        if time_range_catchup is not None:
+            # Simulation starts after the restart (no rounding to the previous midnight)
+            time_range = time_range_catchup
+            settings_time = dict(settings_time, round_to_previous_midnight=False)
+
+    # Input file(s) staged in the local folder (the namelist paths point to the staging folder)
+    model_info = data_settings['S3M_Info']
+    staging_settings = data_settings.get('staging', {})
+    staging_obj = None
+    if staging_settings.get('active', False):
+        model_info = deepcopy(model_info)
+        staging_obj = define_staging_job(
+            staging_settings, fill_tags2string(staging_settings['folder_name'], data_template, folder_tag),
+            model_info['path_info'], define_sim_range(time_range, settings_time),
+            model_info['dt_info'].get('iDtData_Forcing', 3600), data_template, {'domain_name': domain_name})
+
+    # Change lines in namelist (the default namelist and its index are shared by the domains)
+    namelist_edited = modify_namelist(namelist_default.copy(), model_info,
+                                      data_template, data_ancillary, time_range, settings_time)
+
+    # Save edited namelist
+    path_namelist_dst = os.path.join(data_settings['data']['infofile']['destination']['folder_name'],
+                                     data_settings['data']['infofile']['destination']['file_name'])
+    path_namelist_dst = fill_tags2string(path_namelist_dst, data_template, folder_tag)
+    write_namelist_file(path_namelist_dst, namelist_edited, data_template, data_ancillary)
+
+    # Model executable, run folder and model log
+    path_exe = os.path.join(data_settings['data']['exe']['source']['folder_name'],
+                            data_settings['data']['exe']['source']['file_name'])
+    path_run = fill_tags2string(data_settings['data']['folder_run'], data_template, folder_tag)
+
+    log_file = os.path.join(
+        fill_tags2string(data_settings['log']['folder_name'], data_template, folder_tag),
+        fill_tags2string(data_settings['log'].get('model_file_name', 's3m_model_{domain_name}.txt'),
+                         data_template, folder_tag))
+
+    log_stream.info(' ----> Domain "' + domain_name + '" namelist saved in "' + path_namelist_dst + '"')
+
+    # Input file(s) of the simulation window (waited before running the domain, if activated)
+    readiness_settings = data_settings.get('readiness', {})
+    file_list = None
+    if readiness_settings.get('active', False):
+        file_list = define_file_list(readiness_settings['folder_name'], readiness_settings['file_name'],
+                                     data_template, define_sim_range(time_range, settings_time),
+                                     {'domain_name': domain_name})
+
+    return {'domain_name': domain_name, 'path_exe': path_exe, 'path_namelist': path_namelist_dst,
+            'path_run': path_run, 'log_file': log_file,
+            'file_list': file_list, 'readiness': readiness_settings if file_list else None,
+            'staging': staging_obj,
+            'time_range': define_sim_range(time_range, settings_time)}
+# -------------------------------------------------------------------------------------
+
 # -------------------------------------------------------------------------------------
 # Method to fill path names
 def fill_script_settings(data_settings, domain):
@@ -167,7 +298,7 @@ def get_args():
     parser_handle = argparse.ArgumentParser()
     parser_handle.add_argument('-settings_file', action="store", dest="alg_settings")
     parser_handle.add_argument('-time', action="store", dest="alg_time")
-    parser_handle.add_argument('-domain', action="store", dest="alg_domain")
+    parser_handle.add_argument('-domain', action="store", dest="alg_domain", nargs='+')
     parser_values = parser_handle.parse_args()
 
     if parser_values.alg_settings:
@@ -181,46 +312,11 @@ def get_args():
         alg_time = None
 
     if parser_values.alg_domain:
-        alg_domain = parser_values.alg_domain
+        alg_domain_list = parser_values.alg_domain
     else:
-        alg_time = None
-
-    return alg_settings, alg_time, alg_domain
-
-# -------------------------------------------------------------------------------------
-
-
-# -------------------------------------------------------------------------------------
-# Method to set logging information
-def set_logging(logger_file='log.txt', logger_format=None):
-    if logger_format is None:
-        logger_format = '%(asctime)s %(name)-12s %(levelname)-8s ' \
-                        '%(filename)s:[%(lineno)-6s - %(funcName)20s()] %(message)s'
-
-    # Remove old logging file
-    if os.path.exists(logger_file):
-        os.remove(logger_file)
-
-    # Set level of root debugger
-    logging.root.setLevel(logging.DEBUG)
-
-    # Open logging basic configuration
-    logging.basicConfig(level=logging.DEBUG, format=logger_format, filename=logger_file, filemode='w')
-
-    # Set logger handle
-    logger_handle_1 = logging.FileHandler(logger_file, 'w')
-    logger_handle_2 = logging.StreamHandler()
-    # Set logger level
-    logger_handle_1.setLevel(logging.DEBUG)
-    logger_handle_2.setLevel(logging.DEBUG)
-    # Set logger formatter
-    logger_formatter = logging.Formatter(logger_format)
-    logger_handle_1.setFormatter(logger_formatter)
-    logger_handle_2.setFormatter(logger_formatter)
+        alg_domain_list = None
 
-    # Add handle to logging
-    logging.getLogger('').addHandler(logger_handle_1)
-    logging.getLogger('').addHandler(logger_handle_2)
+    return alg_settings, alg_time, alg_domain_list
 
 # -------------------------------------------------------------------------------------
 
@@ -11,31 +11,38 @@ Version:       '1.0.1'
 # Library
 import logging
 import os
+import shutil
+import tempfile
+import time
 import numpy as np
 import pandas as pd
 import xarray as xr
 
 from copy import deepcopy
-from shutil import copyfile
+from itertools import zip_longest
 
 from lib_data_io_binary import read_data_binary, search_geo_reference
 from lib_data_io_tiff import read_data_tiff
 from lib_data_io_nc import read_data_nc
-from lib_data_io_mat import read_data_mat
+from lib_data_io_mat import read_data_mat, check_file_mat, clear_file_mat
+from lib_data_io_cache import check_file_cache
 
-from lib_utils_interp import active_var_interp, apply_var_interp
-from lib_utils_io import read_obj, write_obj, create_dset, write_dset
-from lib_utils_gzip import unzip_filename, zip_filename
-from lib_utils_system import fill_tags2string, make_folder
+from lib_utils_interp import active_var_interp, apply_var_interp, define_var_window
+from lib_utils_io import read_obj, write_obj, create_dset, create_darray_geo, write_dset, write_dset_zarr
+from lib_utils_gzip import zip_filename
+from lib_utils_system import fill_tags2string, fill_tags2string_range, make_folder
 from lib_info_args import logger_name, \
     time_format_algorithm, zip_extension
-from lib_utils_quality import compute_SQA
+from lib_utils_quality import compute_SQA, compute_mask_geo
+from lib_utils_prefetch import FilePrefetcher, stage_file
+from lib_utils_profiling import get_profiler
+from s3m_tools import wait_files_ready
 
 # Logging
 log_stream = logging.getLogger(logger_name)
 
-# Debug
-import matplotlib.pylab as plt
+# Debug (uncomment to plot; matplotlib is loaded only if a debug plot is used)
+# from lib_utils_debug import plt
 ######################################################################################
 
 # -------------------------------------------------------------------------------------
@@ -44,6 +51,8 @@ var_fields_accepted = [
     "var_compute", "var_name", "var_scale_factor", "var_shift",
     "folder_name", "file_name", "file_compression", "file_type", "file_frequency"]
 time_format_reference = '%Y-%m-%d'
+file_geo_mode_accepted = ['embedded_2d', 'embedded_1d', 'static_reference']
+file_format_accepted = ['netcdf', 'zarr']
 # -------------------------------------------------------------------------------------
 
 
@@ -60,7 +69,9 @@ class DriverDynamic:
                  tag_terrain_data='Terrain', tag_grid_data='Grid',
                  tag_static_source='source', tag_static_destination='destination',
                  tag_dynamic_source='source', tag_dynamic_destination='destination',
-                 flag_cleaning_dynamic_ancillary=True, flag_cleaning_dynamic_data=True, flag_cleaning_dynamic_tmp=True):
+                 flag_cleaning_dynamic_ancillary=True, flag_cleaning_dynamic_data=True, flag_cleaning_dynamic_tmp=True,
+                 flag_prefetch_dynamic_source=False, flag_resume_dynamic_ancillary=False,
+                 readiness_settings=None):
 
         self.time_str = time_reference.strftime(time_format_reference)
         self.time_period = time_period
@@ -97,6 +108,13 @@ class DriverDynamic:
         self.domain_tag = 'domain_name'
         self.var_compute_quality_tag = 'compute_quality'
         self.var_decimal_digits_tag = 'decimal_digits'
+        self.file_time_chunk_tag = 'file_time_chunk'
+        self.file_geo_mode_tag = 'file_geo_mode'
+        self.file_engine_tag = 'file_engine'
+        self.file_subset_tag = 'file_subset'
+        self.file_format_tag = 'file_format'
+        self.store_path_tag = 'store_path'
+        self.store_chunk_time_tag = 'store_chunk_time'
 
         self.alg_template_list = list(self.alg_template_tags.keys())
         self.var_name_obj = self.define_var_name(src_dict)
@@ -107,6 +125,14 @@ class DriverDynamic:
         self.flag_cleaning_dynamic_ancillary = flag_cleaning_dynamic_ancillary
         self.flag_cleaning_dynamic_data = flag_cleaning_dynamic_data
         self.flag_cleaning_dynamic_tmp = flag_cleaning_dynamic_tmp
+        self.flag_prefetch_dynamic_source = flag_prefetch_dynamic_source
+        self.flag_resume_dynamic_ancillary = flag_resume_dynamic_ancillary
+
+        self.readiness_settings = readiness_settings if readiness_settings is not None else {}
+
+        self.file_time_chunk = None
+        if self.file_time_chunk_tag in list(self.dst_dict.keys()):
+            self.file_time_chunk = self.dst_dict[self.file_time_chunk_tag]
 
         self.coord_name_geo_x = 'longitude'
         self.coord_name_geo_y = 'latitude'
@@ -120,7 +146,44 @@ class DriverDynamic:
 
         self.geo_da_dst = self.set_geo_reference()
 
+        self.file_geo_mode = 'embedded_2d'
+        if self.file_geo_mode_tag in list(self.dst_dict.keys()):
+            if self.dst_dict[self.file_geo_mode_tag] is not None:
+                self.file_geo_mode = self.dst_dict[self.file_geo_mode_tag]
+        if self.file_geo_mode not in file_geo_mode_accepted:
+            log_stream.error(' ===> File geo mode "' + self.file_geo_mode + '" is not allowed. Expected one of: ' +
+                             ', '.join(file_geo_mode_accepted))
+            raise NotImplementedError('Case not implemented yet')
+
+        self.file_format = 'netcdf'
+        if self.file_format_tag in list(self.dst_dict.keys()):
+            if self.dst_dict[self.file_format_tag] is not None:
+                self.file_format = self.dst_dict[self.file_format_tag]
+        if self.file_format not in file_format_accepted:
+            log_stream.error(' ===> File format "' + self.file_format + '" is not allowed. Expected one of: ' +
+                             ', '.join(file_format_accepted))
+            raise NotImplementedError('Case not implemented yet')
+
+        # Store path(s) of the zarr destination (time tags, if any, split the time period in more stores)
+        self.file_path_obj_store, self.store_chunk_time = None, 24
+        if self.file_format == 'zarr':
+            if self.store_path_tag not in list(self.dst_dict.keys()):
+                log_stream.error(' ===> Tag "' + self.store_path_tag + '" must be defined for zarr destination')
+                raise IOError('Check your destination datasets')
+            folder_name_store, file_name_store = os.path.split(self.dst_dict[self.store_path_tag])
+            self.file_path_obj_store = self.define_file_name_struct(
+                {self.folder_name_tag: folder_name_store, self.file_name_tag: file_name_store},
+                'all', self.time_period)['all']
+            if self.store_chunk_time_tag in list(self.dst_dict.keys()):
+                self.store_chunk_time = int(self.dst_dict[self.store_chunk_time_tag])
+
+        self.geo_da_terrain, self.file_attributes = self.set_geo_terrain()
+        self.geo_mask_dst = compute_mask_geo(self.geo_da_dst.values)
+
         self.interp_method = interp_method
+        self.var_window = define_var_window(
+            self.geo_da_dst, coord_name_geo_x=self.coord_name_geo_x, coord_name_geo_y=self.coord_name_geo_y,
+            interp_method=self.interp_method)
 
         self.nc_compression_level = 9
         self.nc_type_file = 'NETCDF4'
@@ -129,6 +192,26 @@ class DriverDynamic:
         self.SQA_ground_and_snow = self.alg_ancillary['SQA_ground_and_snow']
         self.domain = self.alg_ancillary['domain_name']
 
+        self.prefetch_queue_depth = 4
+        if 'prefetch_queue_depth' in list(self.alg_ancillary.keys()):
+            self.prefetch_queue_depth = self.alg_ancillary['prefetch_queue_depth']
+        self.folder_tmp_root = None
+        if 'tmp_folder' in list(self.alg_ancillary.keys()):
+            self.folder_tmp_root = self.alg_ancillary['tmp_folder']
+        self.folder_tmp = None
+
+        # Profiler of the run (report is saved only if profiling is active)
+        self.profiler = get_profiler()
+
+        # Cache of the parsed ascii grid(s) (shared by domain(s) and run(s); size in MB)
+        self.folder_cache = None
+        if 'cache_folder' in list(self.alg_ancillary.keys()):
+            self.folder_cache = self.alg_ancillary['cache_folder']
+        self.cache_size_max = None
+        if 'cache_size_max_mb' in list(self.alg_ancillary.keys()):
+            if self.alg_ancillary['cache_size_max_mb'] is not None:
+                self.cache_size_max = int(self.alg_ancillary['cache_size_max_mb'] * 1024 * 1024)
+
         # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
@@ -170,6 +253,33 @@ class DriverDynamic:
         return geo_da
     # -------------------------------------------------------------------------------------
 
+    # -------------------------------------------------------------------------------------
+    # Method to set the terrain data array and the file attributes of the destination datasets
+    def set_geo_terrain(self, var_geo_name='terrain', tag_file_path='file_path'):
+
+        geo_da_dst = self.geo_da_dst
+
+        var_geo_1d = True
+        if self.file_geo_mode == 'embedded_2d':
+            var_geo_1d = False
+
+        # Terrain is flipped once for all the variable(s) and time step(s) of the driver
+        geo_da_terrain = create_darray_geo(
+            geo_da_dst.values, geo_da_dst[self.coord_name_geo_x].values, geo_da_dst[self.coord_name_geo_y].values,
+            var_geo_name=var_geo_name, var_geo_1d=var_geo_1d)
+
+        file_attributes = dict(geo_da_dst.attrs)
+        if self.file_geo_mode == 'static_reference':
+            geo_ref_name = self.dst_dict[self.file_geo_reference_tag]
+            geo_ref_collections = self.static_data_dst[geo_ref_name]
+            if tag_file_path in list(geo_ref_collections.keys()):
+                file_attributes['file_geo_reference'] = geo_ref_collections[tag_file_path]
+            else:
+                file_attributes['file_geo_reference'] = geo_ref_name
+
+        return geo_da_terrain, file_attributes
+    # -------------------------------------------------------------------------------------
+
     # -------------------------------------------------------------------------------------
     # Method to set geographical attributes
     @staticmethod
@@ -261,23 +371,24 @@ class DriverDynamic:
 
             file_path_step = os.path.join(folder_name_step, file_name_step)
 
-            file_path_list = []
-            for time_step in time_period:
-                alg_template_filled = {}
-                for alg_template_step in self.alg_template_list:
-                    alg_template_filled[alg_template_step] = time_step
+            # replace domain name if present (the other tags are filled by the time steps)
+            alg_template_filled = {}
+            if self.domain_tag in alg_template_tags:
+                if self.domain_tag in self.alg_ancillary:
+                    alg_template_filled[self.domain_tag] = self.alg_ancillary[self.domain_tag]
 
-                # replace domain name if present
-                if self.domain_tag in alg_template_tags:
-                    if self.domain_tag in self.alg_ancillary:
-                        alg_template_filled[self.domain_tag] = self.alg_ancillary[self.domain_tag]
-
-                file_path_list.append(fill_tags2string(file_path_step, alg_template_tags, alg_template_filled))
-
-            file_path_dict[var_name] = file_path_list
+            file_path_dict[var_name] = fill_tags2string_range(
+                file_path_step, alg_template_tags, time_period, alg_template_filled)
 
         return file_path_dict
 
+    # -------------------------------------------------------------------------------------
+    # Method to define the ancillary filename of a variable and time step (resume checkpoint)
+    @staticmethod
+    def define_file_name_unit(file_path_anc, var_name):
+        return file_path_anc + '.' + var_name
+    # -------------------------------------------------------------------------------------
+
     # -------------------------------------------------------------------------------------
     # Method to define variable names
     @staticmethod
@@ -287,7 +398,8 @@ class DriverDynamic:
             data_fields_excluded = ['__comment__', '_comment_', 'comment','']
 
         var_list_tmp = list(data_dict.keys())
-        var_list_def = [var_name for var_name in var_list_tmp if var_name not in data_fields_excluded]
+        var_list_def = [var_name for var_name in var_list_tmp
+                        if (var_name not in data_fields_excluded) and (not var_name.startswith('__comment'))]
 
         return var_list_def
     # -------------------------------------------------------------------------------------
@@ -308,9 +420,43 @@ class DriverDynamic:
         compute_quality = var_dict[self.var_compute_quality_tag]
         var_decimal_digits = var_dict[self.var_decimal_digits_tag]
 
+        file_engine = 'xarray'
+        if self.file_engine_tag in list(var_dict.keys()):
+            if var_dict[self.file_engine_tag] is not None:
+                file_engine = var_dict[self.file_engine_tag]
+        file_subset = False
+        if self.file_subset_tag in list(var_dict.keys()):
+            file_subset = var_dict[self.file_subset_tag]
+        # Subset of the source over the destination domain is read directly (without xarray)
+        if file_subset:
+            file_engine = 'netcdf4'
+
         return var_compute, var_name, var_scale_factor, var_shift, \
                file_compression, file_geo_reference, file_type, file_coords, file_freq, compute_quality, \
-               var_decimal_digits
+               var_decimal_digits, file_engine, file_subset
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to define the temporary folder of the process (staged source files)
+    def define_folder_tmp(self):
+
+        if self.folder_tmp is None:
+            if self.folder_tmp_root is not None:
+                make_folder(self.folder_tmp_root)
+            self.folder_tmp = tempfile.mkdtemp(prefix='s3m_' + self.domain + '_', dir=self.folder_tmp_root)
+
+        return self.folder_tmp
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to check if a source file is served by the cache (staging and unzip of the source are not needed)
+    def check_source_cache(self, file_type, file_path_src, var_tag=None):
+
+        if (file_type == 'asc') and (self.folder_cache is not None):
+            return check_file_cache(file_path_src, self.folder_cache)
+        if file_type == 'mat':
+            return check_file_mat(file_path_src, var_tag)
+        return False
     # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
@@ -324,6 +470,203 @@ class DriverDynamic:
             for file_path_step in file_path_anc:
                 if os.path.exists(file_path_step):
                     os.remove(file_path_step)
+                for var_name in self.var_name_obj:
+                    file_path_unit = self.define_file_name_unit(file_path_step, var_name)
+                    if os.path.exists(file_path_unit):
+                        os.remove(file_path_unit)
+
+        # Temporary folder is private to the process and always removed
+        if self.folder_tmp is not None:
+            if os.path.exists(self.folder_tmp):
+                shutil.rmtree(self.folder_tmp, ignore_errors=True)
+            self.folder_tmp = None
+
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to read the dynamic data previously saved in a multi-time file (None if not available)
+    def read_dynamic_data_chunk(self, file_path_dst, file_path_zip):
+
+        file_path_read, file_path_stage = None, None
+        if os.path.exists(file_path_dst):
+            file_path_read = file_path_dst
+        elif os.path.exists(file_path_zip):
+            file_path_stage = stage_file(file_path_zip, self.define_folder_tmp(), file_compression=True)
+            file_path_read = file_path_stage
+
+        if file_path_read is None:
+            return None
+
+        with xr.open_dataset(file_path_read, engine=self.nc_type_engine) as dset_saved:
+            dset_saved = dset_saved.load()
+
+        if (file_path_stage is not None) and (file_path_stage != file_path_zip):
+            os.remove(file_path_stage)
+
+        if self.dim_name_time not in list(dset_saved.dims):
+            log_stream.warning(' ===> Time dimension "' + self.dim_name_time + '" not available in file "' +
+                               file_path_read + '". File will be rewritten')
+            return None
+
+        return dset_saved
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to dump dynamic data in a multi-time file (one file for each time chunk)
+    def dump_dynamic_data_chunk(self):
+
+        time_str = self.time_str
+        time_period = self.time_period
+
+        dst_dict = self.dst_dict
+
+        file_path_obj_anc = self.file_path_obj_anc
+
+        flag_cleaning_dynamic = self.flag_cleaning_dynamic_data
+
+        log_stream.info(' ---> Dump dynamic datasets by time chunk "' + str(self.file_time_chunk) +
+                        '" [' + time_str + '] ... ')
+
+        # Filename of the time chunk is defined by the start of the chunk period (independent of the time steps
+        # available in the run)
+        time_chunk_start = pd.Timestamp(time_period.min()).to_period(self.file_time_chunk).start_time
+        file_path_dst = self.define_file_name_struct(
+            dst_dict, 'all', pd.DatetimeIndex([time_chunk_start]))['all'][0]
+        file_path_zip = self.define_file_name_zip(file_path_dst)
+        folder_name_dst, file_name_dst = os.path.split(file_path_dst)
+
+        if flag_cleaning_dynamic:
+            if os.path.exists(file_path_dst):
+                os.remove(file_path_dst)
+            if os.path.exists(file_path_zip):
+                os.remove(file_path_zip)
+
+        # Time step(s) previously saved in the chunk file (kept and extended by the missing time step(s))
+        dset_saved = self.read_dynamic_data_chunk(file_path_dst, file_path_zip)
+        time_saved = []
+        if dset_saved is not None:
+            time_saved = list(pd.DatetimeIndex(dset_saved[self.dim_name_time].values))
+
+        log_stream.info(' ------> Save filename "' + file_name_dst + '" ... ')
+
+        dset_list = []
+        for time_step, file_path_anc in zip(time_period, file_path_obj_anc):
+            if time_step in time_saved:
+                continue
+            if os.path.exists(file_path_anc):
+                dset_list.append(read_obj(file_path_anc))
+            else:
+                log_stream.info(' -----> Time "' + time_step.strftime(time_format_algorithm) +
+                                '" ... SKIPPED. Datasets not available')
+
+        if dset_list:
+
+            if dset_saved is not None:
+                log_stream.info(' ------> Filename "' + file_name_dst + '" previously saved with ' +
+                                str(len(time_saved)) + ' time step(s). Extend with ' +
+                                str(len(dset_list)) + ' time step(s)')
+                dset_list = [dset_saved] + dset_list
+
+            # Merge time steps along an unlimited time dimension (static variables are written once)
+            dset_obj = xr.concat(dset_list, dim=self.dim_name_time,
+                                 data_vars='minimal', coords='minimal', compat='override')
+            dset_obj = dset_obj.sortby(self.dim_name_time)
+            dset_obj = dset_obj.transpose(self.dim_name_time, ...)
+
+            if not os.path.exists(folder_name_dst):
+                make_folder(folder_name_dst)
+
+            # File is written in the temporary folder and moved (a partial file is never left in the destination)
+            file_path_tmp = os.path.join(self.define_folder_tmp(), file_name_dst)
+            time_write_start = time.perf_counter()
+            write_dset(file_path_tmp, dset_obj,
+                       dset_engine=self.nc_type_engine, dset_format=self.nc_type_file,
+                       dset_compression=self.nc_compression_level, fill_data=-9999.0, dset_type='float32',
+                       dim_key_time=self.dim_name_time, dset_chunk_time=True)
+            shutil.move(file_path_tmp, file_path_dst)
+            self.profiler.add_time('destination_write', time.perf_counter() - time_write_start)
+            self.profiler.count_file('destination_write', file_path_dst)
+
+            log_stream.info(' ------> Save filename "' + file_name_dst + '" ... DONE')
+
+            log_stream.info(' ------> Zip filename "' + file_name_dst + '" ... ')
+            if dst_dict[self.file_compression_tag]:
+
+                with self.profiler.timer('destination_zip'):
+                    zip_filename(file_path_dst, file_path_zip)
+
+                if os.path.exists(file_path_zip) and (file_path_zip != file_path_dst):
+                    os.remove(file_path_dst)
+                log_stream.info(' ------> Zip filename "' + file_name_dst + '" ... DONE')
+            else:
+                log_stream.info(' ------> Zip filename "' + file_name_dst + '" ... SKIPPED. Zip not activated')
+
+        elif dset_saved is not None:
+            log_stream.info(' ------> Save filename "' + file_name_dst +
+                            '" ... SKIPPED. Filename previously saved')
+        else:
+            log_stream.info(' ------> Save filename "' + file_name_dst + '" ... SKIPPED. Datasets not available')
+
+        log_stream.info(' ---> Dump dynamic datasets by time chunk "' + str(self.file_time_chunk) +
+                        '" [' + time_str + '] ... DONE')
+
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to dump dynamic data in zarr store(s) (time step(s) appended along time)
+    def dump_dynamic_data_store(self):
+
+        time_str = self.time_str
+        time_period = self.time_period
+
+        file_path_obj_anc = self.file_path_obj_anc
+        file_path_obj_store = self.file_path_obj_store
+
+        log_stream.info(' ---> Dump dynamic datasets in store [' + time_str + '] ... ')
+
+        if self.flag_cleaning_dynamic_data:
+            log_stream.info(' ----> Cleaning of dynamic datasets is not applied to store(s). '
+                            'Time steps previously saved are kept')
+
+        store_collection = {}
+        for time_step, file_path_anc, file_path_store in zip(time_period, file_path_obj_anc, file_path_obj_store):
+            if file_path_store not in list(store_collection.keys()):
+                store_collection[file_path_store] = []
+            if os.path.exists(file_path_anc):
+                store_collection[file_path_store].append(file_path_anc)
+            else:
+                log_stream.info(' -----> Time "' + time_step.strftime(time_format_algorithm) +
+                                '" ... SKIPPED. Datasets not available')
+
+        for file_path_store, file_list_anc in store_collection.items():
+
+            folder_name_store, file_name_store = os.path.split(file_path_store)
+            log_stream.info(' ------> Save store "' + file_name_store + '" ... ')
+
+            if file_list_anc:
+
+                dset_list = [read_obj(file_path_anc) for file_path_anc in file_list_anc]
+                dset_obj = xr.concat(dset_list, dim=self.dim_name_time,
+                                     data_vars='minimal', coords='minimal', compat='override')
+
+                if not os.path.exists(folder_name_store):
+                    make_folder(folder_name_store)
+
+                with self.profiler.timer('destination_write'):
+                    store_n = write_dset_zarr(file_path_store, dset_obj,
+                                              dim_key_time=self.dim_name_time, dset_chunk_time=self.store_chunk_time,
+                                              fill_data=-9999.0, dset_type='float32')
+
+                if store_n > 0:
+                    log_stream.info(' ------> Save store "' + file_name_store + '" ... DONE. Time steps appended: ' +
+                                    str(store_n))
+                else:
+                    log_stream.info(' ------> Save store "' + file_name_store +
+                                    '" ... SKIPPED. Time steps previously saved')
+            else:
+                log_stream.info(' ------> Save store "' + file_name_store + '" ... SKIPPED. Datasets not available')
+
+        log_stream.info(' ---> Dump dynamic datasets in store [' + time_str + '] ... DONE')
 
     # -------------------------------------------------------------------------------------
 
@@ -331,6 +674,16 @@ class DriverDynamic:
     # Method to dump dynamic data
     def dump_dynamic_data(self):
 
+        # Dump dynamic data in zarr store(s) (if activated)
+        if self.file_format == 'zarr':
+            self.dump_dynamic_data_store()
+            return
+
+        # Dump dynamic data using one file for each time chunk (if activated)
+        if self.file_time_chunk is not None:
+            self.dump_dynamic_data_chunk()
+            return
+
         time_str = self.time_str
         time_period = self.time_period
 
@@ -373,16 +726,20 @@ class DriverDynamic:
                             dset_obj = dset_obj.squeeze(self.dim_name_time)
                             dset_obj = dset_obj.drop(self.dim_name_time)
 
+                    time_write_start = time.perf_counter()
                     write_dset(file_path_dst, dset_obj,
                                dset_engine=self.nc_type_engine, dset_format=self.nc_type_file,
                                dset_compression=self.nc_compression_level, fill_data=-9999.0, dset_type='float32')
+                    self.profiler.add_time('destination_write', time.perf_counter() - time_write_start)
+                    self.profiler.count_file('destination_write', file_path_dst)
 
                     log_stream.info(' ------> Save filename "' + file_name_dst + '" ... DONE')
 
                     log_stream.info(' ------> Zip filename "' + file_name_dst + '" ... ')
                     if dst_dict[self.file_compression_tag]:
 
-                        zip_filename(file_path_dst, file_path_zip)
+                        with self.profiler.timer('destination_zip'):
+                            zip_filename(file_path_dst, file_path_zip)
 
                         if os.path.exists(file_path_zip) and (file_path_zip != file_name_dst):
                             os.remove(file_path_dst)
@@ -404,10 +761,54 @@ class DriverDynamic:
     # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
-    # Method to organize dynamic data
-    def organize_dynamic_data(self):
+    # Method to wait the source file(s) of the time chunk (missing file(s) after the timeout are skipped)
+    def wait_dynamic_source(self):
+
+        if not self.readiness_settings.get('active', False):
+            return True
+
+        file_list = []
+        for var_name in self.var_name_obj:
+            if self.src_dict[var_name][self.var_compute_tag]:
+                file_list.extend(self.file_path_obj_src[var_name])
+
+        wait_obj = wait_files_ready(
+            file_list, wait_timeout=self.readiness_settings.get('wait_timeout', 0),
+            wait_min=self.readiness_settings.get('wait_min', 10),
+            wait_max=self.readiness_settings.get('wait_max', 300),
+            wait_stable=self.readiness_settings.get('wait_stable', None),
+            file_tag='source files [' + self.time_str + ']')
+
+        for file_name in wait_obj['file_missing']:
+            log_stream.warning(' ===> Source file "' + file_name + '" is not ready')
+
+        return wait_obj['ready']
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to define the group(s) of variable(s) (computed variable(s) reading the same mat file(s))
+    def define_var_group(self, var_name_obj):
+
+        var_group_list, var_group_map = [], {}
+        for var_name in var_name_obj:
+            var_dict = self.src_dict[var_name]
+            if (var_dict[self.file_type_tag] == 'mat') and var_dict[self.var_compute_tag]:
+                var_group_key = tuple(self.file_path_obj_src[var_name])
+                if var_group_key in list(var_group_map.keys()):
+                    var_group_map[var_group_key].append(var_name)
+                    continue
+                var_group_map[var_group_key] = [var_name]
+                var_group_list.append(var_group_map[var_group_key])
+            else:
+                var_group_list.append([var_name])
+
+        return var_group_list
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to organize dynamic data of a variable (generator; a time step is computed at each iteration)
+    def organize_dynamic_var(self, var_name, dset_collection, flag_resume_ancillary=False, flag_geo_write=True):
 
-        time_str = self.time_str
         time_period = self.time_period
 
         geo_da_dst = self.geo_da_dst
@@ -418,267 +819,412 @@ class DriverDynamic:
         file_path_obj_src = self.file_path_obj_src
         file_path_obj_anc = self.file_path_obj_anc
 
-        flag_cleaning_ancillary = self.flag_cleaning_dynamic_ancillary
-
-        log_stream.info(' ---> Organize dynamic datasets [' + time_str + '] ... ')
-
-        # Check if ancillary file already exists
-        file_check_list = []
-        for file_path_tmp in file_path_obj_anc:
-            if os.path.exists(file_path_tmp):
-                if flag_cleaning_ancillary:
-                    os.remove(file_path_tmp)
-                    file_check_list.append(False)
+        log_stream.info(' ----> Variable "' + var_name + '" ... ')
+
+        var_compute, var_tag, var_scale_factor, var_shift, file_compression, \
+            file_geo_reference, file_type, file_coords, file_freq, compute_quality, var_decimal_digits, \
+            file_engine, file_subset = self.extract_var_fields(src_dict[var_name])
+        var_window = self.var_window if file_subset else None
+
+        # Variable(s) read from the same mat file(s) are loaded together
+        var_name_list = None
+        if file_type == 'mat':
+            var_name_list = [
+                src_dict[var_step][self.var_name_tag] for var_step in var_name_obj
+                if (src_dict[var_step][self.file_type_tag] == 'mat') and src_dict[var_step][self.var_compute_tag]
+                and (file_path_obj_src[var_step] == file_path_obj_src[var_name])]
+        var_file_path_src = file_path_obj_src[var_name]
+
+        if var_compute:
+
+            # Check the time step(s) previously computed (time or variable checkpoint)
+            var_file_path_unit, var_unit_check = [], []
+            for file_path_anc in file_path_obj_anc:
+                file_path_unit = self.define_file_name_unit(file_path_anc, var_name)
+                var_file_path_unit.append(file_path_unit)
+                if flag_resume_ancillary:
+                    var_unit_check.append(os.path.exists(file_path_anc) or os.path.exists(file_path_unit))
                 else:
-                    file_check_list.append(True)
+                    var_unit_check.append(False)
+
+            # Check the source file(s) served by the cache (checked with the source path before staging);
+            # variable(s) sharing a mat file are served by the file loaded for the first variable of the group
+            if file_type == 'mat':
+                var_cache_check = [
+                    (not file_check_step) and (var_tag != var_name_list[0]) for file_check_step in var_unit_check]
             else:
-                file_check_list.append(False)
-        file_check = all(file_check_list)
+                var_cache_check = [
+                    (not file_check_step) and self.check_source_cache(file_type, file_path_step, var_tag)
+                    for file_path_step, file_check_step in zip(var_file_path_src, var_unit_check)]
+
+            # Stage the source file(s) in background while the current step is processed (if activated)
+            var_prefetcher = None
+            if self.flag_prefetch_dynamic_source:
+                var_prefetcher = FilePrefetcher(
+                    [file_path_step for file_path_step, file_check_step, cache_check_step in
+                     zip(var_file_path_src, var_unit_check, var_cache_check)
+                     if not (file_check_step or cache_check_step)],
+                    self.define_folder_tmp(),
+                    file_compression=file_compression, queue_depth=self.prefetch_queue_depth)
+
+            var_geo_data = None
+            var_idx_fetch = 0
+            for var_idx, (var_time, var_file_path_in) in enumerate(zip(time_period, var_file_path_src)):
+
+                # Time step is computed when the other variable(s) of the group reach it
+                yield var_time
+
+                log_stream.info(' -----> Time "' + var_time.strftime(time_format_algorithm) + '" ... ')
+
+                if var_unit_check[var_idx]:
+                    if os.path.exists(var_file_path_unit[var_idx]):
+                        var_dset_unit = read_obj(var_file_path_unit[var_idx])
+                        if var_time not in list(dset_collection.keys()):
+                            dset_collection[var_time] = var_dset_unit
+                        else:
+                            dset_collection[var_time] = dset_collection[var_time].merge(
+                                var_dset_unit, join='right')
+                    log_stream.info(' -----> Time "' + var_time.strftime(time_format_algorithm) +
+                                    '" ... SKIPPED. Datasets previously computed')
+                    continue
+
+                # Cache is checked again (the entry could be evicted by another process or not loaded)
+                var_cache_hit = var_cache_check[var_idx] and \
+                    self.check_source_cache(file_type, var_file_path_in, var_tag)
+
+                if (var_prefetcher is not None) and (not var_cache_check[var_idx]):
+                    var_file_path_stage = var_prefetcher.get(var_idx_fetch)
+                    var_idx_fetch += 1
+                    var_file_check = var_file_path_stage is not None
+                else:
+                    var_file_path_stage = None
+                    var_file_check = os.path.exists(var_file_path_in)
 
-        # If statement on ancillary availability
-        if not file_check:
+                if var_file_check:
 
-            dset_collection = {}
-            for var_name in var_name_obj:
+                    # Source file is opened read-only; zipped file is unzipped in the temporary folder
+                    # of the process (private to each domain job, so no copy of the source is needed);
+                    # the file served by the cache is not unzipped
+                    if (var_file_path_stage is None) and file_compression and (not var_cache_hit):
+                        with self.profiler.timer('source_unzip'):
+                            var_file_path_stage = stage_file(
+                                var_file_path_in, self.define_folder_tmp(), file_compression=True)
 
-                log_stream.info(' ----> Variable "' + var_name + '" ... ')
+                    if var_file_path_stage is not None:
+                        var_file_path_out = var_file_path_stage
+                    else:
+                        var_file_path_out = var_file_path_in
+
+                    self.profiler.count_file('source_read', var_file_path_out)
+                    time_read_start = time.perf_counter()
+
+                    if file_type == 'binary':
+
+                        if var_geo_data is None:
+                            log_stream.info(' ------> Select geo reference for binary datasets ... ')
+
+                            var_geo_name = search_geo_reference(var_file_path_out, self.static_data_src,
+                                                                tag_geo_reference=file_geo_reference)
+                            log_stream.info(' -------> Geo reference name: ' + var_geo_name)
+                            var_geo_data, var_geo_x, var_geo_y, var_geo_attrs = \
+                                self.set_geo_attributes(self.static_data_src[var_geo_name])
+                            log_stream.info(' ------> Select geo reference for binary datasets ... DONE')
+
+                        var_da_src = read_data_binary(
+                            var_file_path_out, var_geo_x, var_geo_y, var_geo_attrs,
+                            var_scale_factor=var_scale_factor, var_time=var_time, var_name=var_name,
+                            coord_name_geo_x=self.coord_name_geo_x, coord_name_geo_y=self.coord_name_geo_y,
+                            coord_name_time=self.coord_name_time,
+                            dim_name_geo_x=self.dim_name_geo_x, dim_name_geo_y=self.dim_name_geo_y,
+                            dim_name_time=self.dim_name_time,
+                            dims_order=self.dims_order_3d)
+
+                    elif file_type == 'netcdf':
+
+                        if var_geo_data is None:
+                            log_stream.info(' ------> Select geo reference for netcdf datasets ... ')
+                            var_geo_data, var_geo_x, var_geo_y, var_geo_attrs = \
+                                self.set_geo_attributes(self.static_data_src[file_geo_reference])
+                            log_stream.info(' ------> Select geo reference for netcdf datasets ... DONE')
+
+                        var_da_src = read_data_nc(
+                            var_file_path_out, var_geo_x, var_geo_y, var_geo_attrs,  var_coords=file_coords,
+                            var_scale_factor=var_scale_factor, var_name=var_tag, var_time=var_time,
+                            coord_name_geo_x=self.coord_name_geo_x, coord_name_geo_y=self.coord_name_geo_y,
+                            coord_name_time=self.coord_name_time,
+                            dim_name_geo_x=self.dim_name_geo_x, dim_name_geo_y=self.dim_name_geo_y,
+                            dim_name_time=self.dim_name_time,
+                            dims_order=self.dims_order_3d,
+                            file_engine=file_engine, var_window=var_window)
+
+                    elif file_type == 'tiff' or file_type == 'asc':
+
+                        # Parsed ascii grid(s) are cached using the source file (not the staged file)
+                        var_file_cache = None
+                        if file_type == 'asc':
+                            var_file_cache = self.folder_cache
+
+                        var_da_src = read_data_tiff(
+                            var_file_path_out,
+                            var_scale_factor=var_scale_factor, var_name=var_tag, var_time=var_time,
+                            coord_name_geo_x=self.coord_name_geo_x, coord_name_geo_y=self.coord_name_geo_y,
+                            coord_name_time=self.coord_name_time,
+                            dim_name_geo_x=self.dim_name_geo_x, dim_name_geo_y=self.dim_name_geo_y,
+                            dim_name_time=self.dim_name_time,
+                            dims_order=self.dims_order_3d,
+                            decimal_round_data=2, decimal_round_geo=7, var_window=var_window,
+                            file_cache=var_file_cache, file_cache_key=var_file_path_in,
+                            file_cache_size_max=self.cache_size_max)
+
+                    elif file_type == 'mat':
+
+                        var_da_src = read_data_mat(
+                            var_file_path_out,
+                            var_scale_factor=var_scale_factor, var_name=var_tag, var_time=var_time,
+                            coord_name_geo_x=self.coord_name_geo_x, coord_name_geo_y=self.coord_name_geo_y,
+                            coord_name_time=self.coord_name_time,
+                            dim_name_geo_x=self.dim_name_geo_x, dim_name_geo_y=self.dim_name_geo_y,
+                            dim_name_time=self.dim_name_time,
+                            dims_order=self.dims_order_3d,
+                            decimal_round_data=2, decimal_round_geo=7, src_dict=src_dict[var_name],
+                            var_name_list=var_name_list, file_cache_key=var_file_path_in)
 
-                var_compute, var_tag, var_scale_factor, var_shift, file_compression, \
-                    file_geo_reference, file_type, file_coords, file_freq, compute_quality, var_decimal_digits \
-                    = self.extract_var_fields(src_dict[var_name])
-                var_file_path_src = file_path_obj_src[var_name]
+                    else:
+                        log_stream.info(' -----> Time "' + var_time.strftime(time_format_algorithm) + '" ... FAILED')
+                        log_stream.error(' ===> File type "' + file_type + '"is not allowed.')
+                        raise NotImplementedError('Case not implemented yet')
+
+                    self.profiler.add_time('source_read', time.perf_counter() - time_read_start)
+
+                    # Delete (if needed) the staged file; source file is never modified (nor removed)
+                    if (var_file_path_stage is not None) and (var_file_path_stage != var_file_path_in):
+                        if os.path.exists(var_file_path_stage):
+                            os.remove(var_file_path_stage)
 
-                if var_compute:
+                    # Apply scale factor and shift to values
+                    if var_shift is not None:
+                        var_da_src.values=var_da_src.values + var_shift
+                    if var_scale_factor is not None:
+                        var_da_src.values=var_da_src.values / var_scale_factor
 
-                    var_geo_data = None
-                    for var_time, var_file_path_in in zip(time_period, var_file_path_src):
+                    #if var_shift is not None:
+                     #   var_da_src=var_da_src + var_shift
+                    #if var_scale_factor is not None:
+                     #   var_da_src=var_da_src / var_scale_factor
 
-                        log_stream.info(' -----> Time "' + var_time.strftime(time_format_algorithm) + '" ... ')
 
-                        if os.path.exists(var_file_path_in):
+                    # Organize destination dataset
+                    if var_da_src is not None:
 
-                            #copy to tmp
-                            var_file_path, var_file_name = os.path.split(var_file_path_in)
-                            var_file_path_in_tempcopy = self.domain + '_' + var_file_name
-                            copyfile(var_file_path_in, os.path.join(var_file_path, var_file_path_in_tempcopy))
-                            var_file_path_in = os.path.join(var_file_path, var_file_path_in_tempcopy)
+                        # Active (if needed) interpolation method to the variable source data-array
+                        active_interp = active_var_interp(var_da_src.attrs, geo_da_dst.attrs)
 
-                            if file_compression:
-                                var_file_path_out = self.define_file_name_unzip(var_file_path_in)
-                                unzip_filename(var_file_path_in, var_file_path_out)
+                        # Apply the interpolation method to the variable source data-array
+                        if active_interp:
+                            with self.profiler.timer('interp'):
+                                var_da_dst = apply_var_interp(
+                                    var_da_src, geo_da_dst,
+                                    var_name=var_name,
+                                    dim_name_geo_x=self.dim_name_geo_x, dim_name_geo_y=self.dim_name_geo_y,
+                                    coord_name_geo_x=self.coord_name_geo_x,
+                                    coord_name_geo_y=self.coord_name_geo_y,
+                                    interp_method=self.interp_method)
+                        else:
+                            if var_tag != var_name:
+                                var_da_dst = deepcopy(var_da_src)
+                                var_da_dst.name = var_name
                             else:
-                                var_file_path_out = deepcopy(var_file_path_in)
+                                var_da_dst = deepcopy(var_da_src)
+
+                        # Mask the variable destination data-array
+                        var_nodata = None
+                        if 'nodata_value' in list(var_da_dst.attrs.keys()):
+                            var_nodata = var_da_dst.attrs['nodata_value']
+                        geo_nodata = None
+                        if 'nodata_value' in list(geo_da_dst.attrs.keys()):
+                            geo_nodata = geo_da_dst.attrs['nodata_value']
+
+                        if (geo_nodata is not None) and (var_nodata is not None):
+                            var_da_masked = var_da_dst.where(
+                                (geo_da_dst.values[:, :, np.newaxis] != geo_nodata) &
+                                (var_da_dst != var_nodata))
+                        else:
+                            var_da_masked = deepcopy(var_da_dst)
+
+                        #Sanity check to remove nans
+                        var_da_masked.values = \
+                            np.where(np.isnan(var_da_masked.values), var_nodata, var_da_masked.values)
+
+                        #Round
+                        var_da_masked.values = np.round(var_da_masked.values, var_decimal_digits)
+
+                        # plt.figure(1)
+                        # plt.imshow(var_da_dst.values[:, :, 0])
+                        # plt.colorbar()
+                        # plt.figure(2)
+                        # plt.imshow(var_da_src.values[:, :, 0])
+                        # plt.colorbar()
+                        # plt.figure(3)
+                        # plt.imshow(var_da_masked.values[:, :, 0])
+                        # plt.colorbar()
+                        # plt.show()
+                        # plt.figure(4)
+                        # plt.imshow(geo_da_dst.values)
+                        # plt.colorbar()
+                        # plt.show()
+
+                        # Organize data in a common datasets
+                        var_dset_masked = create_dset(var_data_time=var_time,
+                                                      var_data_name=var_name, var_data_values=var_da_masked,
+                                                      var_data_attrs=None,
+                                                      var_geo_da=self.geo_da_terrain,
+                                                      var_geo_write=flag_geo_write,
+                                                      file_attributes=self.file_attributes,
+                                                      var_geo_name='terrain',
+                                                      var_geo_values=geo_da_dst.values,
+                                                      var_geo_x=geo_da_dst['longitude'].values,
+                                                      var_geo_y=geo_da_dst['latitude'].values,
+                                                      var_geo_attrs=None)
+
+                        #Compute SQA if needed
+                        if compute_quality:
+
+                            log_stream.info(' ----> Variable "' + var_name + '" ... computing quality ')
+
+                            with self.profiler.timer('quality'):
+                                SQA = compute_SQA(var_da_masked.values, geo_da_dst.values,
+                                                  self.SQA_ground_and_snow, data_mask_geo=self.geo_mask_dst)
+                            SQA_dset = create_dset(var_data_time=var_time,
+                                                          var_data_name='SQA', var_data_values=SQA,
+                                                          var_data_attrs=None,
+                                                          var_geo_da=self.geo_da_terrain,
+                                                          var_geo_write=flag_geo_write,
+                                                          file_attributes=self.file_attributes,
+                                                          var_geo_name='terrain',
+                                                          var_geo_values=geo_da_dst.values,
+                                                          var_geo_x=geo_da_dst['longitude'].values,
+                                                          var_geo_y=geo_da_dst['latitude'].values,
+                                                          var_geo_attrs=None)
+                            var_dset_masked = var_dset_masked.merge(SQA_dset, join='right')
+
+                        # Save variable datasets (checkpoint used to resume the time chunk)
+                        if flag_resume_ancillary:
+                            folder_name_unit, file_name_unit = os.path.split(var_file_path_unit[var_idx])
+                            if not os.path.exists(folder_name_unit):
+                                make_folder(folder_name_unit)
+                            with self.profiler.timer('ancillary_write'):
+                                write_obj(var_file_path_unit[var_idx], var_dset_masked)
+
+                        # Organize data in merged datasets
+                        if var_time not in list(dset_collection.keys()):
+                            dset_collection[var_time] = var_dset_masked
+                        else:
+                            var_dset_tmp = deepcopy(dset_collection[var_time])
+                            var_dset_tmp = var_dset_tmp.merge(var_dset_masked, join='right')
+                            dset_collection[var_time] = var_dset_tmp
 
-                            if file_type == 'binary':
+                        log_stream.info(' -----> Time "' + var_time.strftime(time_format_algorithm) + '" ... DONE')
 
-                                if var_geo_data is None:
-                                    log_stream.info(' ------> Select geo reference for binary datasets ... ')
+                    else:
+                        log_stream.info(' -----> Time "' + var_time.strftime(time_format_algorithm) +
+                                        '" ... Datasets is not defined')
 
-                                    var_geo_name = search_geo_reference(var_file_path_out, self.static_data_src,
-                                                                        tag_geo_reference=file_geo_reference)
-                                    log_stream.info(' -------> Geo reference name: ' + var_geo_name)
-                                    var_geo_data, var_geo_x, var_geo_y, var_geo_attrs = \
-                                        self.set_geo_attributes(self.static_data_src[var_geo_name])
-                                    log_stream.info(' ------> Select geo reference for binary datasets ... DONE')
+                else:
+                    var_da_src = None
+                    log_stream.info(' -----> Time "' + var_time.strftime(time_format_algorithm) +
+                                    '" ... Datasets is not defined')
 
-                                var_da_src = read_data_binary(
-                                    var_file_path_out, var_geo_x, var_geo_y, var_geo_attrs,
-                                    var_scale_factor=var_scale_factor, var_time=var_time, var_name=var_name,
-                                    coord_name_geo_x=self.coord_name_geo_x, coord_name_geo_y=self.coord_name_geo_y,
-                                    coord_name_time=self.coord_name_time,
-                                    dim_name_geo_x=self.dim_name_geo_x, dim_name_geo_y=self.dim_name_geo_y,
-                                    dim_name_time=self.dim_name_time,
-                                    dims_order=self.dims_order_3d)
-
-                            elif file_type == 'netcdf':
-
-                                if var_geo_data is None:
-                                    log_stream.info(' ------> Select geo reference for netcdf datasets ... ')
-                                    var_geo_data, var_geo_x, var_geo_y, var_geo_attrs = \
-                                        self.set_geo_attributes(self.static_data_src[file_geo_reference])
-                                    log_stream.info(' ------> Select geo reference for netcdf datasets ... DONE')
-
-                                var_da_src = read_data_nc(
-                                    var_file_path_out, var_geo_x, var_geo_y, var_geo_attrs,  var_coords=file_coords,
-                                    var_scale_factor=var_scale_factor, var_name=var_tag, var_time=var_time,
-                                    coord_name_geo_x=self.coord_name_geo_x, coord_name_geo_y=self.coord_name_geo_y,
-                                    coord_name_time=self.coord_name_time,
-                                    dim_name_geo_x=self.dim_name_geo_x, dim_name_geo_y=self.dim_name_geo_y,
-                                    dim_name_time=self.dim_name_time,
-                                    dims_order=self.dims_order_3d)
+            if var_prefetcher is not None:
+                var_prefetcher.close()
+                var_prefetch_metrics = var_prefetcher.get_metrics()
+                log_stream.info(' -----> Prefetch :: files: ' + str(var_prefetch_metrics['file_n']) +
+                                ' - bytes: ' + str(var_prefetch_metrics['file_bytes']) +
+                                ' - io time: ' + str(var_prefetch_metrics['time_io']) + ' seconds' +
+                                ' - io wait: ' + str(var_prefetch_metrics['time_wait']) + ' seconds')
 
-                            elif file_type == 'tiff' or file_type == 'asc':
+                self.profiler.count('prefetch_files', var_prefetch_metrics['file_n'])
+                self.profiler.count('prefetch_bytes', var_prefetch_metrics['file_bytes'])
+                self.profiler.add_time('prefetch_io', var_prefetch_metrics['time_io'])
+                self.profiler.add_time('prefetch_wait', var_prefetch_metrics['time_wait'])
 
-                                var_da_src = read_data_tiff(
-                                    var_file_path_out,
-                                    var_scale_factor=var_scale_factor, var_name=var_tag, var_time=var_time,
-                                    coord_name_geo_x=self.coord_name_geo_x, coord_name_geo_y=self.coord_name_geo_y,
-                                    coord_name_time=self.coord_name_time,
-                                    dim_name_geo_x=self.dim_name_geo_x, dim_name_geo_y=self.dim_name_geo_y,
-                                    dim_name_time=self.dim_name_time,
-                                    dims_order=self.dims_order_3d,
-                                    decimal_round_data=2, decimal_round_geo=7)
+            log_stream.info(' ----> Variable "' + var_name + '" ... DONE')
 
-                            elif file_type == 'mat':
+        else:
+            log_stream.info(' ----> Variable "' + var_name + '" ... SKIPPED. Compute flag not activated.')
+    # -------------------------------------------------------------------------------------
 
-                                var_da_src = read_data_mat(
-                                    var_file_path_out,
-                                    var_scale_factor=var_scale_factor, var_name=var_tag, var_time=var_time,
-                                    coord_name_geo_x=self.coord_name_geo_x, coord_name_geo_y=self.coord_name_geo_y,
-                                    coord_name_time=self.coord_name_time,
-                                    dim_name_geo_x=self.dim_name_geo_x, dim_name_geo_y=self.dim_name_geo_y,
-                                    dim_name_time=self.dim_name_time,
-                                    dims_order=self.dims_order_3d,
-                                    decimal_round_data=2, decimal_round_geo=7, src_dict=src_dict[var_name])
+    # -------------------------------------------------------------------------------------
+    # Method to organize dynamic data
+    def organize_dynamic_data(self):
 
-                            else:
-                                log_stream.info(' -----> Time "' + var_time.strftime(time_format_algorithm) + '" ... FAILED')
-                                log_stream.error(' ===> File type "' + file_type + '"is not allowed.')
-                                raise NotImplementedError('Case not implemented yet')
-
-                            # Delete (if needed the uncompressed file(s)
-                            if var_file_path_in != var_file_path_out:
-                                if os.path.exists(var_file_path_out):
-                                    os.remove(var_file_path_out)
-
-                            # Delete temporary file
-                            os.remove(var_file_path_in)
-
-                            # Apply scale factor and shift to values
-                            if var_shift is not None:
-                                var_da_src.values=var_da_src.values + var_shift
-                            if var_scale_factor is not None:
-                                var_da_src.values=var_da_src.values / var_scale_factor
-
-                            #if var_shift is not None:
-                             #   var_da_src=var_da_src + var_shift
-                            #if var_scale_factor is not None:
-                             #   var_da_src=var_da_src / var_scale_factor
-
-
-                            # Organize destination dataset
-                            if var_da_src is not None:
-
-                                # Active (if needed) interpolation method to the variable source data-array
-                                active_interp = active_var_interp(var_da_src.attrs, geo_da_dst.attrs)
-
-                                # Apply the interpolation method to the variable source data-array
-                                if active_interp:
-                                    var_da_dst = apply_var_interp(
-                                        var_da_src, geo_da_dst,
-                                        var_name=var_name,
-                                        dim_name_geo_x=self.dim_name_geo_x, dim_name_geo_y=self.dim_name_geo_y,
-                                        coord_name_geo_x=self.coord_name_geo_x, coord_name_geo_y=self.coord_name_geo_y,
-                                        interp_method=self.interp_method)
-                                else:
-                                    if var_tag != var_name:
-                                        var_da_dst = deepcopy(var_da_src)
-                                        var_da_dst.name = var_name
-                                    else:
-                                        var_da_dst = deepcopy(var_da_src)
-
-                                # Mask the variable destination data-array
-                                var_nodata = None
-                                if 'nodata_value' in list(var_da_dst.attrs.keys()):
-                                    var_nodata = var_da_dst.attrs['nodata_value']
-                                geo_nodata = None
-                                if 'nodata_value' in list(geo_da_dst.attrs.keys()):
-                                    geo_nodata = geo_da_dst.attrs['nodata_value']
-
-                                if (geo_nodata is not None) and (var_nodata is not None):
-                                    var_da_masked = var_da_dst.where(
-                                        (geo_da_dst.values[:, :, np.newaxis] != geo_nodata) &
-                                        (var_da_dst != var_nodata))
-                                else:
-                                    var_da_masked = deepcopy(var_da_dst)
-
-                                #Sanity check to remove nans
-                                var_da_masked.values = \
-                                    np.where(np.isnan(var_da_masked.values), var_nodata, var_da_masked.values)
-
-                                #Round
-                                var_da_masked.values = np.round(var_da_masked.values, var_decimal_digits)
-
-                                # plt.figure(1)
-                                # plt.imshow(var_da_dst.values[:, :, 0])
-                                # plt.colorbar()
-                                # plt.figure(2)
-                                # plt.imshow(var_da_src.values[:, :, 0])
-                                # plt.colorbar()
-                                # plt.figure(3)
-                                # plt.imshow(var_da_masked.values[:, :, 0])
-                                # plt.colorbar()
-                                # plt.show()
-                                # plt.figure(4)
-                                # plt.imshow(geo_da_dst.values)
-                                # plt.colorbar()
-                                # plt.show()
-
-                                # Organize data in a common datasets
-                                var_dset_masked = create_dset(var_data_time=var_time,
-                                                              var_data_name=var_name, var_data_values=var_da_masked,
-                                                              var_data_attrs=None,
-                                                              var_geo_1d=False,
-                                                              file_attributes=geo_da_dst.attrs,
-                                                              var_geo_name='terrain',
-                                                              var_geo_values=geo_da_dst.values,
-                                                              var_geo_x=geo_da_dst['longitude'].values,
-                                                              var_geo_y=geo_da_dst['latitude'].values,
-                                                              var_geo_attrs=None)
-
-                                # Organize data in merged datasets
-                                if var_time not in list(dset_collection.keys()):
-                                    dset_collection[var_time] = var_dset_masked
-                                else:
-                                    var_dset_tmp = deepcopy(dset_collection[var_time])
-                                    var_dset_tmp = var_dset_tmp.merge(var_dset_masked, join='right')
-                                    dset_collection[var_time] = var_dset_tmp
-
-                                #Compute SQA if needed
-                                if compute_quality:
-
-                                    log_stream.info(' ----> Variable "' + var_name + '" ... computing quality ')
-
-                                    SQA = compute_SQA(var_da_masked.values, geo_da_dst.values,
-                                                      self.SQA_ground_and_snow)
-                                    SQA_dset = create_dset(var_data_time=var_time,
-                                                                  var_data_name='SQA', var_data_values=SQA,
-                                                                  var_data_attrs=None,
-                                                                  var_geo_1d=False,
-                                                                  file_attributes=geo_da_dst.attrs,
-                                                                  var_geo_name='terrain',
-                                                                  var_geo_values=geo_da_dst.values,
-                                                                  var_geo_x=geo_da_dst['longitude'].values,
-                                                                  var_geo_y=geo_da_dst['latitude'].values,
-                                                                  var_geo_attrs=None)
-                                    var_dset_tmp = deepcopy(dset_collection[var_time])
-                                    var_dset_tmp = var_dset_tmp.merge(SQA_dset, join='right')
-                                    dset_collection[var_time] = var_dset_tmp
-
-                                log_stream.info(' -----> Time "' + var_time.strftime(time_format_algorithm) + '" ... DONE')
+        time_str = self.time_str
+        time_period = self.time_period
 
-                            else:
-                                log_stream.info(' -----> Time "' + var_time.strftime(time_format_algorithm) +
-                                                '" ... Datasets is not defined')
+        var_name_obj = self.var_name_obj
+        file_path_obj_anc = self.file_path_obj_anc
 
-                        else:
-                            var_da_src = None
-                            log_stream.info(' -----> Time "' + var_time.strftime(time_format_algorithm) +
-                                            '" ... Datasets is not defined')
+        flag_cleaning_ancillary = self.flag_cleaning_dynamic_ancillary
+        flag_resume_ancillary = self.flag_resume_dynamic_ancillary
+
+        # Ancillary datasets previously computed are kept to resume the time chunk
+        if flag_resume_ancillary and flag_cleaning_ancillary:
+            log_stream.info(' ---> Cleaning of dynamic ancillary datasets is not applied. Resume is activated')
+            flag_cleaning_ancillary = False
 
-                    log_stream.info(' ----> Variable "' + var_name + '" ... DONE')
+        # Terrain is not written in the dynamic datasets if referenced by the static file
+        flag_geo_write = True
+        if self.file_geo_mode == 'static_reference':
+            flag_geo_write = False
 
+        log_stream.info(' ---> Organize dynamic datasets [' + time_str + '] ... ')
+
+        # Check if ancillary file already exists
+        file_check_list = []
+        for file_path_tmp in file_path_obj_anc:
+            if os.path.exists(file_path_tmp):
+                if flag_cleaning_ancillary:
+                    os.remove(file_path_tmp)
+                    file_check_list.append(False)
                 else:
-                    log_stream.info(' ----> Variable "' + var_name + '" ... SKIPPED. Compute flag not activated.')
+                    file_check_list.append(True)
+            else:
+                file_check_list.append(False)
+        file_check = all(file_check_list)
 
-            # Save ancillary datasets
-            for file_path_anc, (dset_time, dset_anc) in zip(file_path_obj_anc, dset_collection.items()):
+        # If statement on ancillary availability
+        if not file_check:
 
+            dset_collection = {}
+            # Variable(s) sharing a mat file are computed in turn for each time step (the loaded file is used
+            # by all the variable(s) of the group before the next time step is loaded)
+            for var_group in self.define_var_group(var_name_obj):
+                var_group_iter = [
+                    self.organize_dynamic_var(var_name, dset_collection,
+                                              flag_resume_ancillary=flag_resume_ancillary,
+                                              flag_geo_write=flag_geo_write) for var_name in var_group]
+                for var_group_time in zip_longest(*var_group_iter):
+                    pass
+
+            # Release the mat variable(s) not used (time steps resumed by checkpoint)
+            clear_file_mat()
+
+            # Save ancillary datasets (filename selected by time; time steps without datasets are skipped)
+            file_path_anc_map = dict(zip(time_period, file_path_obj_anc))
+            for dset_time, dset_anc in dset_collection.items():
+
+                file_path_anc = file_path_anc_map[dset_time]
                 folder_name_anc, file_name_anc = os.path.split(file_path_anc)
                 if not os.path.exists(folder_name_anc):
                     make_folder(folder_name_anc)
 
-                write_obj(file_path_anc, dset_anc)
+                with self.profiler.timer('ancillary_write'):
+                    write_obj(file_path_anc, dset_anc)
+
+                # Remove variable checkpoint(s) included in the ancillary datasets
+                for var_name in var_name_obj:
+                    file_path_unit = self.define_file_name_unit(file_path_anc, var_name)
+                    if os.path.exists(file_path_unit):
+                        os.remove(file_path_unit)
 
             log_stream.info(' ---> Organize dynamic datasets [' + time_str + '] ... DONE')
         else:
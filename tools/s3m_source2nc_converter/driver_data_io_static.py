@@ -19,7 +19,7 @@ from lib_info_args import logger_name
 from lib_utils_system import fill_tags2string
 from lib_utils_gzip import unzip_filename
 from lib_data_io_nc import read_data_nc
-import matplotlib.pyplot as plt
+from lib_utils_profiling import get_profiler
 
 # Logging
 log_stream = logging.getLogger(logger_name)
@@ -114,9 +114,12 @@ class DriverStatic:
                                                  data_settings['algorithm']['template'],
                                                  data_settings['algorithm']['ancillary'])
 
+        profiler = get_profiler()
         if data_settings['data']['static']['destination']['Terrain']['file_compression']:
             file_name_zip = file_path_terrain_dst + '.gz'
-            unzip_filename(file_name_zip, file_path_terrain_dst)
+            with profiler.timer('static_unzip'):
+                unzip_filename(file_name_zip, file_path_terrain_dst)
+        profiler.count_file('static_read', file_path_terrain_dst)
 
         if (data_settings['data']['static']['destination']['Terrain']['file_type'] == 'tiff') \
                 or (data_settings['data']['static']['destination']['Terrain']['file_type'] == 'asc') \
@@ -145,6 +148,15 @@ class DriverStatic:
                         'nodata_value': data_settings['data']['static']['destination']['Terrain']['nodata_value']}
             data_collections[self.flag_static_destination][self.flag_dst_data] = grid_dst
 
+        # Store the terrain path to reference it in the dynamic datasets (if needed)
+        if self.flag_dst_data in list(data_collections[self.flag_static_destination].keys()):
+            if data_settings['data']['static']['destination']['Terrain']['file_compression']:
+                data_collections[self.flag_static_destination][self.flag_dst_data]['file_path'] = \
+                    file_path_terrain_dst + '.gz'
+            else:
+                data_collections[self.flag_static_destination][self.flag_dst_data]['file_path'] = \
+                    file_path_terrain_dst
+
         if data_settings['data']['static']['destination']['Terrain']['file_compression']:
             os.remove(file_path_terrain_dst)
 
@@ -10,13 +10,10 @@ Version:       '1.0.0'
 #######################################################################################
 # Libraries
 import logging
-import rasterio
 import os
 
 import numpy as np
 
-from rasterio.crs import CRS
-
 from lib_utils_io import create_darray_2d
 from lib_info_args import logger_name
 from lib_info_args import proj_epsg as proj_epsg_default
@@ -25,8 +22,8 @@ from lib_info_args import proj_epsg as proj_epsg_default
 log_stream = logging.getLogger(logger_name)
 
 logging.getLogger("rasterio").setLevel(logging.WARNING)
-# Debug
-import matplotlib.pylab as plt
+# Debug (uncomment to plot; matplotlib is loaded only if a debug plot is used)
+# from lib_utils_debug import plt
 #######################################################################################
 
 # -------------------------------------------------------------------------------------
@@ -127,6 +124,10 @@ def create_data_grid(info_grid, info_expected_fields=None, map_expected_fields=N
 # Method to read an ascii grid file
 def read_data_grid(file_name, output_format='data_array', output_dtype='float32'):
 
+    # Rasterio is imported on first use (startup of the tool)
+    import rasterio
+    from rasterio.crs import CRS
+
     try:
         dset = rasterio.open(file_name)
         bounds = dset.bounds
@@ -23,8 +23,8 @@ from lib_info_args import logger_name
 # Logging
 log_stream = logging.getLogger(logger_name)
 
-# Debug
-import matplotlib.pylab as plt
+# Debug (uncomment to plot; matplotlib is loaded only if a debug plot is used)
+# from lib_utils_debug import plt
 #######################################################################################
 
 
@@ -0,0 +1,144 @@
+"""
+Class Features
+
+Name:          lib_data_io_cache
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+#######################################################################################
+# Libraries
+import logging
+import os
+import json
+import hashlib
+import tempfile
+
+import numpy as np
+
+from lib_default_args import logger_name
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+#######################################################################################
+
+# -------------------------------------------------------------------------------------
+# Default settings
+cache_extension_data = '.npy'
+cache_extension_header = '.json'
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the cache file names (data and header) of a source file
+def define_file_cache(file_path_src, folder_cache):
+    file_key = hashlib.sha1(os.path.abspath(file_path_src).encode('utf-8')).hexdigest()
+    file_path_data = os.path.join(folder_cache, file_key + cache_extension_data)
+    file_path_header = os.path.join(folder_cache, file_key + cache_extension_header)
+    return file_path_data, file_path_header
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the signature of a source file (path, size and modification time)
+def define_file_signature(file_path_src):
+    file_stat = os.stat(file_path_src)
+    return {'file_path': os.path.abspath(file_path_src),
+            'file_size': file_stat.st_size, 'file_mtime': file_stat.st_mtime_ns}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to check the cache of a source file (without loading it; used to skip the staging of the source)
+def check_file_cache(file_path_src, folder_cache):
+
+    file_path_data, file_path_header = define_file_cache(file_path_src, folder_cache)
+    if not (os.path.exists(file_path_data) and os.path.exists(file_path_header)):
+        return False
+
+    try:
+        with open(file_path_header, 'r') as file_handle:
+            file_header = json.load(file_handle)
+        return file_header['file_signature'] == define_file_signature(file_path_src)
+    except (IOError, OSError, ValueError, KeyError):
+        return False
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get cached values and header of a source file (None if not cached or outdated)
+def get_file_cache(file_path_src, folder_cache):
+
+    file_path_data, file_path_header = define_file_cache(file_path_src, folder_cache)
+    if not (os.path.exists(file_path_data) and os.path.exists(file_path_header)):
+        return None, None
+
+    try:
+        with open(file_path_header, 'r') as file_handle:
+            file_header = json.load(file_handle)
+        if file_header['file_signature'] != define_file_signature(file_path_src):
+            return None, None
+        file_values = np.load(file_path_data, mmap_mode='r')
+    except (IOError, OSError, ValueError, KeyError):
+        log_stream.warning(' ===> Cache of file "' + file_path_src + '" is not readable. Cache will be updated')
+        return None, None
+
+    # Update access time (used by the LRU eviction)
+    os.utime(file_path_data, None)
+
+    return file_values, file_header
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to put values and header of a source file in the cache (atomic writing)
+def put_file_cache(file_path_src, folder_cache, file_values, file_header, cache_size_max=None):
+
+    os.makedirs(folder_cache, exist_ok=True)
+    file_path_data, file_path_header = define_file_cache(file_path_src, folder_cache)
+
+    file_header = dict(file_header)
+    file_header['file_signature'] = define_file_signature(file_path_src)
+
+    file_handle_tmp, file_path_tmp = tempfile.mkstemp(dir=folder_cache, suffix=cache_extension_data)
+    with os.fdopen(file_handle_tmp, 'wb') as file_handle:
+        np.save(file_handle, np.asarray(file_values))
+    os.replace(file_path_tmp, file_path_data)
+
+    file_handle_tmp, file_path_tmp = tempfile.mkstemp(dir=folder_cache, suffix=cache_extension_header)
+    with os.fdopen(file_handle_tmp, 'w') as file_handle:
+        json.dump(file_header, file_handle)
+    os.replace(file_path_tmp, file_path_header)
+
+    if cache_size_max is not None:
+        evict_file_cache(folder_cache, cache_size_max)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to evict the least recently used file(s) from the cache (size in bytes)
+def evict_file_cache(folder_cache, cache_size_max):
+
+    file_list = []
+    for file_name in os.listdir(folder_cache):
+        if file_name.endswith(cache_extension_data):
+            file_path_data = os.path.join(folder_cache, file_name)
+            try:
+                file_stat = os.stat(file_path_data)
+            except FileNotFoundError:
+                continue
+            file_list.append((file_stat.st_mtime, file_stat.st_size, file_path_data))
+
+    cache_size = sum([file_step[1] for file_step in file_list])
+    for file_time, file_size, file_path_data in sorted(file_list):
+        if cache_size <= cache_size_max:
+            break
+        file_path_header = file_path_data[:-len(cache_extension_data)] + cache_extension_header
+        for file_path_step in [file_path_header, file_path_data]:
+            try:
+                os.remove(file_path_step)
+            except FileNotFoundError:
+                pass
+        cache_size -= file_size
+# -------------------------------------------------------------------------------------
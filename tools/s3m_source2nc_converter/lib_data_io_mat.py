@@ -11,8 +11,6 @@ Version:       '1.0.0'
 # Libraries
 import logging
 import os
-import rasterio
-import scipy.io
 
 import numpy as np
 import xarray as xr
@@ -23,13 +21,142 @@ from lib_default_args import logger_name
 # Logging
 log_stream = logging.getLogger(logger_name)
 
-# Debug
-import matplotlib.pylab as plt
+# Debug (uncomment to plot; matplotlib is loaded only if a debug plot is used)
+# from lib_utils_debug import plt
 #######################################################################################
 
 # -------------------------------------------------------------------------------------
 # Default settings
 proj_default_wkt = 'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",6378137,298.257223563,AUTHORITY["EPSG","7030"]],AUTHORITY["EPSG","6326"]],PRIMEM["Greenwich",0,AUTHORITY["EPSG","8901"]],UNIT["degree",0.0174532925199433,AUTHORITY["EPSG","9122"]],AUTHORITY["EPSG","4326"]]'
+
+# Cache of the loaded mat file (variable(s) not yet used and georeference) by file signature; the variable(s)
+# sharing a file are computed in turn for each time step, so at most one file is kept
+file_mat_cache = {}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the signature of a mat file (path, size and modification time)
+def define_file_signature(file_name):
+    file_stat = os.stat(file_name)
+    return os.path.abspath(file_name), file_stat.st_size, file_stat.st_mtime_ns
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to compute georeference of a mat file (checks are done on 1d coordinates)
+def compute_georef_mat(file_mat, georef_names, file_shape, decimal_round_geo=7, flag_round_geo=True):
+
+    import rasterio.transform
+
+    file_res = [float(file_mat[georef_names['res_y']]), float(file_mat[georef_names['res_x']])]
+    file_grid_lat = file_mat[georef_names['grid_lat']]
+    file_grid_lon = file_mat[georef_names['grid_lon']]
+    file_bounds = {"left": float(np.nanmin(file_grid_lon) - file_res[0]/2),
+                   "right": float(np.nanmax(file_grid_lon) + file_res[0]/2),
+                   "top": float(np.nanmax(file_grid_lat) + file_res[1]/2),
+                   "bottom": float(np.nanmin(file_grid_lat) - file_res[1]/2)}
+    if flag_round_geo:
+        for file_bounds_key in file_bounds.keys():
+            file_bounds[file_bounds_key] = round(file_bounds[file_bounds_key], decimal_round_geo)
+    else:
+        log_stream.error(' ===> Switch off the rounding of geographical dataset is not expected')
+        raise NotImplementedError('Case not implemented yet')
+
+    file_transform = rasterio.transform.from_bounds(file_bounds['left'], file_bounds['bottom'],
+                                                    file_bounds['right'], file_bounds['top'],
+                                                    file_shape[1], file_shape[0])
+
+    center_right = file_bounds['right'] - (file_res[0] / 2)
+    center_left = file_bounds['left'] + (file_res[0] / 2)
+    center_top = file_bounds['top'] - (file_res[1] / 2)
+    center_bottom = file_bounds['bottom'] + (file_res[1] / 2)
+
+    file_flip = False
+    if center_bottom > center_top:
+        center_bottom, center_top = center_top, center_bottom
+        file_flip = True
+
+    lon = np.arange(center_left, center_right + np.abs(file_res[0] / 2), np.abs(file_res[0]), float)
+    lat = np.flip(np.arange(center_bottom, center_top + np.abs(file_res[1] / 2), np.abs(file_res[1]), float), axis=0)
+
+    assert round(np.min(lon), decimal_round_geo) == round(center_left, decimal_round_geo)
+    assert round(np.max(lon), decimal_round_geo) == round(center_right, decimal_round_geo)
+    assert round(np.min(lat), decimal_round_geo) == round(center_bottom, decimal_round_geo)
+    assert round(np.max(lat), decimal_round_geo) == round(center_top, decimal_round_geo)
+
+    return {'res': file_res, 'bounds': file_bounds, 'transform': file_transform,
+            'lon': lon, 'lat': lat, 'flip': file_flip}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to check if a variable of a mat file is available in the cache (checked with the source file)
+def check_file_mat(file_cache_key, var_name):
+    if not os.path.exists(file_cache_key):
+        return False
+    file_entry = file_mat_cache.get(define_file_signature(file_cache_key), None)
+    return (file_entry is not None) and (var_name in list(file_entry['values'].keys()))
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to clear the cache of the mat file(s) (variable(s) not used, e.g. time steps resumed by checkpoint)
+def clear_file_mat():
+    file_mat_cache.clear()
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get a variable from a mat file (loading once all the variable(s) sharing the file)
+def get_file_mat(file_name, var_name, georef_names, var_name_list=None, file_cache_key=None,
+                 decimal_round_geo=7, flag_round_geo=True):
+
+    # scipy is imported on first use (not at the import of the module)
+    import scipy.io
+
+    if file_cache_key is None:
+        file_cache_key = file_name
+    if var_name_list is None:
+        var_name_list = [var_name]
+    if var_name not in var_name_list:
+        var_name_list = var_name_list + [var_name]
+
+    file_signature = define_file_signature(file_cache_key)
+
+    file_entry = None
+    if file_signature in list(file_mat_cache.keys()):
+        file_entry = file_mat_cache[file_signature]
+        if var_name not in list(file_entry['values'].keys()):
+            file_mat_cache.pop(file_signature)
+            file_entry = None
+
+    if file_entry is None:
+
+        # Load only the variable(s) and the georeference field(s)
+        file_mat = scipy.io.loadmat(file_name, variable_names=var_name_list + list(georef_names.values()))
+        file_values = {var_step: file_mat[var_step] for var_step in var_name_list if var_step in file_mat}
+
+        if var_name not in list(file_values.keys()):
+            log_stream.error(' ===> Variable "' + var_name + '" not available in file ' + file_name)
+            raise IOError('Variable not available in the selected file')
+
+        file_georef = compute_georef_mat(file_mat, georef_names, file_values[var_name].shape,
+                                         decimal_round_geo=decimal_round_geo, flag_round_geo=flag_round_geo)
+        file_entry = {'values': file_values, 'georef': file_georef}
+
+        # Entries of the previous time step(s) are released (the variable(s) sharing a file are computed in turn
+        # for each time step, so at most one file is kept in memory)
+        file_mat_cache.clear()
+        file_mat_cache[file_signature] = file_entry
+
+    # Each variable is served once (memory of the cached file is released when all variables are used)
+    file_values = file_entry['values'].pop(var_name)
+    file_georef = file_entry['georef']
+    if not file_entry['values']:
+        file_mat_cache.pop(file_signature, None)
+
+    return file_values, file_georef
 # -------------------------------------------------------------------------------------
 
 
@@ -41,34 +168,23 @@ def read_data_mat(file_name, var_scale_factor=1, var_type='float32', var_name=No
                    dims_order=None,
                    decimal_round_data=7, flag_round_data=False,
                    decimal_round_geo=7, flag_round_geo=True ,
-                   src_dict=None):
+                   src_dict=None, var_name_list=None, file_cache_key=None):
 
     if dims_order is None:
         dims_order = [dim_name_geo_y, dim_name_geo_x, dim_name_time]
 
     if os.path.exists(file_name):
-        # Open file mat
-        file_mat = scipy.io.loadmat(file_name)
-        file_values = file_mat[var_name]
 
         if src_dict is not None:
-            file_res = [float(file_mat[src_dict['ancillary_georef_mat']['res_y']]),
-                        float(file_mat[src_dict['ancillary_georef_mat']['res_x']])]
-            file_grid_lat = file_mat[src_dict['ancillary_georef_mat']['grid_lat']]
-            file_grid_lon = file_mat[src_dict['ancillary_georef_mat']['grid_lon']]
-            file_bounds = {"left": float(np.nanmin(file_grid_lon) - file_res[0]/2),
-                           "right": float(np.nanmax(file_grid_lon) + file_res[0]/2),
-                           "top": float(np.nanmax(file_grid_lat) + file_res[1]/2),
-                           "bottom": float(np.nanmin(file_grid_lat) - file_res[1]/2)}
-            if flag_round_geo:
-                for file_bounds_key in file_bounds.keys():
-                    file_bounds[file_bounds_key] = round(file_bounds[file_bounds_key], decimal_round_geo)
-
-            file_transform = rasterio.transform.from_bounds(file_bounds['left'], file_bounds['bottom'],
-                                           file_bounds['right'], file_bounds['top'],
-                                           file_values.shape[1], file_values.shape[0])
+            # Read file mat (variable(s) sharing the same file are loaded once)
+            file_values, file_georef = get_file_mat(
+                file_name, var_name, src_dict['ancillary_georef_mat'], var_name_list=var_name_list,
+                file_cache_key=file_cache_key,
+                decimal_round_geo=decimal_round_geo, flag_round_geo=flag_round_geo)
+
+            file_bounds = file_georef['bounds']
+            file_transform = file_georef['transform']
             file_nodata = None
-            crs = None
         else:
             log_stream.error(' ===> File type is mat but ancillary_georef_mat not available!')
             raise NotImplementedError('Case not implemented yet')
@@ -87,61 +203,22 @@ def read_data_mat(file_name, var_scale_factor=1, var_type='float32', var_name=No
             log_stream.error(' ===> File type is not correctly defined.')
             raise NotImplemented('Case not implemented yet')
 
-        if crs is None:
-            file_proj = proj_default_wkt
-            log_stream.warning(' ===> Projection of mat ' + file_name + ' not defined. Use default settings.')
-        else:
-            file_proj = file_mat.crs.wkt
-
-        file_dims = file_values.shape
-        file_high = file_dims[0]
-        file_wide = file_dims[1]
-
-        center_right = file_bounds['right'] - (file_res[0] / 2)
-        center_left = file_bounds['left'] + (file_res[0] / 2)
-        center_top = file_bounds['top'] - (file_res[1] / 2)
-        center_bottom = file_bounds['bottom'] + (file_res[1] / 2)
-
-        if center_bottom > center_top:
-            center_bottom_tmp = center_top
-            center_top_tmp = center_bottom
-            center_bottom = center_bottom_tmp
-            center_top = center_top_tmp
+        # Projection is not defined in mat file(s)
+        file_proj = proj_default_wkt
+        log_stream.warning(' ===> Projection of mat ' + file_name + ' not defined. Use default settings.')
 
+        if file_georef['flip']:
             file_values = np.flipud(file_values)
 
-        lon = np.arange(center_left, center_right + np.abs(file_res[0] / 2), np.abs(file_res[0]), float)
-        lat = np.flip(np.arange(center_bottom, center_top + np.abs(file_res[1] / 2), np.abs(file_res[1]), float), axis=0)
-        lons, lats = np.meshgrid(lon, lat)
-
-        if flag_round_geo:
-            min_lon_round = round(np.min(lons), decimal_round_geo)
-            max_lon_round = round(np.max(lons), decimal_round_geo)
-            min_lat_round = round(np.min(lats), decimal_round_geo)
-            max_lat_round = round(np.max(lats), decimal_round_geo)
-
-            center_right_round = round(center_right, decimal_round_geo)
-            center_left_round = round(center_left, decimal_round_geo)
-            center_bottom_round = round(center_bottom, decimal_round_geo)
-            center_top_round = round(center_top, decimal_round_geo)
-        else:
-            log_stream.error(' ===> Switch off the rounding of geographical dataset is not expected')
-            raise NotImplemented('Case not implemented yet')
-
-        assert min_lon_round == center_left_round
-        assert max_lon_round == center_right_round
-        assert min_lat_round == center_bottom_round
-        assert max_lat_round == center_top_round
-
-        var_geo_x_2d = lons
-        var_geo_y_2d = (lats)
+        var_geo_x_1d = file_georef['lon']
+        var_geo_y_1d = file_georef['lat']
 
-        var_data = np.zeros(shape=[var_geo_x_2d.shape[0], var_geo_y_2d.shape[1], 1])
+        var_data = np.zeros(shape=[var_geo_y_1d.shape[0], var_geo_x_1d.shape[0], 1])
         var_data[:, :, :] = np.nan
         var_data[:, :, 0] = file_values
         var_data = np.where(np.isnan(var_data), file_nodata, var_data)
 
-        var_attrs = {'nrows': var_geo_y_2d.shape[0], 'ncols': var_geo_x_2d.shape[1],
+        var_attrs = {'nrows': var_geo_y_1d.shape[0], 'ncols': var_geo_x_1d.shape[0],
                      'nodata_value': file_nodata,
                      'xllcorner': file_transform[2],
                      'yllcorner': file_bounds['bottom'], 'cellsize': abs(file_transform[0]),
@@ -163,8 +240,8 @@ def read_data_mat(file_name, var_scale_factor=1, var_type='float32', var_name=No
 
         var_da = xr.DataArray(var_data, name=var_name, dims=dims_order,
                               coords={coord_name_time: ([dim_name_time], var_time),
-                                      coord_name_geo_x: ([dim_name_geo_x], var_geo_x_2d[0, :]),
-                                      coord_name_geo_y: ([dim_name_geo_y], var_geo_y_2d[:, 0])})
+                                      coord_name_geo_x: ([dim_name_geo_x], var_geo_x_1d),
+                                      coord_name_geo_y: ([dim_name_geo_y], var_geo_y_1d)})
         var_da.attrs = var_attrs
 
     else:
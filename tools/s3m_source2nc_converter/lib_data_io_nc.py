@@ -15,10 +15,11 @@ import os
 import numpy as np
 import xarray as xr
 import pandas as pd
-import matplotlib.pyplot as plt
+from copy import deepcopy
 from datetime import datetime
 
 from lib_default_args import logger_name
+from lib_utils_interp import compute_var_window_slice
 
 # Logging
 log_stream = logging.getLogger(logger_name)
@@ -28,13 +29,130 @@ log_stream = logging.getLogger(logger_name)
 #######################################################################################
 
 
+# -------------------------------------------------------------------------------------
+# Method to check file georeference using the coordinate endpoints only
+def check_data_nc_geo(geo_data_x, geo_data_y, geo_ref_x=None, geo_ref_y=None, decimal_round=4):
+
+    if (geo_ref_x is None) or (geo_ref_y is None):
+        log_stream.warning(' ===> Variables geo_check_x and geo_check_y assumed equal to geo_data_x and geo_data_y')
+        return
+
+    geo_check_start_x = np.float32(round(geo_ref_x[0], decimal_round))
+    geo_check_start_y = np.float32(round(geo_ref_y[0], decimal_round))
+    geo_check_end_x = np.float32(round(geo_ref_x[-1], decimal_round))
+    geo_check_end_y = np.float32(round(geo_ref_y[-1], decimal_round))
+
+    geo_data_start_x = np.float32(round(geo_data_x[0], decimal_round))
+    geo_data_start_y = np.float32(round(geo_data_y[0], decimal_round))
+    geo_data_end_x = np.float32(round(geo_data_x[-1], decimal_round))
+    geo_data_end_y = np.float32(round(geo_data_y[-1], decimal_round))
+
+    assert geo_check_start_x == geo_data_start_x, ' ===> Variable geo x start != Reference geo x start'
+    assert geo_check_start_y == geo_data_start_y, ' ===> Variable geo y start != Reference geo y start'
+    assert geo_check_end_x == geo_data_end_x, ' ===> Variable geo x end != Reference geo x end'
+    assert geo_check_end_y == geo_data_end_y, ' ===> Variable geo y end != Reference geo y end'
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read data netcdf variable directly (only the variable, coordinate vectors and, if set, a window)
+def read_data_nc_direct(file_name, var_name, var_coords, geo_ref_x=None, geo_ref_y=None, geo_ref_attrs=None,
+                        var_window=None, var_scale_factor=1, decimal_round=4):
+
+    # NetCDF4 is imported on first use (startup of the tool)
+    import netCDF4
+
+    with netCDF4.Dataset(file_name, mode='r') as file_handle:
+
+        file_variables = list(file_handle.variables)
+
+        if var_name not in file_variables:
+            log_stream.warning(' ===> Variable ' + var_name + ' not available in loaded datasets!')
+            return None, None, None, geo_ref_attrs
+
+        coord_name_x, coord_name_y = var_coords['x'], var_coords['y']
+        if coord_name_x not in file_variables:
+            raise IOError('Coord name "x" is not available')
+        if coord_name_y not in file_variables:
+            raise IOError('Coord name "y" is not available')
+
+        # Read coordinates as 1d vectors (first row and first column for 2d coordinates)
+        coord_handle_x, coord_handle_y = file_handle.variables[coord_name_x], file_handle.variables[coord_name_y]
+        if (coord_handle_x.ndim == 1) and (coord_handle_y.ndim == 1):
+            dim_name_file_x, dim_name_file_y = coord_handle_x.dimensions[0], coord_handle_y.dimensions[0]
+            geo_data_x, geo_data_y = np.asarray(coord_handle_x[:]), np.asarray(coord_handle_y[:])
+        elif (coord_handle_x.ndim == 2) and (coord_handle_y.ndim == 2):
+            dim_name_file_y, dim_name_file_x = coord_handle_x.dimensions
+            geo_data_x, geo_data_y = np.asarray(coord_handle_x[0, :]), np.asarray(coord_handle_y[:, 0])
+        else:
+            log_stream.error(' ===> Coords "' + coord_name_x + '" and "' + coord_name_y + '" must be both 1d or 2d')
+            raise NotImplementedError('Case not implemented yet')
+
+        # Check georeference (orientation north-up as in the xarray reader)
+        geo_flip = False
+        if geo_data_y[-1] > geo_data_y[0]:
+            geo_flip = True
+        check_data_nc_geo(geo_data_x, np.flipud(geo_data_y) if geo_flip else geo_data_y,
+                          geo_ref_x, geo_ref_y, decimal_round=decimal_round)
+
+        # Define window (in the file order)
+        geo_slice_x, geo_slice_y = slice(None), slice(None)
+        if var_window is not None:
+            geo_slice_x = compute_var_window_slice(
+                geo_data_x, var_window['geo_x_min'], var_window['geo_x_max'], var_window['halo'])
+            geo_slice_y = compute_var_window_slice(
+                geo_data_y, var_window['geo_y_min'], var_window['geo_y_max'], var_window['halo'])
+        geo_data_x, geo_data_y = geo_data_x[geo_slice_x], geo_data_y[geo_slice_y]
+
+        # Read variable (only the window)
+        var_handle = file_handle.variables[var_name]
+        var_idx, var_dims = [], []
+        for dim_name, dim_size in zip(var_handle.dimensions, var_handle.shape):
+            if dim_name == dim_name_file_x:
+                var_idx.append(geo_slice_x)
+                var_dims.append(dim_name)
+            elif dim_name == dim_name_file_y:
+                var_idx.append(geo_slice_y)
+                var_dims.append(dim_name)
+            elif dim_size == 1:
+                var_idx.append(0)
+            else:
+                raise NotImplementedError('Time size is greater than 1')
+
+        var_data = var_handle[tuple(var_idx)]
+        var_data = np.ma.filled(var_data.astype(np.float32), np.nan)
+        if var_dims == [dim_name_file_x, dim_name_file_y]:
+            var_data = np.transpose(var_data)
+        var_data = np.float32(var_data / var_scale_factor)
+
+    if geo_flip:
+        geo_data_y = np.flipud(geo_data_y)
+        var_data = np.flipud(var_data)
+
+    # Update attributes to the window
+    if (var_window is not None) and (geo_ref_attrs is not None):
+        geo_ref_attrs = deepcopy(geo_ref_attrs)
+        if 'nrows' in list(geo_ref_attrs.keys()):
+            geo_ref_attrs['nrows'] = geo_data_y.shape[0]
+        if 'ncols' in list(geo_ref_attrs.keys()):
+            geo_ref_attrs['ncols'] = geo_data_x.shape[0]
+        if 'cellsize' in list(geo_ref_attrs.keys()):
+            if 'xllcorner' in list(geo_ref_attrs.keys()):
+                geo_ref_attrs['xllcorner'] = float(np.min(geo_data_x)) - geo_ref_attrs['cellsize'] / 2
+            if 'yllcorner' in list(geo_ref_attrs.keys()):
+                geo_ref_attrs['yllcorner'] = float(np.min(geo_data_y)) - geo_ref_attrs['cellsize'] / 2
+
+    return var_data, geo_data_x, geo_data_y, geo_ref_attrs
+# -------------------------------------------------------------------------------------
+
+
 # -------------------------------------------------------------------------------------
 # Method to read data netcdf
 def read_data_nc(file_name, geo_ref_x=None, geo_ref_y=None, geo_ref_attrs=None,
                  var_coords=None, var_scale_factor=1, var_name=None, var_time=None, var_no_data=-9999.0,
                  coord_name_time='time', coord_name_geo_x='Longitude', coord_name_geo_y='Latitude',
                  dim_name_time='time', dim_name_geo_x='west_east', dim_name_geo_y='south_north',
-                 dims_order=None, decimal_round=4):
+                 dims_order=None, decimal_round=4, file_engine='xarray', var_window=None):
 
     if var_coords is None:
         var_coords = {'x': 'Longitude', 'y': 'Latitude', 'time': 'time'}
@@ -42,7 +160,20 @@ def read_data_nc(file_name, geo_ref_x=None, geo_ref_y=None, geo_ref_attrs=None,
     if dims_order is None:
         dims_order = [dim_name_geo_y, dim_name_geo_x, dim_name_time]
 
-    if os.path.exists(file_name):
+    if os.path.exists(file_name) and (file_engine == 'netcdf4'):
+
+        # Read variable directly (handle closed at the end of the reading)
+        var_data, geo_data_x, geo_data_y, geo_ref_attrs = read_data_nc_direct(
+            file_name, var_name, var_coords, geo_ref_x=geo_ref_x, geo_ref_y=geo_ref_y, geo_ref_attrs=geo_ref_attrs,
+            var_window=var_window, var_scale_factor=var_scale_factor, decimal_round=decimal_round)
+
+        if (var_data is not None) and (dims_order.__len__() == 3):
+            var_data = var_data[:, :, np.newaxis]
+
+    elif os.path.exists(file_name):
+
+        if var_window is not None:
+            log_stream.warning(' ===> Variable window is applied only with file engine "netcdf4"')
 
         # Open file nc
         file_handle = xr.open_dataset(file_name)
@@ -128,12 +259,20 @@ def read_data_nc(file_name, geo_ref_x=None, geo_ref_y=None, geo_ref_attrs=None,
         else:
             log_stream.warning(' ===> Variable ' + var_name + ' not available in loaded datasets!')
             var_data = None
+
+        # Close file nc
+        file_handle.close()
     else:
         log_stream.warning(' ===> File ' + file_name + ' not available in loaded datasets!')
         var_data = None
 
     if var_data is not None:
 
+        if geo_data_x.shape.__len__() == 2:
+            geo_data_x = geo_data_x[0, :]
+        if geo_data_y.shape.__len__() == 2:
+            geo_data_y = geo_data_y[:, 0]
+
         if dims_order.__len__() == 3:
 
             if var_time is None:
@@ -149,13 +288,13 @@ def read_data_nc(file_name, geo_ref_x=None, geo_ref_y=None, geo_ref_attrs=None,
 
             var_da = xr.DataArray(var_data, name=var_name, dims=dims_order,
                                   coords={coord_name_time: ([dim_name_time], var_time),
-                                          coord_name_geo_x: ([dim_name_geo_x], geo_data_x[0, :]),
-                                          coord_name_geo_y: ([dim_name_geo_y], geo_data_y[:, 0])})
+                                          coord_name_geo_x: ([dim_name_geo_x], geo_data_x),
+                                          coord_name_geo_y: ([dim_name_geo_y], geo_data_y)})
 
         elif dims_order.__len__() == 2:
             var_da = xr.DataArray(var_data, name=var_name, dims=dims_order,
-                                  coords={coord_name_geo_x: ([dim_name_geo_x], geo_data_x[0, :]),
-                                          coord_name_geo_y: ([dim_name_geo_y], geo_data_y[:, 0])})
+                                  coords={coord_name_geo_x: ([dim_name_geo_x], geo_data_x),
+                                          coord_name_geo_y: ([dim_name_geo_y], geo_data_y)})
         else:
             raise NotImplemented('Case not implemented yet')
 
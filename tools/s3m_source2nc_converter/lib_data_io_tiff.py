@@ -11,19 +11,19 @@ Version:       '1.0.0'
 # Libraries
 import logging
 import os
-import rasterio
 
 import numpy as np
 import xarray as xr
 import pandas as pd
 
 from lib_default_args import logger_name
+from lib_data_io_cache import get_file_cache, put_file_cache
 
 # Logging
 log_stream = logging.getLogger(logger_name)
 
-# Debug
-import matplotlib.pylab as plt
+# Debug (uncomment to plot; matplotlib is loaded only if a debug plot is used)
+# from lib_utils_debug import plt
 #######################################################################################
 
 # -------------------------------------------------------------------------------------
@@ -32,6 +32,101 @@ proj_default_wkt = 'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",6378137,2
 # -------------------------------------------------------------------------------------
 
 
+# -------------------------------------------------------------------------------------
+# Method to define the file window covering the variable window (bbox and halo cells)
+def define_file_window(file_transform, file_width, file_height, file_res, var_window):
+
+    from rasterio.windows import Window
+
+    file_res_x, file_res_y = file_res
+    halo_x = var_window['halo'] * file_res_x
+    halo_y = var_window['halo'] * file_res_y
+
+    geo_x_list = [var_window['geo_x_min'] - halo_x, var_window['geo_x_max'] + halo_x]
+    geo_y_list = [var_window['geo_y_min'] - halo_y, var_window['geo_y_max'] + halo_y]
+
+    # Pixel coordinates of the bbox corners (independent of the raster orientation)
+    col_list, row_list = [], []
+    for geo_x in geo_x_list:
+        for geo_y in geo_y_list:
+            col_step, row_step = ~file_transform * (geo_x, geo_y)
+            col_list.append(col_step)
+            row_list.append(row_step)
+
+    col_start = max(int(np.floor(min(col_list))), 0)
+    col_end = min(int(np.ceil(max(col_list))), file_width)
+    row_start = max(int(np.floor(min(row_list))), 0)
+    row_end = min(int(np.ceil(max(row_list))), file_height)
+
+    if (col_end <= col_start) or (row_end <= row_start):
+        log_stream.error(' ===> Variable window is outside the file domain')
+        raise IOError('Window not available in the selected file')
+
+    file_window = Window(col_start, row_start, col_end - col_start, row_end - row_start)
+
+    return file_window
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read file values and info (using the cache of the parsed file if defined)
+def read_file_tiff(file_name, var_window=None, file_cache=None, file_cache_key=None, file_cache_size_max=None):
+
+    # Rasterio is imported on first use (startup of the tool)
+    import rasterio
+    from rasterio.transform import Affine
+    from rasterio.coords import BoundingBox
+    from rasterio.windows import Window
+    from rasterio.windows import bounds as window_bounds
+    from rasterio.windows import transform as window_transform
+
+    if file_cache_key is None:
+        file_cache_key = file_name
+
+    file_values, file_header = None, None
+    if file_cache is not None:
+        file_values, file_header = get_file_cache(file_cache_key, file_cache)
+
+    if file_header is None:
+        with rasterio.open(file_name) as file_handle:
+
+            file_header = {'transform': list(file_handle.transform)[:6], 'res': list(file_handle.res),
+                           'width': file_handle.width, 'height': file_handle.height,
+                           'nodata': file_handle.nodata,
+                           'proj': file_handle.crs.wkt if file_handle.crs is not None else None}
+
+            if file_cache is not None:
+                file_values = file_handle.read(1)
+                put_file_cache(file_cache_key, file_cache, file_values, file_header,
+                               cache_size_max=file_cache_size_max)
+            elif var_window is not None:
+                file_window = define_file_window(
+                    file_handle.transform, file_handle.width, file_handle.height, file_handle.res, var_window)
+                file_values = file_handle.read(1, window=file_window)
+                file_transform = file_handle.window_transform(file_window)
+                file_bounds = BoundingBox(*file_handle.window_bounds(file_window))
+                return file_values, file_transform, file_bounds, file_header
+            else:
+                file_values = file_handle.read(1)
+                return file_values, file_handle.transform, file_handle.bounds, file_header
+
+    # Values (in memory or memory-mapped from the cache) are sliced to the window if defined
+    file_transform = Affine(*file_header['transform'])
+    if var_window is not None:
+        file_window = define_file_window(
+            file_transform, file_header['width'], file_header['height'], file_header['res'], var_window)
+    else:
+        file_window = Window(0, 0, file_header['width'], file_header['height'])
+
+    (row_start, row_end), (col_start, col_end) = file_window.toranges()
+    file_values = np.array(file_values[row_start:row_end, col_start:col_end])
+    file_bounds = BoundingBox(*window_bounds(file_window, file_transform))
+    file_transform = window_transform(file_window, file_transform)
+
+    return file_values, file_transform, file_bounds, file_header
+# -------------------------------------------------------------------------------------
+
+
 # -------------------------------------------------------------------------------------
 # Method to read data
 def read_data_tiff(file_name, var_scale_factor=1, var_type='float32', var_name=None, var_time=None, var_no_data=-9999.0,
@@ -39,21 +134,26 @@ def read_data_tiff(file_name, var_scale_factor=1, var_type='float32', var_name=N
                    dim_name_time='time', dim_name_geo_x='west_east', dim_name_geo_y='south_north',
                    dims_order=None,
                    decimal_round_data=7, flag_round_data=False,
-                   decimal_round_geo=7, flag_round_geo=True):
+                   decimal_round_geo=7, flag_round_geo=True, var_window=None,
+                   file_cache=None, file_cache_key=None, file_cache_size_max=None):
 
     if dims_order is None:
         dims_order = [dim_name_geo_y, dim_name_geo_x, dim_name_time]
 
     if os.path.exists(file_name):
-        # Open file tiff
-        file_handle = rasterio.open(file_name)
-        # Read file info and values
-        file_bounds = file_handle.bounds
-        file_res = file_handle.res
-        file_transform = file_handle.transform
-        file_nodata = file_handle.nodata
-        file_data = file_handle.read()
-        file_values = file_data[0, :, :]
+        # Read file info and values (only the window covering the destination domain if defined)
+        file_values, file_transform, file_bounds, file_header = read_file_tiff(
+            file_name, var_window=var_window,
+            file_cache=file_cache, file_cache_key=file_cache_key, file_cache_size_max=file_cache_size_max)
+        file_res = tuple(file_header['res'])
+        file_nodata = file_header['nodata']
+
+        if file_header['proj'] is None:
+            file_proj = proj_default_wkt
+            log_stream.warning(' ===> Projection of tiff ' + file_name + ' not defined. Use default settings.')
+        else:
+            file_proj = file_header['proj']
+        file_geotrans = file_transform
 
         if file_nodata is None:
             file_nodata = var_no_data
@@ -69,13 +169,6 @@ def read_data_tiff(file_name, var_scale_factor=1, var_type='float32', var_name=N
             log_stream.error(' ===> File type is not correctly defined.')
             raise NotImplemented('Case not implemented yet')
 
-        if file_handle.crs is None:
-            file_proj = proj_default_wkt
-            log_stream.warning(' ===> Projection of tiff ' + file_name + ' not defined. Use default settings.')
-        else:
-            file_proj = file_handle.crs.wkt
-        file_geotrans = file_handle.transform
-
         file_dims = file_values.shape
         file_high = file_dims[0]
         file_wide = file_dims[1]
@@ -0,0 +1,4 @@
+# -------------------------------------------------------------------------------------
+# Libraries
+from s3m_tools import LazyPlot, plt  # noqa: F401 (shared library)
+# -------------------------------------------------------------------------------------
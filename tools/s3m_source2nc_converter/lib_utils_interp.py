@@ -8,6 +8,7 @@ Version:       '1.0.0'
 """
 # -------------------------------------------------------------------------------------
 # Libraries
+import numpy as np
 import xarray as xr
 # -------------------------------------------------------------------------------------
 
@@ -43,6 +44,47 @@ def active_var_interp(var_attrs, geo_attrs, fields_included=None):
 # -------------------------------------------------------------------------------------
 
 
+# -------------------------------------------------------------------------------------
+# Method to define the window (bounding box and halo cells) needed to interpolate a source over a domain
+def define_var_window(geo_da_out, coord_name_geo_x='longitude', coord_name_geo_y='latitude',
+                      interp_method='nearest', interp_halo=None):
+
+    if not isinstance(geo_da_out, xr.DataArray):
+        raise RuntimeError('Data format for geographical reference not allowed for defining the window')
+
+    if interp_halo is None:
+        if interp_method == 'nearest':
+            interp_halo = 1
+        else:
+            interp_halo = 2
+
+    geo_x_out = geo_da_out[coord_name_geo_x].values
+    geo_y_out = geo_da_out[coord_name_geo_y].values
+
+    var_window = {'geo_x_min': float(np.nanmin(geo_x_out)), 'geo_x_max': float(np.nanmax(geo_x_out)),
+                  'geo_y_min': float(np.nanmin(geo_y_out)), 'geo_y_max': float(np.nanmax(geo_y_out)),
+                  'halo': int(interp_halo)}
+
+    return var_window
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to compute the index slice of a 1d coordinate (ascending or descending) covering a window
+def compute_var_window_slice(geo_values, geo_min, geo_max, geo_halo=1):
+
+    geo_values = np.asarray(geo_values)
+
+    idx_min = int(np.argmin(np.abs(geo_values - geo_min)))
+    idx_max = int(np.argmin(np.abs(geo_values - geo_max)))
+
+    idx_start = max(min(idx_min, idx_max) - geo_halo, 0)
+    idx_end = min(max(idx_min, idx_max) + geo_halo + 1, geo_values.shape[0])
+
+    return slice(idx_start, idx_end)
+# -------------------------------------------------------------------------------------
+
+
 # -------------------------------------------------------------------------------------
 # Method to apply interpolation method
 def apply_var_interp(var_da_in, geo_da_out, var_name=None,
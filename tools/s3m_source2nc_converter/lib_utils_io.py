@@ -156,26 +156,47 @@ def select_attrs(var_attrs_raw):
 
 
 # -------------------------------------------------------------------------------------
-# Method to create dataset
-def create_dset(var_data_values,
-                var_geo_values, var_geo_x, var_geo_y,
-                var_data_time=None,
-                var_data_name='variable', var_geo_name='terrain', var_data_attrs=None, var_geo_attrs=None,
-                var_geo_1d=False,
-                file_attributes=None,
-                coord_name_x='longitude', coord_name_y='latitude', coord_name_time='time',
-                dim_name_x='X', dim_name_y='Y', dim_name_time='time',
-                dims_order_2d=None, dims_order_3d=None):
+# Method to create the geographical data array (flipped terrain and coordinates)
+def create_darray_geo(var_geo_values, var_geo_x, var_geo_y, var_geo_name='terrain', var_geo_1d=False,
+                      coord_name_x='longitude', coord_name_y='latitude',
+                      dim_name_x='X', dim_name_y='Y', dims_order_2d=None):
+
+    if dims_order_2d is None:
+        dims_order_2d = [dim_name_y, dim_name_x]
 
     var_geo_x_tmp = var_geo_x
     var_geo_y_tmp = var_geo_y
     if var_geo_1d:
-        if (var_geo_x.shape.__len__() == 2) and (var_geo_y.shape.__len__() == 2):
+        if var_geo_x.shape.__len__() == 2:
             var_geo_x_tmp = var_geo_x[0, :]
+        if var_geo_y.shape.__len__() == 2:
             var_geo_y_tmp = var_geo_y[:, 0]
+        var_geo_coords = {coord_name_x: ([dim_name_x], var_geo_x_tmp),
+                          coord_name_y: ([dim_name_y], np.flipud(var_geo_y_tmp))}
     else:
         if (var_geo_x.shape.__len__() == 1) and (var_geo_y.shape.__len__() == 1):
             var_geo_x_tmp, var_geo_y_tmp = np.meshgrid(var_geo_x, var_geo_y)
+        var_geo_coords = {coord_name_x: ([dim_name_y, dim_name_x], var_geo_x_tmp),
+                          coord_name_y: ([dim_name_y, dim_name_x], np.flipud(var_geo_y_tmp))}
+
+    var_da_geo = xr.DataArray(np.flipud(var_geo_values), name=var_geo_name,
+                              dims=dims_order_2d, coords=var_geo_coords)
+
+    return var_da_geo
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to create dataset
+def create_dset(var_data_values,
+                var_geo_values, var_geo_x, var_geo_y,
+                var_data_time=None,
+                var_data_name='variable', var_geo_name='terrain', var_data_attrs=None, var_geo_attrs=None,
+                var_geo_1d=False, var_geo_da=None, var_geo_write=True,
+                file_attributes=None,
+                coord_name_x='longitude', coord_name_y='latitude', coord_name_time='time',
+                dim_name_x='X', dim_name_y='Y', dim_name_time='time',
+                dims_order_2d=None, dims_order_3d=None):
 
     if dims_order_2d is None:
         dims_order_2d = [dim_name_y, dim_name_x]
@@ -197,27 +218,34 @@ def create_dset(var_data_values,
         if isinstance(file_attributes, dict):
             var_dset.attrs = file_attributes
 
-    var_da_terrain = xr.DataArray(np.flipud(var_geo_values),  name=var_geo_name,
-                                  dims=dims_order_2d,
-                                  coords={coord_name_x: ([dim_name_y, dim_name_x], var_geo_x_tmp),
-                                          coord_name_y: ([dim_name_y, dim_name_x], np.flipud(var_geo_y_tmp))})
-    var_dset[var_geo_name] = var_da_terrain
-    var_geo_attrs_select = select_attrs(var_geo_attrs)
+    # Use the geographical data array (if previously computed) to avoid flipping terrain and coords for each call
+    if var_geo_da is None:
+        var_geo_da = create_darray_geo(
+            var_geo_values, var_geo_x, var_geo_y, var_geo_name=var_geo_name, var_geo_1d=var_geo_1d,
+            coord_name_x=coord_name_x, coord_name_y=coord_name_y,
+            dim_name_x=dim_name_x, dim_name_y=dim_name_y, dims_order_2d=dims_order_2d)
+    var_da_terrain = var_geo_da
+
+    var_geo_coords = {
+        coord_name_x: (var_da_terrain[coord_name_x].dims, var_da_terrain[coord_name_x].values),
+        coord_name_y: (var_da_terrain[coord_name_y].dims, var_da_terrain[coord_name_y].values)}
 
-    if var_geo_attrs_select is not None:
-        var_dset[var_geo_name].attrs = var_geo_attrs_select
+    if var_geo_write:
+        var_dset[var_geo_name] = var_da_terrain.copy(deep=False)
+        var_geo_attrs_select = select_attrs(var_geo_attrs)
+
+        if var_geo_attrs_select is not None:
+            var_dset[var_geo_name].attrs = var_geo_attrs_select
 
     if var_data_values.shape.__len__() == 2:
         var_da_data = xr.DataArray(np.flipud(var_data_values), name=var_data_name,
                                    dims=dims_order_2d,
-                                   coords={coord_name_x: ([dim_name_y, dim_name_x], var_geo_x_tmp),
-                                           coord_name_y: ([dim_name_y, dim_name_x], np.flipud(var_geo_y_tmp))})
+                                   coords=var_geo_coords)
     elif var_data_values.shape.__len__() == 3:
+        var_geo_coords[coord_name_time] = ([dim_name_time], var_data_time)
         var_da_data = xr.DataArray(np.flipud(var_data_values), name=var_data_name,
                                    dims=dims_order_3d,
-                                   coords={coord_name_time: ([dim_name_time], var_data_time),
-                                           coord_name_x: ([dim_name_y, dim_name_x], var_geo_x_tmp),
-                                           coord_name_y: ([dim_name_y, dim_name_x], np.flipud(var_geo_y_tmp))})
+                                   coords=var_geo_coords)
     else:
         raise NotImplemented
 
@@ -249,7 +277,7 @@ def create_dset(var_data_values,
 def write_dset(file_name,
                dset_data, dset_attrs=None,
                dset_mode='w', dset_engine='h5netcdf', dset_compression=0, dset_format='NETCDF4',
-               dim_key_time='time', fill_data=-9999.0, dset_type='float32'):
+               dim_key_time='time', fill_data=-9999.0, dset_type='float32', dset_chunk_time=False):
 
     #dset_encoded = dict(zlib=True, complevel=dset_compression, _FillValue=fill_data, dtype=dset_type)
     dset_encoded = dict(zlib=True, complevel=dset_compression, dtype=dset_type)
@@ -267,6 +295,11 @@ def write_dset(file_name,
         if len(var_data.dims) > 0:
             dset_encoding[var_name] = deepcopy(dset_encoded)
 
+            # Chunk time-dependent variable(s) as (1, ny, nx) to write/read one time step at once
+            if dset_chunk_time and (dim_key_time in var_data.dims):
+                dset_encoding[var_name]['chunksizes'] = tuple(
+                    [1 if var_dim == dim_key_time else var_data.sizes[var_dim] for var_dim in var_data.dims])
+
         if var_attrs:
             for attr_key, attr_value in var_attrs.items():
                 if attr_key in attrs_decoded:
@@ -285,11 +318,86 @@ def write_dset(file_name,
     if dim_key_time in list(dset_data.coords):
         dset_encoding[dim_key_time] = {'calendar': 'gregorian'}
 
+    dset_unlimited_dims = None
+    if dset_chunk_time and (dim_key_time in list(dset_data.dims)):
+        dset_unlimited_dims = [dim_key_time]
+
     dset_data.to_netcdf(path=file_name, format=dset_format, mode=dset_mode, engine=dset_engine,
-                        encoding=dset_encoding)
+                        encoding=dset_encoding, unlimited_dims=dset_unlimited_dims)
+
+# -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+# Method to define the compressor of zarr store(s) (fast lz4 blosc compressor)
+def define_zarr_compressor(compressor_name='lz4', compressor_level=5):
+
+    import zarr
+
+    if int(zarr.__version__.split('.')[0]) >= 3:
+        from zarr.codecs import BloscCodec
+        return 'compressors', (BloscCodec(cname=compressor_name, clevel=compressor_level, shuffle='shuffle'),)
+    else:
+        from numcodecs import Blosc
+        return 'compressor', Blosc(cname=compressor_name, clevel=compressor_level, shuffle=Blosc.SHUFFLE)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to write dataset in a zarr store (appending along time the step(s) not already stored)
+def write_dset_zarr(store_name, dset_data,
+                    dim_key_time='time', dset_chunk_time=24, fill_data=-9999.0, dset_type='float32',
+                    dset_compressor='lz4', dset_compression=5):
+
+    dset_data = dset_data.sortby(dim_key_time).transpose(dim_key_time, ...)
+
+    if os.path.exists(store_name):
+
+        # Select the time step(s) not available in the store
+        with xr.open_zarr(store_name) as store_handle:
+            store_time = store_handle[dim_key_time].values
+        time_mask = ~np.isin(dset_data[dim_key_time].values, store_time)
+        if not np.any(time_mask):
+            return 0
+        dset_data = dset_data.isel({dim_key_time: time_mask})
+
+        # Time step(s) are appended only after the last stored step (time axis of the store must be monotonic)
+        if (store_time.size > 0) and (dset_data[dim_key_time].values.min() <= store_time.max()):
+            time_before = dset_data[dim_key_time].values[dset_data[dim_key_time].values <= store_time.max()]
+            log_stream.error(' ===> Time steps from "' + str(pd.Timestamp(time_before.min())) + '" to "' +
+                             str(pd.Timestamp(time_before.max())) + '" are not in the store "' + store_name +
+                             '" and are before its last time step "' + str(pd.Timestamp(store_time.max())) +
+                             '". Steps can be appended only after the last stored step')
+            raise IOError('Check the time period or remove the store "' + store_name + '"')
+
+        # Variable(s) and coord(s) without time are written only when the store is created
+        var_list_static = [var_name for var_name in dset_data.variables
+                           if dim_key_time not in dset_data[var_name].dims]
+        dset_data = dset_data.drop_vars(var_list_static)
+
+        dset_data.to_zarr(store_name, mode='a', append_dim=dim_key_time)
+
+    else:
+
+        compressor_key, compressor_obj = define_zarr_compressor(dset_compressor, dset_compression)
+
+        dset_encoding = {}
+        for var_name in dset_data.data_vars:
+            var_data = dset_data[var_name]
+            dset_encoding[var_name] = {compressor_key: compressor_obj}
+            if dim_key_time in var_data.dims:
+                dset_encoding[var_name]['dtype'] = dset_type
+                dset_encoding[var_name]['_FillValue'] = fill_data
+                dset_encoding[var_name]['chunks'] = tuple(
+                    [dset_chunk_time if var_dim == dim_key_time else var_data.sizes[var_dim]
+                     for var_dim in var_data.dims])
+        dset_encoding[dim_key_time] = {'calendar': 'gregorian', 'chunks': (dset_chunk_time,)}
 
+        dset_data.to_zarr(store_name, mode='w-', encoding=dset_encoding)
+
+    return dset_data[dim_key_time].size
 # -------------------------------------------------------------------------------------
 
+
 # -------------------------------------------------------------------------------------
 # Method to create a tmp name
 def create_filename_tmp(prefix='tmp_', suffix='.tiff', folder=None):
@@ -317,8 +425,9 @@ def read_obj(file_name):
 # -------------------------------------------------------------------------------------
 # Method to write data obj
 def write_obj(file_name, data):
-    if os.path.exists(file_name):
-        os.remove(file_name)
-    with open(file_name, 'wb') as handle:
+    # Write a temporary file and rename it (an interrupted run never leaves a partial file)
+    file_name_tmp = file_name + '.tmp'
+    with open(file_name_tmp, 'wb') as handle:
         pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(file_name_tmp, file_name)
 # -------------------------------------------------------------------------------------
@@ -0,0 +1,151 @@
+"""
+Library Features:
+
+Name:          lib_utils_prefetch
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+#######################################################################################
+# Library
+import logging
+import os
+import gzip
+import shutil
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from lib_info_args import logger_name, zip_extension
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+#######################################################################################
+
+
+# -------------------------------------------------------------------------------------
+# Method to stage a source file in a local folder (only zipped file(s) are unzipped; plain file(s) are read in place
+# and the source path is returned)
+def stage_file(file_path_src, folder_tmp, file_compression=False, file_prefix=None, buffer_size=1024 * 1024):
+
+    if not os.path.exists(file_path_src):
+        return None
+
+    folder_name_src, file_name_src = os.path.split(file_path_src)
+    if not (file_compression and file_name_src.endswith(zip_extension)):
+        return file_path_src
+
+    file_name_dst = file_name_src[:-len(zip_extension)]
+    if file_prefix is not None:
+        file_name_dst = file_prefix + '_' + file_name_dst
+    file_path_dst = os.path.join(folder_tmp, file_name_dst)
+
+    with gzip.open(file_path_src, 'rb') as file_handle_src, open(file_path_dst, 'wb') as file_handle_dst:
+        shutil.copyfileobj(file_handle_src, file_handle_dst, buffer_size)
+
+    return file_path_dst
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Class to prefetch source file(s) in background thread(s)
+class FilePrefetcher:
+
+    # -------------------------------------------------------------------------------------
+    # Initialize class
+    def __init__(self, file_path_list, folder_tmp, file_compression=False, queue_depth=4):
+
+        self.file_path_list = file_path_list
+        self.folder_tmp = folder_tmp
+        self.file_compression = file_compression
+
+        self.queue_depth = max(int(queue_depth), 1)
+
+        self.executor = ThreadPoolExecutor(max_workers=self.queue_depth)
+        self.futures = {}
+        self.idx_next = 0
+
+        # Metrics
+        self.file_n = 0
+        self.file_bytes = 0
+        self.time_io = 0.0
+        self.time_wait = 0.0
+
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to stage a file (executed by worker thread)
+    def stage(self, file_idx):
+
+        file_path_src = self.file_path_list[file_idx]
+
+        time_start = time.time()
+        file_path_stage = stage_file(file_path_src, self.folder_tmp,
+                                     file_compression=self.file_compression, file_prefix=str(file_idx))
+        time_io = time.time() - time_start
+
+        file_bytes = 0
+        if (file_path_stage is not None) and (file_path_stage != file_path_src):
+            file_bytes = os.path.getsize(file_path_src)
+
+        return file_path_stage, file_bytes, time_io
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to submit file(s) up to the queue depth
+    def submit(self, file_idx_end):
+
+        file_idx_end = min(file_idx_end, self.file_path_list.__len__())
+        while self.idx_next < file_idx_end:
+            self.futures[self.idx_next] = self.executor.submit(self.stage, self.idx_next)
+            self.idx_next += 1
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to get a staged file (waiting for it if needed)
+    def get(self, file_idx):
+
+        self.submit(file_idx + 1 + self.queue_depth)
+
+        if file_idx not in list(self.futures.keys()):
+            log_stream.error(' ===> File index "' + str(file_idx) + '" was not submitted or was previously used')
+            raise IndexError('File index not available in the prefetch queue')
+
+        time_start = time.time()
+        file_path_stage, file_bytes, time_io = self.futures.pop(file_idx).result()
+        self.time_wait += time.time() - time_start
+
+        if (file_path_stage is not None) and (file_path_stage != self.file_path_list[file_idx]):
+            self.file_n += 1
+            self.file_bytes += file_bytes
+            self.time_io += time_io
+
+        return file_path_stage
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to get the prefetch metrics
+    def get_metrics(self):
+        return {'file_n': self.file_n, 'file_bytes': self.file_bytes,
+                'time_io': round(self.time_io, 3), 'time_wait': round(self.time_wait, 3)}
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to close the prefetcher (removing the staged file(s) not used)
+    def close(self):
+
+        for file_idx, file_future in self.futures.items():
+            file_future.cancel()
+        self.executor.shutdown(wait=True)
+
+        for file_idx, file_future in self.futures.items():
+            if (not file_future.cancelled()) and (file_future.exception() is None):
+                file_path_stage = file_future.result()[0]
+                if (file_path_stage is not None) and (file_path_stage != self.file_path_list[file_idx]):
+                    if os.path.exists(file_path_stage):
+                        os.remove(file_path_stage)
+        self.futures = {}
+    # -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
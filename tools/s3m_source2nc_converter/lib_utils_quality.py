@@ -19,7 +19,6 @@ import tempfile
 import pandas as pd
 import xarray as xr
 import numpy as np
-import matplotlib.pyplot as plt
 
 from copy import deepcopy
 
@@ -33,45 +32,62 @@ log_stream = logging.getLogger(logger_name)
 # -------------------------------------------------------------------------------------
 
 # -------------------------------------------------------------------------------------
-# Method to compute quality
-def compute_SQA(data_array, data_array_geo,
-                    list_flags_valid = None):
+# Method to compute the geographical mask used by quality
+def compute_mask_geo(data_array_geo, geo_threshold=0):
+    return np.asarray(data_array_geo) > geo_threshold
+# -------------------------------------------------------------------------------------
+
 
-    data_array = data_array[:,:,0]
-    log_stream.warning(' ===> data_array flattened to 2d array in compute_SQA')
+# -------------------------------------------------------------------------------------
+# Method to compute quality scalar(s) (2d array --> scalar; 3d array [y, x, time] --> one scalar for each time)
+def compute_SQA_scalar(data_array, data_array_geo=None, list_flags_valid=None, data_mask_geo=None):
 
     # set list_flags_valid to default is it's None
     if list_flags_valid is None:
         list_flags_valid = [0, 1]
         log_stream.warning(' ===> list_flags_valid for quality computation set to default')
 
-    # mask based on geo
-    mask = data_array_geo > 0
-
-    # count list_flags_valid
-    count_all = 0
-    for flags in list_flags_valid:
-
-        count_this_flag =  np.count_nonzero((data_array == flags) & mask)
-        count_all = count_all + count_this_flag
+    # mask based on geo (computed once by the caller if available)
+    if data_mask_geo is None:
+        if data_array_geo is None:
+            log_stream.error(' ===> Geographical array or mask must be defined to compute quality')
+            raise IOError('Geographical reference not available')
+        data_mask_geo = compute_mask_geo(data_array_geo)
 
     # count valid pixels
-    count_valid = np.count_nonzero(mask)
+    count_valid = np.count_nonzero(data_mask_geo)
+
+    # count list_flags_valid (all flags and time steps in one pass)
+    data_flags = np.isin(data_array, list_flags_valid)
+    if data_flags.ndim == 3:
+        data_flags &= data_mask_geo[:, :, np.newaxis]
+        count_all = np.count_nonzero(data_flags, axis=(0, 1))
+    elif data_flags.ndim == 2:
+        data_flags &= data_mask_geo
+        count_all = np.count_nonzero(data_flags)
+    else:
+        log_stream.error(' ===> Quality is computed only for 2d or 3d arrays')
+        raise NotImplementedError('Case not implemented yet')
+
+    if count_valid > 0:
+        SQA_scalar = count_all / count_valid
+    else:
+        log_stream.warning(' ===> Geographical mask has no valid pixels. Quality set to NaN')
+        SQA_scalar = np.full(np.shape(count_all), np.nan)
+
+    return SQA_scalar
+# -------------------------------------------------------------------------------------
 
-    SQA_scalar = count_all/count_valid
-    SQA_map = np.zeros(data_array.shape) + SQA_scalar
 
-    # plt.figure(1)
-    # plt.imshow(data_array_geo)
-    # plt.colorbar()
-    # plt.figure(2)
-    # plt.imshow(mask)
-    # plt.figure(3)
-    # plt.imshow(data_array)
-    # plt.colorbar()
-    # plt.show()
+# -------------------------------------------------------------------------------------
+# Method to compute quality map (scalar(s) broadcasted to the array shape without allocating a full map)
+def compute_SQA(data_array, data_array_geo=None, list_flags_valid=None, data_mask_geo=None, var_type='float32'):
 
-    return SQA_map
+    data_array = np.asarray(data_array)
 
+    SQA_scalar = compute_SQA_scalar(data_array, data_array_geo,
+                                    list_flags_valid=list_flags_valid, data_mask_geo=data_mask_geo)
+    SQA_map = np.broadcast_to(np.asarray(SQA_scalar, dtype=var_type), data_array.shape)
 
+    return SQA_map
 # -------------------------------------------------------------------------------------
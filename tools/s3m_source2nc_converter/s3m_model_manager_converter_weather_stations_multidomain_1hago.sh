@@ -9,6 +9,7 @@ script_date='2021/06/07'
 virtualenv_folder='/home/fp_virtualenv_python3/'
 virtualenv_name='fp_virtualenv_python3_hyde_libraries'
 script_folder='/home/fp-s3m/tools/s3m_source2nc_converter/'
+s3m_tools_folder='/home/fp-s3m/tools/s3m_tools/' # shared library (not needed if installed with pip)
 
 # Domain list
 domain_name_list=("Valle_Aosta" "Piemonte")
@@ -38,7 +39,7 @@ export PATH=$virtualenv_folder/bin:$PATH
 source activate $virtualenv_name
 
 # Add path to pythonpath
-export PYTHONPATH="${PYTHONPATH}:$script_folder"
+export PYTHONPATH="${PYTHONPATH}:$script_folder:$s3m_tools_folder"
 #-----------------------------------------------------------------------------------------
 
 # ----------------------------------------------------------------------------------------
@@ -24,9 +24,10 @@ import logging
 import os
 import argparse
 import time
-import matplotlib.pyplot as plt
 
 from lib_utils_logging import set_logging_file
+from lib_utils_profiling import start_profiling, stop_profiling
+from lib_utils_system import fill_tags2string
 from lib_utils_time import set_time
 from lib_data_io_json import read_file_settings
 from lib_info_args import logger_name, time_format_algorithm
@@ -81,9 +82,24 @@ def main():
 
     # Time algorithm information
     alg_time_start = time.time()
+
+    # Profiling of the run (timers, counters and optional capture)
+    profiling_settings = data_settings.get('profiling', None)
+    if profiling_settings is not None:
+        for profiling_key in ['report_file', 'capture_file']:
+            if profiling_settings.get(profiling_key, None) is not None:
+                profiling_settings[profiling_key] = fill_tags2string(
+                    profiling_settings[profiling_key],
+                    data_settings['algorithm']['template'], data_settings['algorithm']['ancillary'])
+    profiler = start_profiling(profiling_settings)
     # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
+    # Organize time chunk(s) (one multi-time destination file per chunk if "file_time_chunk" is set)
+    time_chunk = data_settings['data']['dynamic']['destination'].get('file_time_chunk', None)
+    if time_chunk is None:
+        time_chunk = 'D'
+
     # Organize time run
     time_run, time_range, time_chunks = set_time(
         time_run_args=alg_time,
@@ -94,7 +110,8 @@ def main():
         time_period=data_settings['time']['time_period'],
         time_frequency=data_settings['time']['time_frequency'],
         time_rounding=data_settings['time']['time_rounding'],
-        time_reverse=data_settings['time']['time_reverse']
+        time_reverse=data_settings['time']['time_reverse'],
+        time_chunk=time_chunk
     )
     # -------------------------------------------------------------------------------------
 
@@ -105,7 +122,8 @@ def main():
         dst_dict=data_settings['data']['static']['destination'],
         alg_template_tags=data_settings['algorithm']['template']
     )
-    static_data_collection = driver_data_static.organize_static(data_settings)
+    with profiler.timer('static'):
+        static_data_collection = driver_data_static.organize_static(data_settings)
     # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
@@ -124,17 +142,32 @@ def main():
             alg_template_tags=data_settings['algorithm']['template'],
             flag_cleaning_dynamic_data=data_settings['algorithm']['flags']['cleaning_dynamic_data'],
             flag_cleaning_dynamic_ancillary=data_settings['algorithm']['flags']['cleaning_dynamic_ancillary'],
-            flag_cleaning_dynamic_tmp=data_settings['algorithm']['flags']['cleaning_dynamic_tmp'])
-
-        driver_data_dynamic.organize_dynamic_data()
-        driver_data_dynamic.dump_dynamic_data()
-        driver_data_dynamic.clean_dynamic_tmp()
+            flag_cleaning_dynamic_tmp=data_settings['algorithm']['flags']['cleaning_dynamic_tmp'],
+            flag_prefetch_dynamic_source=data_settings['algorithm']['flags'].get('prefetch_dynamic_source', False),
+            flag_resume_dynamic_ancillary=data_settings['algorithm']['flags'].get('resume_dynamic_ancillary', False),
+            readiness_settings=data_settings.get('readiness', None))
+
+        with profiler.timer('dynamic_wait'):
+            source_ready = driver_data_dynamic.wait_dynamic_source()
+        if not source_ready:
+            # Source file(s) not ready (missing or still written) are not read; the chunk is done by a next run
+            log_stream.warning(' ===> Source files of time chunk "' + str(time_reference) +
+                               '" are not ready. Time chunk is skipped')
+            continue
+        with profiler.timer('dynamic_organize'):
+            driver_data_dynamic.organize_dynamic_data()
+        with profiler.timer('dynamic_dump'):
+            driver_data_dynamic.dump_dynamic_data()
+        with profiler.timer('dynamic_clean'):
+            driver_data_dynamic.clean_dynamic_tmp()
         # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
     # Info algorithm
     alg_time_elapsed = round(time.time() - alg_time_start, 1)
 
+    stop_profiling(profiling_settings)
+
     logging.info(' ')
     logging.info('[' + project_name + ' ' + alg_type + ' - ' + alg_name + ' (Version ' + alg_version +
                  ' - Release ' + alg_release + ')]')
@@ -193,41 +226,6 @@ def get_args():
 # -------------------------------------------------------------------------------------
 
 
-# -------------------------------------------------------------------------------------
-# Method to set logging information
-def set_logging(logger_file='log.txt', logger_format=None):
-    if logger_format is None:
-        logger_format = '%(asctime)s %(name)-12s %(levelname)-8s ' \
-                        '%(filename)s:[%(lineno)-6s - %(funcName)20s()] %(message)s'
-
-    # Remove old logging file
-    if os.path.exists(logger_file):
-        os.remove(logger_file)
-
-    # Set level of root debugger
-    logging.root.setLevel(logging.DEBUG)
-
-    # Open logging basic configuration
-    logging.basicConfig(level=logging.DEBUG, format=logger_format, filename=logger_file, filemode='w')
-
-    # Set logger handle
-    logger_handle_1 = logging.FileHandler(logger_file, 'w')
-    logger_handle_2 = logging.StreamHandler()
-    # Set logger level
-    logger_handle_1.setLevel(logging.DEBUG)
-    logger_handle_2.setLevel(logging.DEBUG)
-    # Set logger formatter
-    logger_formatter = logging.Formatter(logger_format)
-    logger_handle_1.setFormatter(logger_formatter)
-    logger_handle_2.setFormatter(logger_formatter)
-
-    # Add handle to logging
-    logging.getLogger('').addHandler(logger_handle_1)
-    logging.getLogger('').addHandler(logger_handle_2)
-
-# -------------------------------------------------------------------------------------
-
-
 # -------------------------------------------------------------------------------------
 # Call script from external library
 if __name__ == "__main__":
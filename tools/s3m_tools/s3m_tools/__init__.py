@@ -0,0 +1,49 @@
+"""
+S3M Tools - Common library
+__date__ = '20261019'
+__version__ = '1.0.0'
+__author__ =
+        'Francesco Avanzi (francesco.avanzi@cimafoundation.org',
+        Fabio Delogu (fabio.delogu@cimafoundation.org)
+__library__ = 's3m'
+
+Helpers shared by s3m_runner, s3m_source2nc_converter, s3m_merger and output2nc_converter.
+
+The helpers are re-exported lazily: a module (and its dependencies, e.g. pandas or xarray) is imported only when
+one of its helpers is used, so the tools do not pay the import of the modules they do not need.
+"""
+
+import importlib
+
+__version__ = '1.0.0'
+
+# Re-exported helper(s) by module
+lazy_exports = {
+    'lib_utils_string': ['fill_tags2string', 'fill_tags2string_range'],
+    'lib_utils_template': ['compile_template', 'TemplateString'],
+    'lib_utils_gzip': ['unzip_filename', 'zip_filename'],
+    'lib_utils_time': ['set_time', 'set_chunks'],
+    'lib_utils_geo': ['read_file_raster', 'create_darray_2d', 'create_darray_3d'],
+    'lib_utils_readiness': ['define_file_list', 'check_files_ready', 'wait_files_ready'],
+    'lib_utils_retention': ['FileIndex', 'select_retention', 'apply_retention'],
+    'lib_utils_logging': ['set_logging', 'set_logging_file', 'store_logging_file'],
+    'lib_utils_profiling': ['Profiler', 'get_profiler', 'start_profiling', 'stop_profiling'],
+    'lib_utils_debug': ['LazyPlot', 'plt'],
+}
+lazy_modules = {attr_name: module_name for module_name, attr_list in lazy_exports.items() for attr_name in attr_list}
+
+__all__ = sorted(lazy_modules.keys())
+
+
+# Method to import a re-exported helper on first use
+def __getattr__(attr_name):
+    if attr_name not in lazy_modules:
+        raise AttributeError("module '" + __name__ + "' has no attribute '" + attr_name + "'")
+    attr_value = getattr(importlib.import_module('.' + lazy_modules[attr_name], __name__), attr_name)
+    globals()[attr_name] = attr_value
+    return attr_value
+
+
+# Method to list the module attribute(s) (re-exported helpers included)
+def __dir__():
+    return sorted(list(globals().keys()) + __all__)
@@ -0,0 +1,18 @@
+"""
+Library Features:
+
+Name:          lib_info_args
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+# -------------------------------------------------------------------------------------
+# Logging information
+logger_name = 's3m_tools_logger'
+logger_format = '%(asctime)s %(name)-12s %(levelname)-8s ' \
+                '%(filename)s:[%(lineno)-6s - %(funcName)20s()] %(message)s'
+
+# Buffer size of the gzip streaming [bytes]
+zip_buffer_size = 1024 * 1024
+# -------------------------------------------------------------------------------------
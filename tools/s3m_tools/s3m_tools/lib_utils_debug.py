@@ -0,0 +1,58 @@
+"""
+Library Features:
+
+Name:          lib_utils_debug
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+#######################################################################################
+# Libraries
+import logging
+import os
+import importlib
+
+from .lib_info_args import logger_name
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+#######################################################################################
+
+
+# -------------------------------------------------------------------------------------
+# Method to load the plotting module (matplotlib is optional; non-interactive backend without display)
+def load_plot_module(module_name='matplotlib.pylab'):
+
+    try:
+        import matplotlib
+    except ImportError:
+        log_stream.error(' ===> Debug plot needs the optional library "matplotlib"')
+        raise ImportError('Library "matplotlib" is not available')
+
+    if os.environ.get('DISPLAY', '') == '':
+        matplotlib.use('Agg')
+
+    return importlib.import_module(module_name)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Class to access the plotting module on first use (debug plots do not slow down the startup)
+class LazyPlot:
+
+    def __init__(self, module_name='matplotlib.pylab'):
+        self.module_name = module_name
+        self.module_obj = None
+
+    def __getattr__(self, attr_name):
+        if self.module_obj is None:
+            self.module_obj = load_plot_module(self.module_name)
+        return getattr(self.module_obj, attr_name)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Plotting module used by the debug code (for example plt.imshow(values); plt.savefig('debug.png'))
+plt = LazyPlot()
+# -------------------------------------------------------------------------------------
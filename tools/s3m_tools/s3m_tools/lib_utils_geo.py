@@ -0,0 +1,176 @@
+"""
+Library Features:
+
+Name:          lib_utils_geo
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+#######################################################################################
+# Library
+import logging
+import os
+import numpy as np
+
+from .lib_info_args import logger_name
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+logging.getLogger('rasterio').setLevel(logging.WARNING)
+#######################################################################################
+
+
+# -------------------------------------------------------------------------------------
+# Method to create a data array
+def create_darray_3d(data, time, geo_x, geo_y, geo_1d=True,
+                     coord_name_x='west_east', coord_name_y='south_north', coord_name_time='time',
+                     dim_name_x='west_east', dim_name_y='south_north', dim_name_time='time',
+                     dims_order=None):
+
+    # Xarray is imported on first use (startup of the tool)
+    import xarray as xr
+
+    if dims_order is None:
+        dims_order = [dim_name_y, dim_name_x, dim_name_time]
+
+    if geo_1d:
+        if geo_x.shape.__len__() == 2:
+            geo_x = geo_x[0, :]
+        if geo_y.shape.__len__() == 2:
+            geo_y = geo_y[:, 0]
+
+        data_da = xr.DataArray(data,
+                               dims=dims_order,
+                               coords={coord_name_time: (dim_name_time, time),
+                                       coord_name_x: (dim_name_x, geo_x),
+                                       coord_name_y: (dim_name_y, geo_y)})
+    else:
+        log_stream.error(' ===> Longitude and Latitude must be 1d')
+        raise IOError('Variable shape is not valid')
+
+    return data_da
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to create a data array
+def create_darray_2d(data, geo_x, geo_y, geo_1d=True, name='geo',
+                     coord_name_x='west_east', coord_name_y='south_north',
+                     dim_name_x='west_east', dim_name_y='south_north',
+                     dims_order=None):
+
+    # Xarray is imported on first use (startup of the tool)
+    import xarray as xr
+
+    if dims_order is None:
+        dims_order = [dim_name_y, dim_name_x]
+
+    if geo_1d:
+        if geo_x.shape.__len__() == 2:
+            geo_x = geo_x[0, :]
+        if geo_y.shape.__len__() == 2:
+            geo_y = geo_y[:, 0]
+
+        data_da = xr.DataArray(data,
+                               dims=dims_order,
+                               coords={coord_name_x: (dim_name_x, geo_x),
+                                       coord_name_y: (dim_name_y, geo_y)},
+                               name=name)
+        data_da.name = name
+    else:
+        log_stream.error(' ===> Longitude and Latitude must be 1d')
+        raise IOError('Variable shape is not valid')
+
+    return data_da
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get a raster file (ascii or tiff)
+def read_file_raster(file_name, file_proj='epsg:4326', var_name='land',
+                     coord_name_x='west_east', coord_name_y='south_north',
+                     dim_name_x='west_east', dim_name_y='south_north', no_data_default=-9999.0, scale_factor=1,
+                     decimal_round=7):
+
+    # Rasterio is imported on first use (startup of the tool)
+    import rasterio
+    import rasterio.coords
+    import rasterio.transform
+    from rasterio.enums import Resampling
+
+    if os.path.exists(file_name):
+        if (file_name.endswith('.txt') or file_name.endswith('.asc')) or file_name.endswith('.tif'):
+
+            # File is opened read-only (first band only)
+            with rasterio.open(file_name, mode='r') as dset:
+
+                if scale_factor == 1:
+                    values = dset.read(1)
+                    transform = dset.transform
+                else:
+                    # resample data to target
+                    # source: https://rasterio.readthedocs.io/en/latest/topics/resampling.html
+                    values = dset.read(
+                        1,
+                        out_shape=(int(dset.height * scale_factor), int(dset.width * scale_factor)),
+                        resampling=Resampling.mode
+                    )
+                    # scale image transform
+                    transform = dset.transform * dset.transform.scale(
+                        (dset.width / values.shape[-1]),
+                        (dset.height / values.shape[-2])
+                    )
+
+                # Get ancillary info
+                crs = dset.crs
+                proj = dset.crs.wkt
+                bounds = rasterio.transform.array_bounds(values.shape[-2], values.shape[-1], transform)
+                bounds = rasterio.coords.BoundingBox(bounds[0], bounds[1], bounds[2], bounds[3])
+                no_data = dset.nodata
+                # resolution from the delta_x in the transform, assuming delta_x and delta_y are the same
+                res = (abs(transform.a), abs(transform.e))
+
+            # Define no data if none or nan
+            if (no_data is None) or (np.isnan(no_data)):
+                no_data = no_data_default
+
+            center_right = bounds.right - (res[0] / 2)
+            center_left = bounds.left + (res[0] / 2)
+            center_top = bounds.top - (res[1] / 2)
+            center_bottom = bounds.bottom + (res[1] / 2)
+
+            # Coordinates are 1d (the 2d grid is not needed by the data array)
+            lon = np.arange(center_left, center_right + np.abs(res[0] / 2), np.abs(res[0]), float)
+            lat = np.flip(np.arange(center_bottom, center_top + np.abs(res[0] / 2), np.abs(res[1]), float), axis=0)
+
+            if center_bottom > center_top:
+                center_bottom, center_top = center_top, center_bottom
+                values = np.flipud(values)
+                lat = np.flipud(lat)
+
+            min_lon_round = round(np.min(lon), decimal_round)
+            max_lon_round = round(np.max(lon), decimal_round)
+            min_lat_round = round(np.min(lat), decimal_round)
+            max_lat_round = round(np.max(lat), decimal_round)
+
+            assert min_lon_round == round(center_left, decimal_round)
+            assert max_lon_round == round(center_right, decimal_round)
+            assert min_lat_round == round(center_bottom, decimal_round)
+            assert max_lat_round == round(center_top, decimal_round)
+
+            high, wide = values.shape
+            bounding_box = [min_lon_round, max_lat_round, max_lon_round, min_lat_round]
+
+            da = create_darray_2d(values, lon, lat, coord_name_x=coord_name_x, coord_name_y=coord_name_y,
+                                  dim_name_x=dim_name_x, dim_name_y=dim_name_y, name=var_name)
+
+        else:
+            log_stream.error(' ===> Geographical file ' + file_name + ' format unknown')
+            raise NotImplementedError('File type reader not implemented yet')
+    else:
+        log_stream.error(' ===> Geographical file ' + file_name + ' not found')
+        raise IOError('Geographical file location or name is wrong')
+
+    return da, wide, high, proj, transform, bounding_box, no_data, crs
+# -------------------------------------------------------------------------------------
@@ -0,0 +1,39 @@
+"""
+Library Features:
+
+Name:          lib_utils_gzip
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+#################################################################################
+# Library
+import logging
+import gzip
+import shutil
+
+from .lib_info_args import logger_name, zip_buffer_size
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+#################################################################################
+
+
+# --------------------------------------------------------------------------------
+# Method to unzip file (streamed by blocks; the file is not loaded in memory)
+def unzip_filename(file_name_zip, file_name_unzip, buffer_size=zip_buffer_size):
+
+    with gzip.open(file_name_zip, 'rb') as file_handle_zip:
+        with open(file_name_unzip, 'wb') as file_handle_unzip:
+            shutil.copyfileobj(file_handle_zip, file_handle_unzip, buffer_size)
+# --------------------------------------------------------------------------------
+
+
+# --------------------------------------------------------------------------------
+# Method to zip file (streamed by blocks)
+def zip_filename(file_name_unzip, file_name_zip, buffer_size=zip_buffer_size, compression_level=9):
+
+    with open(file_name_unzip, 'rb') as file_handle_unzip:
+        with gzip.open(file_name_zip, 'wb', compresslevel=compression_level) as file_handle_zip:
+            shutil.copyfileobj(file_handle_unzip, file_handle_zip, buffer_size)
+# --------------------------------------------------------------------------------
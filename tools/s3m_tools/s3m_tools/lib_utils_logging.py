@@ -0,0 +1,147 @@
+"""
+Library Features:
+
+Name:          lib_utils_logging
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+#######################################################################################
+# Library
+import logging
+import os
+import glob
+
+from .lib_info_args import logger_name, logger_format
+#######################################################################################
+
+
+# -------------------------------------------------------------------------------------
+# Method to set logging information (one file handler and one stream handler on the root logger)
+def set_logging(logger_file='log.txt', logger_format=logger_format, logger_level=logging.INFO):
+
+    # Create logging folder and remove old logging file
+    logger_folder_name = os.path.dirname(logger_file)
+    if logger_folder_name:
+        os.makedirs(logger_folder_name, exist_ok=True)
+    if os.path.exists(logger_file):
+        os.remove(logger_file)
+
+    # Set level of root debugger
+    logging.root.setLevel(logger_level)
+
+    # Set logger handle
+    logger_handle_1 = logging.FileHandler(logger_file, 'w')
+    logger_handle_2 = logging.StreamHandler()
+    # Set logger level
+    logger_handle_1.setLevel(logger_level)
+    logger_handle_2.setLevel(logger_level)
+    # Set logger formatter
+    logger_formatter = logging.Formatter(logger_format)
+    logger_handle_1.setFormatter(logger_formatter)
+    logger_handle_2.setFormatter(logger_formatter)
+    # Add handle to logging
+    logging.getLogger('').addHandler(logger_handle_1)
+    logging.getLogger('').addHandler(logger_handle_2)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to set logging file
+def set_logging_file(logger_file='log.txt', logger_name=logger_name,
+                     logger_handle='file', logger_formatter=logger_format,
+                     logger_history=False, logger_history_maxfiles=12,
+                     logger_extra_tags=None, logger_level=logging.DEBUG):
+
+    # Set to flush progressbar output in logging stream handle
+    # progressbar.streams.wrap_stderr()
+
+    if logger_extra_tags is not None:
+        for extra_key, extra_value in logger_extra_tags.items():
+            logger_file = logger_file.replace(extra_key, ':')
+            string_count = logger_file.count(':')
+            extra_value = [extra_value] * string_count
+            logger_file = logger_file.format(*extra_value)
+
+    logger_folder_name, logger_file_name = os.path.split(logger_file)
+    if logger_folder_name:
+        os.makedirs(logger_folder_name, exist_ok=True)
+
+    # Save old logger file (to check run in the past)
+    if logger_history:
+        store_logging_file(logger_file, logger_file_max=logger_history_maxfiles)
+
+    # Remove old logging file
+    if os.path.exists(logger_file):
+        os.remove(logger_file)
+
+    # Open logger
+    logging.getLogger(logger_name)
+    logging.root.setLevel(logger_level)
+
+    # Set logger handle type
+    if logger_handle == 'file':
+
+        # Set logger handler obj
+        logger_handle_1 = logging.FileHandler(logger_file, 'w')
+        logger_handle_2 = logging.StreamHandler()
+        # Set logger level
+        logger_handle_1.setLevel(logger_level)
+        logger_handle_2.setLevel(logger_level)
+        # Set logger formatter
+        logger_handle_1.setFormatter(logging.Formatter(logger_formatter))
+        logger_handle_2.setFormatter(logging.Formatter(logger_formatter))
+        # Add handle to logger
+        logging.getLogger('').addHandler(logger_handle_1)
+        logging.getLogger('').addHandler(logger_handle_2)
+
+    elif logger_handle == 'stream':
+
+        # Set logger handler obj
+        logger_handle_obj = logging.StreamHandler()
+        # Set logger level
+        logger_handle_obj.setLevel(logger_level)
+        # Set logger formatter
+        logger_handle_obj.setFormatter(logging.Formatter(logger_formatter))
+        # Add handle to logger
+        logging.getLogger('').addHandler(logger_handle_obj)
+
+    else:
+
+        # Set logger handler obj
+        logger_handle_obj = logging.NullHandler()
+        # Add handle to logger
+        logging.getLogger('').addHandler(logger_handle_obj)
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to store logging file (to save execution history)
+def store_logging_file(logger_file, logger_ext='.old.{}', logger_file_max=12):
+
+    # Get logger folder
+    logger_folder = os.path.split(logger_file)[0]
+
+    # Iterate to store old logging file
+    if os.path.exists(logger_file):
+
+        logger_file_loop = logger_file
+        logger_file_id = 0
+        while os.path.exists(logger_file_loop):
+            logger_file_id = logger_file_id + 1
+            logger_file_loop = logger_file + logger_ext.format(logger_file_id)
+
+            if logger_file_id > logger_file_max:
+                logger_file_obj = glob.glob(os.path.join(logger_folder, '*'))
+                for logger_file_step in logger_file_obj:
+                    if logger_file_step.startswith(logger_file):
+                        os.remove(logger_file_step)
+                logger_file_loop = logger_file
+                break
+
+        if logger_file_loop:
+            if logger_file != logger_file_loop:
+                os.rename(logger_file, logger_file_loop)
+# -------------------------------------------------------------------------------------
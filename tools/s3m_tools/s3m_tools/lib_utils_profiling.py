@@ -0,0 +1,212 @@
+"""
+Library Features:
+
+Name:          lib_utils_profiling
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+# -------------------------------------------------------------------------------------
+# Libraries
+import logging
+import os
+import json
+import time
+
+from contextlib import contextmanager
+
+from .lib_info_args import logger_name
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+# -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+# Profiler(s) defined in the process (one for each name)
+profiler_registry = {}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get (or create) a profiler by name
+def get_profiler(profiler_name='default'):
+    if profiler_name not in list(profiler_registry.keys()):
+        profiler_registry[profiler_name] = Profiler(profiler_name)
+    return profiler_registry[profiler_name]
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Class to collect timer(s) and counter(s) of the processing stage(s)
+class Profiler:
+
+    # -------------------------------------------------------------------------------------
+    # Initialize class
+    def __init__(self, profiler_name='default'):
+
+        self.profiler_name = profiler_name
+        self.time_start = time.time()
+
+        self.timers = {}
+        self.counters = {}
+
+        self.capture_type = None
+        self.capture_file = None
+        self.capture_obj = None
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to time a stage (context manager)
+    @contextmanager
+    def timer(self, stage_name):
+        time_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage_name, time.perf_counter() - time_start)
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to add an elapsed time to a stage
+    def add_time(self, stage_name, time_elapsed, stage_calls=1):
+        if stage_name not in list(self.timers.keys()):
+            self.timers[stage_name] = {'time': 0.0, 'calls': 0}
+        self.timers[stage_name]['time'] += time_elapsed
+        self.timers[stage_name]['calls'] += stage_calls
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to merge the timer(s) and counter(s) of another profiler (worker processes)
+    def merge(self, timers, counters):
+        for stage_name, stage_info in timers.items():
+            self.add_time(stage_name, stage_info['time'], stage_calls=stage_info['calls'])
+        for counter_name, counter_value in counters.items():
+            self.count(counter_name, counter_value)
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to update a counter (bytes read/written, files opened, ...)
+    def count(self, counter_name, counter_value=1):
+        if counter_name not in list(self.counters.keys()):
+            self.counters[counter_name] = 0
+        self.counters[counter_name] += counter_value
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to update the bytes counter of a file (if available)
+    def count_file(self, counter_name, file_name):
+        if (file_name is not None) and os.path.isfile(file_name):
+            self.count(counter_name + '_files', 1)
+            self.count(counter_name + '_bytes', os.path.getsize(file_name))
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to start the optional capture (cprofile or pyinstrument)
+    def start_capture(self, capture_type=None, capture_file=None):
+
+        if capture_type is None:
+            return
+
+        if capture_type == 'cprofile':
+            import cProfile
+            self.capture_obj = cProfile.Profile()
+            self.capture_obj.enable()
+        elif capture_type == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler as CaptureProfiler
+            except ImportError:
+                log_stream.warning(' ===> Profiling capture "pyinstrument" is not available. Capture is skipped')
+                return
+            self.capture_obj = CaptureProfiler()
+            self.capture_obj.start()
+        else:
+            log_stream.error(' ===> Profiling capture "' + str(capture_type) + '" is not allowed')
+            raise NotImplementedError('Case not implemented yet')
+
+        self.capture_type = capture_type
+        self.capture_file = capture_file
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to stop the optional capture and dump it
+    def stop_capture(self):
+
+        if self.capture_obj is None:
+            return
+
+        if self.capture_type == 'cprofile':
+            self.capture_obj.disable()
+            if self.capture_file is not None:
+                self.capture_obj.dump_stats(self.capture_file)
+        elif self.capture_type == 'pyinstrument':
+            self.capture_obj.stop()
+            if self.capture_file is not None:
+                with open(self.capture_file, 'w') as file_handle:
+                    file_handle.write(self.capture_obj.output_html())
+
+        self.capture_obj = None
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to get the report of the profiler
+    def get_report(self):
+
+        timers = {}
+        for stage_name, stage_info in self.timers.items():
+            timers[stage_name] = {'time': round(stage_info['time'], 4), 'calls': stage_info['calls']}
+
+        return {'profiler_name': self.profiler_name,
+                'time_elapsed': round(time.time() - self.time_start, 4),
+                'timers': timers, 'counters': dict(self.counters)}
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to dump the report of the profiler (json)
+    def dump_report(self, file_name):
+
+        folder_name = os.path.dirname(file_name)
+        if folder_name != '':
+            os.makedirs(folder_name, exist_ok=True)
+
+        with open(file_name, 'w') as file_handle:
+            json.dump(self.get_report(), file_handle, indent=2)
+    # -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to start the profiling from settings ({"active": bool, "capture": null|"cprofile"|"pyinstrument", ...})
+def start_profiling(profiling_settings, profiler_name='default'):
+
+    profiler_obj = get_profiler(profiler_name)
+    if profiling_settings is None:
+        return profiler_obj
+
+    if profiling_settings.get('active', False):
+        profiler_obj.start_capture(
+            capture_type=profiling_settings.get('capture', None),
+            capture_file=profiling_settings.get('capture_file', None))
+
+    return profiler_obj
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to stop the profiling and dump the report (if activated in the settings)
+def stop_profiling(profiling_settings, profiler_name='default'):
+
+    profiler_obj = get_profiler(profiler_name)
+    if profiling_settings is None:
+        return profiler_obj
+
+    if profiling_settings.get('active', False):
+        profiler_obj.stop_capture()
+        report_file = profiling_settings.get('report_file', None)
+        if report_file is not None:
+            profiler_obj.dump_report(report_file)
+            log_stream.info(' ==> Profiling report saved in "' + report_file + '"')
+
+    return profiler_obj
+# -------------------------------------------------------------------------------------
@@ -0,0 +1,223 @@
+"""
+Library Features:
+
+Name:          lib_utils_readiness
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+#######################################################################################
+# Library
+import logging
+import os
+import sys
+import time
+import select
+import struct
+import ctypes
+import ctypes.util
+
+from .lib_info_args import logger_name
+from .lib_utils_string import fill_tags2string_range
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+
+# Inotify event(s) of a file complete in a folder (written and closed or moved in) and of a folder created
+inotify_file_mask = 0x00000008 | 0x00000080  # IN_CLOSE_WRITE | IN_MOVED_TO
+inotify_mask = inotify_file_mask | 0x00000100  # IN_CREATE (folder(s) of the file(s) created while waiting)
+inotify_isdir = 0x40000000  # IN_ISDIR
+# Inotify event header (wd, mask, cookie, name length)
+inotify_event = struct.Struct('iIII')
+#######################################################################################
+
+
+# -------------------------------------------------------------------------------------
+# Class to watch folder events with inotify (linux only; available is False elsewhere)
+class FolderWatcher:
+
+    # -------------------------------------------------------------------------------------
+    # Initialize class
+    def __init__(self):
+        self.fd, self.libc, self.watches = None, None, {}
+        if not sys.platform.startswith('linux'):
+            return
+        try:
+            self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            self.fd = fd if fd >= 0 else None
+        except (OSError, AttributeError):
+            self.fd = None
+
+    @property
+    def available(self):
+        return self.fd is not None
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to watch a folder (the nearest existing parent if the folder is not available yet)
+    def watch(self, folder_name):
+        if not self.available:
+            return
+        while folder_name and (not os.path.isdir(folder_name)):
+            folder_parent = os.path.dirname(folder_name.rstrip(os.sep))
+            if folder_parent == folder_name:
+                break
+            folder_name = folder_parent
+        if (not folder_name) or (folder_name in self.watches):
+            return
+        watch_id = self.libc.inotify_add_watch(self.fd, folder_name.encode(), inotify_mask)
+        if watch_id >= 0:
+            self.watches[folder_name] = watch_id
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to read the pending event(s) (file(s) written and closed or moved in the watched folder(s))
+    def read(self):
+
+        folder_watches = {watch_id: folder_name for folder_name, watch_id in self.watches.items()}
+        file_complete = set()
+        try:
+            while True:
+                event_buffer = os.read(self.fd, 65536)
+                if not event_buffer:
+                    break
+                event_offset = 0
+                while event_offset + inotify_event.size <= len(event_buffer):
+                    watch_id, event_mask, _, name_size = inotify_event.unpack_from(event_buffer, event_offset)
+                    event_offset += inotify_event.size
+                    file_name = event_buffer[event_offset:event_offset + name_size].rstrip(b'\0').decode(
+                        errors='replace')
+                    event_offset += name_size
+                    if file_name and (event_mask & inotify_file_mask) and (not (event_mask & inotify_isdir)) and \
+                            (watch_id in folder_watches):
+                        file_complete.add(os.path.normpath(os.path.join(folder_watches[watch_id], file_name)))
+        except (BlockingIOError, OSError):
+            pass
+
+        return file_complete
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to wait an event (True and the file(s) complete) or the timeout (False)
+    def wait(self, time_wait):
+        if not self.available:
+            time.sleep(time_wait)
+            return False, set()
+        fd_ready, _, _ = select.select([self.fd], [], [], time_wait)
+        if fd_ready:
+            return True, self.read()
+        return False, set()
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to close the watcher
+    def close(self):
+        if self.available:
+            os.close(self.fd)
+            self.fd, self.watches = None, {}
+    # -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the file(s) of a time range (tags without value are filled by the time steps)
+def define_file_list(folder_name, file_name, tags_format, time_range, tags_filling=None):
+    return fill_tags2string_range(os.path.join(folder_name, file_name), tags_format, time_range, tags_filling)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to check the file(s) (list of the file(s) not ready). A file is ready if it is complete (written and closed
+# or moved in) or if its size and time have not changed for the stable time [s] (file(s) still written are not ready)
+def check_files_ready(file_list, time_stable=0, file_state=None, file_complete=None):
+
+    file_state = file_state if file_state is not None else {}
+    file_complete = file_complete if file_complete is not None else set()
+
+    time_now = time.time()
+    file_missing = []
+    for file_name in file_list:
+        try:
+            file_stat = os.stat(file_name)
+        except OSError:
+            file_missing.append(file_name)
+            continue
+
+        if (os.path.normpath(file_name) in file_complete) or (time_now - file_stat.st_mtime >= time_stable):
+            continue
+
+        # Size and time of the file are compared with the previous check (clock of remote file systems can differ)
+        file_key = (file_stat.st_size, file_stat.st_mtime_ns)
+        file_step = file_state.get(file_name, None)
+        if (file_step is not None) and (file_step[0] == file_key):
+            if time_now - file_step[1] >= time_stable:
+                continue
+        else:
+            file_state[file_name] = (file_key, time_now)
+        file_missing.append(file_name)
+
+    return file_missing
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to wait the file(s) (folder events if available, backoff polling otherwise)
+def wait_files_ready(file_list, wait_timeout=0, wait_min=10, wait_max=300, wait_factor=2, wait_stable=None,
+                     file_tag='files'):
+
+    # Stable time of the file(s) not seen complete by a folder event (minimum wait if not defined; not applied
+    # without a timeout, since the file(s) are checked only once)
+    if not wait_timeout:
+        time_stable = 0
+    else:
+        time_stable = wait_min if wait_stable is None else wait_stable
+    file_state, file_complete = {}, set()
+
+    file_list = list(dict.fromkeys(file_list))
+    file_missing = check_files_ready(file_list, time_stable, file_state, file_complete)
+    if (not file_missing) or (not wait_timeout):
+        return {'ready': not file_missing, 'file_missing': file_missing, 'time_wait': 0.0}
+
+    log_stream.info(' -----> Wait ' + file_tag + ' [' + str(len(file_missing)) + '/' + str(len(file_list)) +
+                    ' not ready] ... ')
+
+    file_watcher = FolderWatcher()
+    time_start = time.time()
+    time_poll = wait_min
+    try:
+        while file_missing:
+            time_left = wait_timeout - (time.time() - time_start)
+            if time_left <= 0:
+                break
+
+            # Folder(s) of the missing file(s) are watched again (folders can be created while waiting)
+            for folder_name in set([os.path.dirname(file_name) for file_name in file_missing]):
+                file_watcher.watch(folder_name)
+
+            # File(s) not changed are checked again when their stable time is over
+            time_next = min(time_poll, time_left)
+            for file_name in file_missing:
+                if file_name in file_state:
+                    time_next = min(time_next, max(file_state[file_name][1] + time_stable - time.time(), 0.1))
+
+            event_found, event_files = file_watcher.wait(time_next)
+            file_complete.update(event_files)
+            file_missing = check_files_ready(file_missing, time_stable, file_state, file_complete)
+
+            # Backoff increases only if nothing happened (events restart from the minimum wait)
+            time_poll = wait_min if event_found else min(time_poll * wait_factor, wait_max)
+    finally:
+        file_watcher.close()
+
+    time_wait = round(time.time() - time_start, 1)
+    if file_missing:
+        log_stream.warning(' ===> Wait ' + file_tag + ' ... TIMEOUT [' + str(len(file_missing)) +
+                           ' not ready; first "' + file_missing[0] + '"]')
+    else:
+        log_stream.info(' -----> Wait ' + file_tag + ' ... DONE [' + str(time_wait) + ' seconds]')
+
+    return {'ready': not file_missing, 'file_missing': file_missing, 'time_wait': time_wait}
+# -------------------------------------------------------------------------------------
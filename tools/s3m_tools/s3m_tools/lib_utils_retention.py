@@ -0,0 +1,191 @@
+"""
+Library Features:
+
+Name:          lib_utils_retention
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+#######################################################################################
+# Library
+import logging
+import os
+import json
+
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from .lib_info_args import logger_name
+from .lib_utils_gzip import zip_filename
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+
+# Time format of the index keys
+index_time_format = '%Y%m%d%H%M'
+# Extension of the compressed files
+index_zip_extension = '.gz'
+#######################################################################################
+
+
+# -------------------------------------------------------------------------------------
+# Class to index the files of a domain by type and time (latest file found without folder scans)
+class FileIndex:
+
+    # -------------------------------------------------------------------------------------
+    # Initialize class
+    def __init__(self, file_name=None):
+        self.file_name = file_name
+        # index: file type --> {time key: file path}
+        self.file_index = {}
+        if (file_name is not None) and os.path.exists(file_name):
+            try:
+                with open(file_name, 'r') as file_handle:
+                    self.file_index = json.load(file_handle)
+            except ValueError:
+                log_stream.warning(' ===> Index file "' + file_name + '" is not valid. Index is reset')
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to register a file
+    def register(self, file_type, file_time, file_path):
+        self.file_index.setdefault(file_type, {})[file_time.strftime(index_time_format)] = file_path
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to remove a file from the index
+    def remove(self, file_type, file_time):
+        self.file_index.get(file_type, {}).pop(file_time.strftime(index_time_format), None)
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to get the time(s) of a file type (sorted)
+    def times(self, file_type):
+        return [datetime.strptime(time_key, index_time_format)
+                for time_key in sorted(self.file_index.get(file_type, {}).keys())]
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to look up the file of a time (None if not indexed or not available)
+    def lookup(self, file_type, file_time):
+        file_path = self.file_index.get(file_type, {}).get(file_time.strftime(index_time_format), None)
+        if (file_path is not None) and os.path.exists(file_path):
+            return file_path
+        return None
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to get the latest available file (time and path; None if not found)
+    def latest(self, file_type, time_max=None):
+
+        time_key_max = time_max.strftime(index_time_format) if time_max is not None else None
+        file_type_index = self.file_index.get(file_type, {})
+        for time_key in sorted(file_type_index.keys(), reverse=True):
+            if (time_key_max is not None) and (time_key > time_key_max):
+                continue
+            if os.path.exists(file_type_index[time_key]):
+                return datetime.strptime(time_key, index_time_format), file_type_index[time_key]
+        return None, None
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to save the index (written in a temporary file and moved)
+    def save(self):
+
+        if self.file_name is None:
+            return
+        file_folder = os.path.dirname(self.file_name)
+        if file_folder:
+            os.makedirs(file_folder, exist_ok=True)
+
+        file_name_tmp = self.file_name + '.tmp'
+        with open(file_name_tmp, 'w') as file_handle:
+            json.dump(self.file_index, file_handle, indent=2, sort_keys=True)
+        os.replace(file_name_tmp, self.file_name)
+    # -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to select the time(s) kept by the retention rules (age and cadence [hours]; the latest time is kept)
+def select_retention(time_list, time_now, retention_rules):
+
+    time_list = sorted(time_list)
+    time_keep, time_remove = [], []
+    for time_step in time_list:
+        time_age = (time_now - time_step) / timedelta(hours=1)
+        time_hours = int((time_step - datetime(1970, 1, 1)) / timedelta(hours=1))
+
+        time_check = (time_step == time_list[-1])
+        for retention_rule in retention_rules:
+            if (time_age <= retention_rule['period_hours']) and \
+                    (time_hours % int(retention_rule.get('cadence_hours', 1)) == 0):
+                time_check = True
+                break
+
+        if time_check:
+            time_keep.append(time_step)
+        else:
+            time_remove.append(time_step)
+
+    return time_keep, time_remove
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to compress a file (compressed in a temporary file and moved; the source file is removed)
+def compress_file(file_path):
+
+    file_path_zip = file_path + index_zip_extension
+    file_path_tmp = file_path_zip + '.tmp'
+    zip_filename(file_path, file_path_tmp)
+    os.replace(file_path_tmp, file_path_zip)
+    os.remove(file_path)
+
+    return file_path_zip
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to apply the retention to the indexed files of a type (removal by rules and compression by age)
+def apply_retention(file_index, file_type, time_now, retention_rules=None, compress_hours=None, process_max=4):
+
+    time_list = file_index.times(file_type)
+
+    # File(s) not kept by the rules are removed
+    file_removed = 0
+    if retention_rules:
+        _, time_remove = select_retention(time_list, time_now, retention_rules)
+        for time_step in time_remove:
+            file_path = file_index.lookup(file_type, time_step)
+            if file_path is not None:
+                os.remove(file_path)
+                file_removed += 1
+            file_index.remove(file_type, time_step)
+        time_remove = set(time_remove)
+        time_list = [time_step for time_step in time_list if time_step not in time_remove]
+
+    # File(s) older than the compression age are compressed in parallel
+    file_compressed = 0
+    if compress_hours is not None:
+        file_compress = []
+        for time_step in time_list:
+            file_path = file_index.lookup(file_type, time_step)
+            if (file_path is not None) and (not file_path.endswith(index_zip_extension)) and \
+                    ((time_now - time_step) / timedelta(hours=1) > compress_hours):
+                file_compress.append((time_step, file_path))
+
+        if file_compress:
+            with ThreadPoolExecutor(max_workers=max(int(process_max), 1)) as file_executor:
+                file_path_zip = list(file_executor.map(compress_file, [file_path for _, file_path in file_compress]))
+            for (time_step, _), file_path_step in zip(file_compress, file_path_zip):
+                file_index.register(file_type, time_step, file_path_step)
+            file_compressed = len(file_compress)
+
+    log_stream.info(' -----> Retention of "' + file_type + '" files ... DONE [removed ' + str(file_removed) +
+                    '; compressed ' + str(file_compressed) + '; kept ' + str(len(time_list)) + ']')
+
+    return file_removed, file_compressed
+# -------------------------------------------------------------------------------------
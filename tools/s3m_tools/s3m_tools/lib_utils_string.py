@@ -0,0 +1,44 @@
+"""
+Library Features:
+
+Name:          lib_utils_string
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.1.0'
+"""
+
+#######################################################################################
+# Library
+import logging
+
+from .lib_info_args import logger_name
+from .lib_utils_template import compile_template
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+#######################################################################################
+
+
+# -------------------------------------------------------------------------------------
+# Method to add time in a unfilled string (path or filename)
+def fill_tags2string(string_raw, tags_format=None, tags_filling=None):
+
+    if string_raw is None:
+        return string_raw
+
+    # Template is compiled once for each string and tags format
+    template_obj = compile_template(string_raw, tags_format)
+    return template_obj.render(tags_filling)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to add time in a unfilled string over a time range (tags without value are filled by the time steps)
+def fill_tags2string_range(string_raw, tags_format=None, time_range=None, tags_filling=None):
+
+    if string_raw is None:
+        return [string_raw] * len(time_range)
+
+    template_obj = compile_template(string_raw, tags_format)
+    return template_obj.render_range(time_range, tags_filling)
+# -------------------------------------------------------------------------------------
@@ -0,0 +1,185 @@
+"""
+Library Features:
+
+Name:          lib_utils_template
+Author(s):     Francesco Avanzi (francesco.avanzi@cimafoundation.org), Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261019'
+Version:       '1.0.0'
+"""
+
+#######################################################################################
+# Library
+import logging
+import re
+import pandas as pd
+
+from datetime import datetime
+from functools import lru_cache
+
+from .lib_info_args import logger_name
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+
+# Size of the caches (compiled templates and rendered strings)
+template_cache_size = 1024
+render_cache_size = 65536
+#######################################################################################
+
+
+# -------------------------------------------------------------------------------------
+# Class to render a template string compiled in literal and tag segments
+class TemplateString:
+
+    # -------------------------------------------------------------------------------------
+    # Initialize class
+    def __init__(self, string_raw, segments, tags_owner):
+        self.string_raw = string_raw
+        # segment(s): (None, literal) or (tag_name, tag_format)
+        self.segments = segments
+        # tag(s) sharing the same format (the first tag with a value fills all of them)
+        self.tags_owner = tags_owner
+        self.tags_name = tuple(sorted(set([tag for tags in tags_owner.values() for tag in tags])))
+        self.apply_tags = any([tag_name is not None for tag_name, _ in segments])
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to format a tag value (datetime with strftime, number with format)
+    @staticmethod
+    def format_value(tag_format, tag_value):
+        if isinstance(tag_value, datetime):
+            return tag_value.strftime(tag_format)
+        if isinstance(tag_value, (float, int)):
+            return tag_format.format(tag_value)
+        return str(tag_value)
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to select the tag filling a segment (None if no tag has a value)
+    def select_tag(self, tag_name, tags_filling):
+        for tag_owner in self.tags_owner[tag_name]:
+            if tags_filling.get(tag_owner, None) is not None:
+                return tag_owner
+        return None
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to render the template with the tag value(s)
+    def render(self, tags_filling=None):
+
+        if not self.apply_tags:
+            return self.string_raw
+        if tags_filling is None:
+            tags_filling = {}
+
+        # Rendered strings are memoized by tag value(s) (values must be hashable)
+        try:
+            values_key = tuple([tags_filling.get(tag_name, None) for tag_name in self.tags_name])
+            return render_values(self, values_key)
+        except TypeError:
+            return self.render_filling(tags_filling)
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to render the template (no memoization)
+    def render_filling(self, tags_filling):
+
+        string_parts = []
+        for tag_name, tag_segment in self.segments:
+            if tag_name is None:
+                string_parts.append(tag_segment)
+            else:
+                tag_owner = self.select_tag(tag_name, tags_filling)
+                if tag_owner is None:
+                    # Tag without value(s) keeps its format
+                    string_parts.append(tag_segment)
+                else:
+                    string_parts.append(self.format_value(tag_segment, tags_filling[tag_owner]))
+
+        return ''.join(string_parts).replace('//', '/')
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to render the template over a time range (strftime vectorized by format)
+    def render_range(self, time_range, tags_filling=None):
+
+        time_range = pd.DatetimeIndex(time_range)
+        if not self.apply_tags:
+            return [self.string_raw] * time_range.size
+        if tags_filling is None:
+            tags_filling = {}
+
+        # Tag(s) without a fixed value are filled by the time step(s)
+        tags_filling_range = dict(tags_filling)
+        for tag_name in self.tags_name:
+            if tags_filling_range.get(tag_name, None) is None:
+                tags_filling_range[tag_name] = time_range
+
+        string_columns, time_formatted = [], {}
+        for tag_name, tag_segment in self.segments:
+            if tag_name is None:
+                string_columns.append([tag_segment] * time_range.size)
+                continue
+
+            tag_owner = self.select_tag(tag_name, tags_filling_range)
+            tag_value = tags_filling_range[tag_owner]
+            if tag_value is time_range:
+                if tag_segment not in time_formatted:
+                    time_formatted[tag_segment] = list(time_range.strftime(tag_segment))
+                string_columns.append(time_formatted[tag_segment])
+            else:
+                string_columns.append([self.format_value(tag_segment, tag_value)] * time_range.size)
+
+        return [''.join(string_parts).replace('//', '/') for string_parts in zip(*string_columns)]
+    # -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to render a compiled template by tag value(s) (memoized)
+@lru_cache(maxsize=render_cache_size)
+def render_values(template_obj, values_key):
+    return template_obj.render_filling(dict(zip(template_obj.tags_name, values_key)))
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to compile a template string (parsed once for each string and tags format)
+def compile_template(string_raw, tags_format):
+    try:
+        return compile_template_cached(string_raw, tuple(tags_format.items()))
+    except TypeError:
+        # Tags format with unhashable value(s) are compiled without cache
+        return compile_template_cached.__wrapped__(string_raw, tuple(tags_format.items()))
+
+
+@lru_cache(maxsize=template_cache_size)
+def compile_template_cached(string_raw, tags_items):
+
+    # Tag(s) used by the string (tags without format are kept as literal)
+    tags_used = [(tag_key, tag_format) for tag_key, tag_format in tags_items
+                 if (tag_format is not None) and ('{' + tag_key + '}' in string_raw)]
+    if not tags_used:
+        return TemplateString(string_raw, [(None, string_raw)], {})
+
+    tags_format_used = dict(tags_used)
+    tags_pattern = re.compile('|'.join(
+        [re.escape('{' + tag_key + '}') for tag_key in sorted(tags_format_used, key=len, reverse=True)]))
+
+    segments, string_idx = [], 0
+    for tag_match in tags_pattern.finditer(string_raw):
+        if tag_match.start() > string_idx:
+            segments.append((None, string_raw[string_idx:tag_match.start()]))
+        tag_key = tag_match.group(0)[1:-1]
+        segments.append((tag_key, tags_format_used[tag_key]))
+        string_idx = tag_match.end()
+    if string_idx < len(string_raw):
+        segments.append((None, string_raw[string_idx:]))
+
+    tags_owner = {}
+    for tag_key, tag_format in tags_used:
+        tags_owner[tag_key] = [tag_other for tag_other, format_other in tags_used if format_other == tag_format]
+
+    return TemplateString(string_raw, segments, tags_owner)
+# -------------------------------------------------------------------------------------
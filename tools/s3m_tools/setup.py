@@ -0,0 +1,21 @@
+"""
+S3M Tools - Common library (installation)
+
+General command line:
+### pip install -e tools/s3m_tools
+"""
+
+from setuptools import setup
+
+setup(
+    name='s3m_tools',
+    version='1.0.0',
+    description='Helpers shared by the S3M tools (runner, source2nc converter, merger, output2nc converter)',
+    author='Francesco Avanzi, Fabio Delogu',
+    author_email='francesco.avanzi@cimafoundation.org, fabio.delogu@cimafoundation.org',
+    license='MIT',
+    packages=['s3m_tools'],
+    python_requires='>=3.7',
+    install_requires=['numpy', 'pandas', 'xarray'],
+    extras_require={'raster': ['rasterio']},
+)